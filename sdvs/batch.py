@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Batch: Compile and simulate many models and core counts on a process pool
+
+import concurrent.futures
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sdvs.compile_cache import CompileCache
+from sdvs.distributed import DistributedSimulator
+from sdvs.parallel import ParallelSimulator
+from sdvs.simulator import Simulator
+from sdvs.stealing import WorkStealingSimulator
+from sdvs.swarm import BITSTATE_BITS, COVERAGE_BITS, HASH_COUNT, SwarmRunner
+
+
+def parse_ncores(spec):
+    """
+    Parse a number of cores specification such as "3", "1-4" or "1,2,8".
+    :param spec: specification string
+    :return: sorted list of numbers of cores
+    """
+    ncores = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = part.split("-")
+            ncores.update(range(int(first), int(last) + 1))
+        elif part:
+            ncores.add(int(part))
+    if not ncores or min(ncores) < 1:
+        raise ValueError("Invalid number of cores: {}".format(spec))
+    return sorted(ncores)
+
+
+def expand_models(patterns):
+    """
+    Expand the glob patterns of model sources.
+    :param patterns: list of paths or glob patterns
+    :return: sorted list of distinct sources
+    """
+    sources = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        sources.update(matches if matches else [pattern])
+    return sorted(sources)
+
+
+def model_name(source):
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+def read_init_cfg(source):
+    """
+    Read the initial configuration stored next to the source (model.sdve -> model.cfg).
+    :param source: SDVE model source file
+    :return: size in bits and value of the initial configuration
+    """
+    with open(os.path.splitext(source)[0] + ".cfg", "r") as file:
+        init_cfg = file.readline().strip()
+    return len(init_cfg) * 4, int(init_cfg, 16)
+
+
+def simulate_model(source, compiler, ncores, cachedir, profiler=None, metrics=None, program_cache=None,
+                   budget=None, checkpoint_file=None, state_writer=None,
+                   edge_writer=None, engine=None, compact=False, workers=1, stealing=1,
+                   nodes=None):
+    """
+    Compile a model (through the compile cache) and explore it.
+    :param budget: optional Budget stopping the exploration early
+    :param checkpoint_file: optional checkpoint to resume the exploration from
+    :param state_writer: optional StateWriter receiving the discovered configurations
+    :param edge_writer: optional EdgeWriter receiving the labelled transitions
+    :param engine: optional engine factory of the cores (see sdvs.engine.ENGINES)
+    :param compact: store the configurations as 64-bit words when they fit (see sdvs.compact)
+    :param workers: number of worker processes, a ParallelSimulator being used above one
+    :param stealing: number of work-stealing worker processes, a WorkStealingSimulator being used above one
+    :param nodes: number of local nodes or addresses of running nodes, a DistributedSimulator being used if set
+    :return: simulator once the exploration is over (see Simulator.statistics)
+    """
+    binaries = CompileCache(cachedir).compile(source, compiler, ncores)
+    cfg_size, init_cfg = read_init_cfg(source)
+    if workers > 1 or stealing > 1 or nodes is not None:
+        options = (profiler, program_cache, budget, checkpoint_file, state_writer, edge_writer)
+        if compact or any(option is not None for option in options):
+            raise ValueError("Profiling, program caches, budgets, checkpoints, output files and compact checkers "
+                             "are not supported with several workers")
+        if (workers > 1) + (stealing > 1) + (nodes is not None) > 1:
+            raise ValueError("Worker processes, work-stealing workers and nodes are exclusive")
+        if workers > 1 and sys.version_info < (3, 8):
+            raise ValueError("Worker processes require Python 3.8 or above (shared memory)")
+        if nodes is not None:
+            simulator = DistributedSimulator(binaries, cfg_size, nodes, engine, metrics)
+        elif stealing > 1:
+            simulator = WorkStealingSimulator(binaries, cfg_size, stealing, engine, metrics)
+        else:
+            simulator = ParallelSimulator(binaries, cfg_size, workers, engine, metrics)
+        simulator.launch_checking(init_cfg)
+        return simulator
+    simulator = Simulator(binaries, cfg_size, profiler, metrics, program_cache, state_writer, edge_writer,
+                          engine, compact=compact)
+    if checkpoint_file is not None:
+        simulator.resume_checking(checkpoint_file, budget)
+    else:
+        simulator.launch_checking(init_cfg, budget)
+    return simulator
+
+
+def simulate_swarm(source, compiler, ncores, cachedir, searches=None, jobs=None, seed=0,
+                   bitstate_bits=BITSTATE_BITS, hash_count=HASH_COUNT, coverage_bits=COVERAGE_BITS, budget=None,
+                   engine=None, on_result=None):
+    """
+    Compile a model (through the compile cache) and run a swarm of searches on it (see sdvs.swarm).
+    :param on_result: optional function called with the result of each search as it ends
+    :return: swarm runner once every search is over (see SwarmRunner.statistics)
+    """
+    binaries = CompileCache(cachedir).compile(source, compiler, ncores)
+    cfg_size, init_cfg = read_init_cfg(source)
+    runner = SwarmRunner(binaries, cfg_size, searches, jobs, seed, bitstate_bits, hash_count, coverage_bits,
+                         budget, engine)
+    runner.launch_checking(init_cfg, on_result)
+    return runner
+
+
+def run_job(source, compiler, ncores, cachedir, budget=None):
+    """
+    Job of the batch runner, errors are reported in the result instead of raised.
+    :return: result dictionary
+    """
+    result = {"model": model_name(source), "ncores": ncores, "exec_time": None, "states": None,
+              "host_time": None, "stop_reason": None, "error": None}
+    start = time.perf_counter()
+    try:
+        statistics = simulate_model(source, compiler, ncores, cachedir, budget=budget).statistics()
+        result["exec_time"] = statistics["exec_time"]
+        result["states"] = statistics["states"]
+        result["stop_reason"] = statistics["stop_reason"]
+    except Exception as exception:
+        result["error"] = "{}: {}".format(type(exception).__name__, exception)
+    result["host_time"] = time.perf_counter() - start
+    return result
+
+
+class ResultWriter:
+    """
+    Write results as they arrive: one CSV row appended with a single write per
+    result (same fields as a single CLI run) and, optionally, the whole JSON list
+    replaced atomically.
+    """
+
+    def __init__(self, csv_file=None, json_file=None):
+        self.csv_file = csv_file
+        self.json_file = json_file
+        self.results = []
+
+    def write(self, result):
+        self.results.append(result)
+        if self.csv_file is not None and result["error"] is None:
+            line = io.StringIO()
+            csv.writer(line).writerow([result["model"], result["ncores"], result["exec_time"], result["states"]])
+            with open(self.csv_file, "a") as file:
+                file.write(line.getvalue())
+        if self.json_file is not None:
+            directory = os.path.dirname(os.path.abspath(self.json_file))
+            descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(self.results, file, indent=2)
+            os.replace(temp_path, self.json_file)
+
+
+class BatchRunner:
+    """
+    Run every (model, number of cores) pair as an independent job on a process pool,
+    each job being limited by the same budget, if any.
+    """
+
+    def __init__(self, sources, ncores_list, compiler, cachedir="bin", jobs=None, writer=None, budget=None):
+        self.sources = sources
+        self.ncores_list = ncores_list
+        self.compiler = compiler
+        self.cachedir = cachedir
+        self.jobs = jobs if jobs else os.cpu_count()
+        self.writer = ResultWriter() if writer is None else writer
+        self.budget = budget
+
+    def run(self, on_result=None):
+        """
+        Schedule all the jobs and write the results in completion order.
+        :param on_result: optional function called with each result
+        :return: list of results
+        """
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(run_job, source, self.compiler, ncores, self.cachedir, self.budget)
+                       for source in self.sources for ncores in self.ncores_list]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                self.writer.write(result)
+                if on_result is not None:
+                    on_result(result)
+        return self.writer.results
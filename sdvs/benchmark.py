@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Benchmark: Host time of the decoder, the cores, the coordinator and the checking loop
+
+import csv
+import json
+import tempfile
+import time
+
+from sdvs.coordinator import Coordinator
+from sdvs.core import Core
+from sdvs.decoder import Decoder
+from sdvs.generator import ModelGenerator
+from sdvs.memory import Memory
+from sdvs.metrics import peak_rss
+from sdvs.model import Model
+from sdvs.simulator import Simulator
+
+# Fixed corpus, hand-written in the style of sdvc outputs
+COUNTER_PROGRAM = """
+loadbyte r1 {address}
+lt r2 r1 {limit}
+jmp r2 6
+add r1 r1 1
+storebyte r1 {address}
+endga
+nop
+"""
+
+# Cores taking turns to increment their counter, reset once it reaches 5
+TURN_PROGRAM = """
+loadbyte r1 0
+eq r2 r1 {nb}
+jmp r2 19
+loadbyte r3 {address}
+lt r4 r3 5
+jmp r4 11
+add r3 r3 1
+storebyte r3 {address}
+mov r5 {other}
+storebyte r5 0
+endga
+loadbyte r3 {address}
+eq r4 r3 5
+jmp r4 19
+mov r3 0
+storebyte r3 {address}
+mov r5 {other}
+storebyte r5 0
+endga
+nop
+"""
+
+# Fill a[i] with a[i] + i + 1 through register addressed loads and stores
+ARRAY_PROGRAM = """
+loadbyte r1 32
+lt r2 r1 4
+jmp r2 11
+mul r3 r1 8
+loadbyte r5 r3
+add r4 r5 r1
+add r4 r4 1
+storebyte r4 r3
+add r1 r1 1
+storebyte r1 32
+endga
+nop
+"""
+
+CORPUS = [
+    Model("counter.1", [COUNTER_PROGRAM.format(address=0, limit=200)], 8, 0, 201),
+    Model("turn.2", [TURN_PROGRAM.format(nb=0, other=1, address=8),
+                     TURN_PROGRAM.format(nb=1, other=0, address=16)], 24, 0, 12),
+    Model("array.1", [ARRAY_PROGRAM], 40, 0, 5)
+]
+
+# (number of cores, number of variables, counter range, guard density) of the generated models
+DEFAULT_SIZES = [(2, 2, 8, 0.0), (3, 3, 6, 0.5), (4, 4, 4, 1.0)]
+
+
+def best_time(function, repeat):
+    """
+    Run function repeat times.
+    :return: shortest host time in seconds and last result of the function
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Benchmark:
+    """
+    Time each stage of the simulation on the corpus and on generated models of
+    increasing size. Times are the best of repeat runs, the peak RSS is the one of
+    the whole process when the measure ends.
+    """
+
+    def __init__(self, repeat=3, iterations=200, sizes=DEFAULT_SIZES, models=None):
+        self.repeat = repeat
+        self.iterations = iterations
+        self.models = list(CORPUS) if models is None else list(models)
+        self.models += [ModelGenerator(*size).generate() for size in sizes]
+        self.results = []
+
+    def run(self):
+        """
+        Run every benchmark on every model.
+        :return: list of results
+        """
+        self.results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for model in self.models:
+                bin_paths = model.write_binaries(directory)
+                bin_programs = model.assemble()
+                self.bench_decode(model, bin_programs)
+                self.bench_core(model, bin_programs)
+                self.bench_coordinator(model, bin_programs)
+                self.bench_checking(model, bin_paths)
+        return self.results
+
+    def add_result(self, benchmark, model, items, unit, host_time, exec_cycles=None):
+        result = {
+            "benchmark": benchmark,
+            "model": model.name,
+            "items": items,
+            "unit": unit,
+            "host_time": host_time,
+            "rate": items / host_time if host_time > 0 else None,
+            "states_per_sec": None,
+            "exec_cycles": exec_cycles,
+            "peak_rss": peak_rss()
+        }
+        if unit == "states":
+            result["states_per_sec"] = result["rate"]
+        self.results.append(result)
+        return result
+
+    def bench_decode(self, model, bin_programs):
+        words = [word for bin_program in bin_programs for word in bin_program]
+        decoder = Decoder(words)
+
+        def decode():
+            for _ in range(self.iterations):
+                for word in words:
+                    decoder.decode(word)
+        host_time, _ = best_time(decode, self.repeat)
+        return self.add_result("decode", model, len(words) * self.iterations, "instructions", host_time)
+
+    def bench_core(self, model, bin_programs):
+        core = Core(Decoder(bin_programs[0] + [0]), 0)
+        memory = Memory(model.cfg_size, model.init_cfg)
+
+        def execute():
+            for _ in range(self.iterations):
+                core.reset_execution()
+                core.setup_cfg_memory(memory)
+                core.process_instructions()
+        host_time, _ = best_time(execute, self.repeat)
+        return self.add_result("core", model, self.iterations, "runs", host_time)
+
+    def bench_coordinator(self, model, bin_programs):
+        decoders = [Decoder(bin_program + [0]) for bin_program in bin_programs]
+        coordinator = Coordinator(decoders, model.cfg_size)
+
+        def process():
+            cycles = 0
+            for _ in range(self.iterations):
+                cycles += coordinator.process_config(model.init_cfg)[0]
+            return cycles
+        host_time, _ = best_time(process, self.repeat)
+        return self.add_result("coordinator", model, self.iterations, "configs", host_time)
+
+    def bench_checking(self, model, bin_paths):
+        def check():
+            simulator = Simulator(bin_paths, model.cfg_size)
+            return simulator.launch_checking(model.init_cfg)
+        host_time, (exec_time, cfgs) = best_time(check, self.repeat)
+        return self.add_result("launch_checking", model, len(cfgs), "states", host_time, exec_time)
+
+    def write(self, file_name):
+        """
+        Write the results as CSV if the file name ends with .csv, as JSON otherwise.
+        :param file_name: output file
+        """
+        with open(file_name, "w") as file:
+            if file_name.endswith(".csv"):
+                writer = csv.DictWriter(file, fieldnames=list(self.results[0].keys()) if self.results else [])
+                writer.writeheader()
+                writer.writerows(self.results)
+            else:
+                json.dump(self.results, file, indent=2)
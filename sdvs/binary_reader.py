@@ -6,23 +6,72 @@
 # ===========================================
 # Binary reader: Handles the binary file and produces a list of 32-bits instructions.
 
+import contextlib
+import mmap
+import sys
+from array import array
+
+from sdvs.constants import INSTRUCTION_SIZE
+
+# Array type code of unsigned 32-bits integers on this platform
+INSTRUCTION_TYPECODE = "I" if array("I").itemsize == INSTRUCTION_SIZE else "L"
+
+
 class BinaryReader:
 
     @classmethod
     def read_instructions(cls, file_name):
         """
         Reads a binary file and returns a list with the processed instructions.
-        :return: 32-bits instructions list
+        :return: 32-bits instructions array
         """
-        instructions = []
         with open(file_name, "rb") as file:
-            instruction = file.read(4)  # read(1) processes 1 byte, we need 4 for an instruction
-            while instruction:
-                instructions.append(int.from_bytes(instruction, "little"))
-                instruction = file.read(4)
+            content = file.read()
+        return cls.instructions_from_bytes(content)
+
+    @classmethod
+    def instructions_from_bytes(cls, content):
+        """
+        Convert the little-endian content of a binary in one pass, a trailing NOP is
+        appended to stop the core at the end of the program.
+        :param content: bytes of the binary
+        :return: 32-bits instructions array
+        """
+        remainder = len(content) % INSTRUCTION_SIZE
+        if remainder:
+            # Incomplete last instruction, missing high bytes are null
+            content = bytes(content) + bytes(INSTRUCTION_SIZE - remainder)
+        instructions = array(INSTRUCTION_TYPECODE)
+        instructions.frombytes(content)
+        if sys.byteorder == "big":
+            instructions.byteswap()
         instructions.append(0x00000000)
         return instructions
 
+    @classmethod
+    @contextlib.contextmanager
+    def map_instructions(cls, file_name):
+        """
+        Map a binary file in memory and expose it as 32-bits instructions without copy.
+        The view is only valid within the context and has no trailing NOP. On
+        big-endian hosts the instructions are converted in an array instead.
+        :param file_name: binary file
+        :return: context yielding a sequence of 32-bits instructions
+        """
+        with open(file_name, "rb") as file:
+            size = file.seek(0, 2)
+            if size == 0 or size % INSTRUCTION_SIZE or sys.byteorder == "big":
+                file.seek(0)
+                instructions = cls.instructions_from_bytes(file.read())
+                yield instructions[:-1]
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped).cast(INSTRUCTION_TYPECODE)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
     @classmethod
     def read_memory(cls, file_name):
         """
@@ -33,6 +82,16 @@ class BinaryReader:
             content = int.from_bytes(file.read(), "big")
         return content
 
+    @classmethod
+    def write_instructions(cls, file_name, instructions):
+        """
+        Write 32-bits instructions in a binary file, as read by read_instructions.
+        :param file_name: output file
+        :param instructions: 32-bits instructions list
+        """
+        with open(file_name, "wb") as file:
+            file.write(b"".join(instruction.to_bytes(4, "little") for instruction in instructions))
+
     @classmethod
     def write_text_file(cls, file_name, instructions):
         """
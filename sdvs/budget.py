@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Budget: Wall-clock, state-count and memory limits of an exploration
+
+import time
+
+from sdvs.metrics import current_rss
+
+# Reasons given when a budget is exceeded
+STOP_TIME = "time"
+STOP_STATES = "states"
+STOP_MEMORY = "memory"
+
+
+class Budget:
+    """
+    Limits of an exploration, None meaning unlimited. The state count is checked
+    after every expansion, time and memory when the simulator polls (see
+    sdvs.metrics.POLL_PERIOD). Exceeding one stops the exploration with partial
+    results and, if a checkpoint file is given, a checkpoint to resume from.
+    """
+
+    def __init__(self, max_time=None, max_states=None, max_rss=None, checkpoint_file=None):
+        self.max_time = max_time
+        self.max_states = max_states
+        self.max_rss = max_rss
+        self.checkpoint_file = checkpoint_file
+        self.deadline = None
+
+    def start(self):
+        """
+        Start the wall-clock budget.
+        """
+        self.deadline = None if self.max_time is None else time.monotonic() + self.max_time
+
+    def exceeded(self, states):
+        """
+        :param states: number of encountered configurations
+        :return: reason of the stop if a budget is exceeded, None otherwise
+        """
+        if self.max_states is not None and states >= self.max_states:
+            return STOP_STATES
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return STOP_TIME
+        if self.max_rss is not None:
+            rss = current_rss()
+            if rss is not None and rss >= self.max_rss:
+                return STOP_MEMORY
+        return None
@@ -7,23 +7,96 @@
 # Checker: Checks if a configuration is safe then processes
 # its successors if not already done
 
+from sdvs.hashing import ZobristHasher
+
+# Stop reason of an exploration that found a configuration violating the property
+STOP_VIOLATION = "violation"
+
+
+class HashedConfigSet:
+    """
+    Set of configurations indexed by their precomputed hash, the configurations
+    themselves are only compared when two hashes collide.
+    """
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+        self.table = {}
+        self.collisions = set()
+
+    def add(self, config, config_hash):
+        """
+        Add a configuration to the set.
+        :param config: configuration to add
+        :param config_hash: hash of the configuration
+        :return: True if the configuration was not already in the set
+        """
+        known_config = self.table.get(config_hash)
+        if known_config is None:
+            self.table[config_hash] = config
+            return True
+        if known_config == config or config in self.collisions:
+            return False
+        self.collisions.add(config)
+        return True
+
+    def __contains__(self, config):
+        known_config = self.table.get(self.hasher.hash_config(config))
+        return known_config == config or config in self.collisions
+
+    def __len__(self):
+        return len(self.table) + len(self.collisions)
+
+    def __iter__(self):
+        yield from self.table.values()
+        yield from self.collisions
+
+
 class Checker:
 
-    def __init__(self):
-        self.known = set()
+    def __init__(self, hasher=None, prop=None):
+        self.hasher = ZobristHasher() if hasher is None else hasher
+        self.known = HashedConfigSet(self.hasher)
         self.frontier = []
         self.last = False
+        # Property of every configuration, callable(config) -> bool, and the first one violating it
+        self.prop = prop
+        self.violation = None
+
+    def check_property(self, config):
+        """
+        :param config: configuration to check
+        :return: True if the property holds, the configuration being recorded as the violation otherwise
+        """
+        if self.prop is None or self.prop(config):
+            return True
+        if self.violation is None:
+            self.violation = config
+        return False
 
-    def check_config(self, config):
-        # Apply property
+    def check_config(self, config, config_hash=None):
+        """
+        Register a configuration and add it to the frontier if it is new.
+        :param config: configuration to check
+        :param config_hash: hash of the configuration, computed if not given
+        :return: True if the configuration was not encountered before
+        """
+        if config_hash is None:
+            config_hash = self.hasher.hash_config(config)
         # Successors already found?
-        if not(config in self.known):
-            self.known.add(config)
-            self.frontier.append(config)
+        if self.known.add(config, config_hash):
+            # Apply property
+            self.check_property(config)
+            self.frontier.append((config, config_hash))
+            return True
+        return False
 
     def next_config(self):
+        """
+        Pop the next configuration to process.
+        :return: configuration and its hash
+        """
         new_cfg = self.frontier.pop()
         if len(self.frontier) == 0:
             self.last = True
         return new_cfg
-
@@ -7,9 +7,20 @@
 # Command Line Interface: Command-line arguments parser and routine.
 
 import argparse
-import subprocess
+import functools
 import sys
-from sdvs.simulator import Simulator
+from sdvs.batch import (BatchRunner, ResultWriter, expand_models, model_name, parse_ncores, simulate_model,
+                        simulate_swarm)
+from sdvs.benchmark import Benchmark
+from sdvs.budget import Budget
+from sdvs.distributed import parse_nodes
+from sdvs.edge_list import EdgeWriter
+from sdvs.engine import ENGINES, FastEngine
+from sdvs.metrics import MetricsReporter
+from sdvs.profiler import Profiler
+from sdvs.program_cache import ProgramCache
+from sdvs.state_file import StateWriter
+from sdvs.swarm import BITSTATE_BITS, COVERAGE_BITS, HASH_COUNT
 
 
 class Parser(argparse.ArgumentParser):
@@ -24,9 +35,65 @@ class Parser(argparse.ArgumentParser):
         """
         self.add_argument("--source", "-s", help="SDVE model source file.")
         self.add_argument("--compiler", "-c", default="/usr/bin/sdvc", help="SDVC path.")
-        self.add_argument("--ncores", "-n", help="Number of cores.")
+        self.add_argument("--ncores", "-n", help="Number of cores (range such as 1-4 or list such as 1,2,8 in batch).")
+        self.add_argument("--cachedir", default="bin", help="Directory of the compiled models.")
         self.add_argument("--gui", "-g", default=False, action="store_true", help="Trigger the GUI.")
         self.add_argument("--outputfile", "-o", default="execstats.csv", help="CSV file to store the results")
+        self.add_argument("--profile", "-p", default=None,
+                          help="Profile the execution and store the statistics (.csv or .json)")
+        self.add_argument("--metrics-interval", "-m", type=float, default=5.0,
+                          help="Seconds between two exploration metrics reports")
+        self.add_argument("--metrics-file", default=None, help="JSON-lines file to store the exploration metrics")
+        self.add_argument("--program-cache", default=False, action="store_true",
+                          help="Cache the decoded programs next to the binaries")
+        self.add_argument("--benchmark", "-b", default=None,
+                          help="Run the benchmark suite and store the results (.csv or .json)")
+        self.add_argument("--batch", nargs="+", default=None, help="SDVE model sources or glob patterns to run.")
+        self.add_argument("--jobs", "-j", type=int, default=None, help="Parallel batch jobs (default: CPU count).")
+        self.add_argument("--jsonfile", default=None, help="JSON file to store the batch results")
+        self.add_argument("--max-time", type=float, default=None, help="Stop the exploration after this many seconds")
+        self.add_argument("--max-states", type=int, default=None,
+                          help="Stop the exploration after this many configurations")
+        self.add_argument("--max-memory", type=float, default=None,
+                          help="Stop the exploration above this resident memory (MiB)")
+        self.add_argument("--checkpoint", default=None, help="File to store the exploration state when stopped early")
+        self.add_argument("--resume", default=None, help="Resume the exploration from a checkpoint")
+        self.add_argument("--states-file", default=None,
+                          help="Binary file to stream the discovered configurations to")
+        self.add_argument("--transitions", default=False, action="store_true",
+                          help="Stream every transition to the states file instead of the configurations")
+        self.add_argument("--edges-file", default=None,
+                          help="Binary file to store the labelled transitions (see python -m sdvs.edge_list)")
+        self.add_argument("--engine", "-e", choices=sorted(ENGINES), default="interpreter",
+                          help="Execution engine of the cores")
+        self.add_argument("--fusion-report", default=False, action="store_true",
+                          help="Print the superinstructions of the fast engine and the dispatches they saved")
+        self.add_argument("--optimize", "-O", default=False, action="store_true",
+                          help="Run the peephole optimiser before the fast engine (cycles are unchanged)")
+        self.add_argument("--workers", type=int, default=1,
+                          help="Worker processes expanding the configurations of a single model")
+        self.add_argument("--stealing", type=int, default=1,
+                          help="Worker processes exploring a single model depth-first from their own stacks, "
+                               "idle ones stealing configurations from the others")
+        self.add_argument("--nodes", type=parse_nodes, default=None,
+                          help="Nodes sharing the visited set of a single model: number of local nodes or "
+                               "host:port list of nodes started with python -m sdvs.distributed")
+        self.add_argument("--swarm", type=int, default=None,
+                          help="Run this many randomized bitstate searches of a single model on --jobs processes")
+        self.add_argument("--seed", type=int, default=0, help="Seed of the first swarm search")
+        self.add_argument("--bitstate-bits", type=int, default=BITSTATE_BITS,
+                          help="Log2 of the bits of the bitstate table of each swarm search")
+        self.add_argument("--hash-count", type=int, default=HASH_COUNT,
+                          help="Bits set per configuration in the bitstate tables")
+        self.add_argument("--coverage-bits", type=int, default=COVERAGE_BITS,
+                          help="Log2 of the registers of the sketch estimating the configs the swarm searches "
+                               "found together")
+        self.add_argument("--compact", default=False, action="store_true",
+                          help="Store the visited configurations as 64-bit words when the bits the programs use fit")
+        self.add_argument("--guards", default=False, action="store_true",
+                          help="Cache the guard results of the fast engine by the memory bits they read")
+        self.add_argument("--guard-report", default=False, action="store_true",
+                          help="Print the guard blocks of the fast engine and their cached results")
 
 
     def parse(self, args):
@@ -81,35 +148,122 @@ class CLI:
             sys.exit(1)
         # Parse the command line arguments
         args = self.parser.parse(command_line_args)
+        if args.checkpoint is not None and args.max_time is None and args.max_states is None \
+                and args.max_memory is None:
+            # Checkpoints are only written when a budget stops the exploration
+            self.parser.error("--checkpoint requires --max-time, --max-states or --max-memory")
         self.args = ObjDict(args.__dict__)
 
     def main(self):
-        if self.args.gui:
+        if self.args.benchmark:
+            benchmark = Benchmark()
+            for result in benchmark.run():
+                print("{benchmark:>16} {model:>16}: {host_time:.4f}s ({rate:.1f} {unit}/s)".format(**result))
+            benchmark.write(self.args.benchmark)
+        elif self.args.batch:
+            writer = ResultWriter(self.args.outputfile, self.args.jsonfile)
+            # Checkpoints are only written by single runs
+            runner = BatchRunner(expand_models(self.args.batch), parse_ncores(self.args.ncores),
+                                 self.args.compiler, self.args.cachedir, self.args.jobs, writer, self.budget(None))
+            runner.run(on_result=self.print_batch_result)
+        elif self.args.swarm:
+            runner = simulate_swarm(self.args.source, self.args.compiler, self.args.ncores, self.args.cachedir,
+                                    self.args.swarm, self.args.jobs, self.args.seed, self.args.bitstate_bits,
+                                    self.args.hash_count, self.args.coverage_bits, self.budget(None), self.engine(),
+                                    on_result=self.print_search_result)
+            print("{searches} searches, {states} distinct configs estimated from the merged coverage "
+                  "(largest search: {max_search_states}).".format(**runner.statistics()))
+        elif self.args.gui:
             if self.args.ncores == 1:
                 pass # Process GUI
             else:
                 print("GUI is not available with more than one core.")
         else: # No GUI
-            # Compile file
-            subprocess.run([self.args.compiler, "-c", self.args.source, "-o", "bin/a.out", "-n", self.args.ncores])
             # Setup simulator
-            import os
-            print(os.getcwd())
-            binaries = ["bin/a.out." + str(i) for i in range(int(self.args.ncores))]
-            with open(self.args.source[:-5]+".cfg", "r") as f:
-                init_cfg = f.readline().strip()
-            simulator = Simulator(binaries, len(init_cfg)*4)
-            # Launch checking with initial config
-            exec_time, cfgs = simulator.launch_checking(int(init_cfg, 16))
+            profiler = Profiler(self.args.profile) if self.args.profile else None
+            metrics = MetricsReporter(self.args.metrics_interval, sys.stderr, self.args.metrics_file)
+            program_cache = ProgramCache() if self.args.program_cache else None
+            state_writer = StateWriter(self.args.states_file, self.args.transitions) if self.args.states_file else None
+            edge_writer = EdgeWriter(self.args.edges_file) if self.args.edges_file else None
+            # Compile file, unless already compiled with the same source, compiler and cores,
+            # then launch checking with initial config
+            simulator = simulate_model(self.args.source, self.args.compiler, self.args.ncores, self.args.cachedir,
+                                       profiler, metrics, program_cache, self.budget(self.args.checkpoint),
+                                       self.args.resume, state_writer, edge_writer,
+                                       self.engine(), self.args.compact, self.args.workers,
+                                       self.args.stealing, self.args.nodes)
+            statistics = simulator.statistics()
             # Print and write results
-            print("Model executed for {} cycles.".format(exec_time))
-            print("{} configs encountered:".format(len(cfgs)))
+            if statistics["stop_reason"] is not None:
+                print("Exploration stopped early ({stop_reason} budget exceeded), "
+                      "{frontier} configs left in the frontier.".format(**statistics))
+                if self.args.checkpoint:
+                    print("Checkpoint written to {}.".format(self.args.checkpoint))
+            print("Model executed for {} cycles.".format(statistics["exec_time"]))
+            print("{} configs encountered:".format(statistics["states"]))
+            if self.args.fusion_report:
+                self.print_fusion_report(simulator)
+            if self.args.guard_report:
+                self.print_guard_report(simulator)
+            for node in statistics.get("nodes", []):
+                print("Node {node} ({address}): {states} configs, {processed} processed at {rate:.1f}/s, "
+                      "{batches_in} batches received, {batches_out} sent ({send_waits} waits for the hub), "
+                      "at most {max_queued} configs waiting in the hub".format(**node))
 
-            model_name = self.args.source.split("/")[-1][:-5]
             # Model name, nb of cores, init config,nb of cycles, nb of cfgs
-            fields = [model_name, self.args.ncores, str(exec_time), str(len(cfgs))]
+            fields = [model_name(self.args.source), self.args.ncores, str(statistics["exec_time"]),
+                      str(statistics["states"])]
 
             import csv
             with open(self.args.outputfile, "a") as csv_file:
                 writer = csv.writer(csv_file)
                 writer.writerow(fields)
+
+    def budget(self, checkpoint_file):
+        """
+        :param checkpoint_file: checkpoint written if the budget is exceeded
+        :return: budget of the --max-* options, None if there is none
+        """
+        if self.args.max_time is None and self.args.max_states is None and self.args.max_memory is None:
+            return None
+        max_rss = None if self.args.max_memory is None else int(self.args.max_memory * 1024 * 1024)
+        return Budget(self.args.max_time, self.args.max_states, max_rss, checkpoint_file)
+
+    def engine(self):
+        """
+        :return: engine factory of the --engine, --optimize, --guards and --fusion-report options
+        """
+        engine = ENGINES[self.args.engine]
+        if engine is FastEngine and (self.args.optimize or self.args.guards or self.args.fusion_report):
+            return functools.partial(FastEngine, optimize=self.args.optimize, guards=self.args.guards,
+                                     report=self.args.fusion_report)
+        return engine
+
+    @staticmethod
+    def print_fusion_report(simulator):
+        for core in simulator.coordinator.cores:
+            if core.engine is not None:
+                for row in core.engine.fusion_report():
+                    print("Core {} {pattern:>24}: {sites} sites, {executions} executions, "
+                          "{dispatches_saved} dispatches saved".format(core.nb, **row))
+
+    @staticmethod
+    def print_guard_report(simulator):
+        for core in simulator.coordinator.cores:
+            if core.engine is not None:
+                for row in core.engine.guard_report():
+                    print("Core {} guard {guard:>5}: {bits} bits read, {entries} cached results, "
+                          "{evaluations} evaluations".format(core.nb, **row))
+
+    @staticmethod
+    def print_search_result(result):
+        print("Search {seed} (cores {core_order}): {states} configs, {exec_time} cycles in {host_time:.1f}s".format(
+            **result) + ("" if result["stop_reason"] is None else " (stopped: {stop_reason})".format(**result)))
+
+    @staticmethod
+    def print_batch_result(result):
+        if result["error"] is not None:
+            print("{model} ({ncores} cores) failed: {error}".format(**result))
+        else:
+            print("{model} ({ncores} cores): {exec_time} cycles, {states} configs in {host_time:.1f}s".format(**result)
+                  + ("" if result["stop_reason"] is None else " (stopped: {stop_reason})".format(**result)))
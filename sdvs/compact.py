@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Compact: Visited set and frontier of 64-bit words for configurations that fit in one
+
+from array import array
+
+from sdvs.checker import Checker
+from sdvs.constants import *
+
+WORD_SIZE = 64
+WORD_MASK = (1 << WORD_SIZE) - 1
+# Fibonacci hashing of the words into the open-addressing table
+MULTIPLIER = 0x9E3779B97F4A7C15
+# Initial number of slots (a power of two) and maximum load of the table
+INITIAL_SLOTS = 1 << 10
+MAX_LOAD = 0.5
+
+
+def used_bits(programs, cfg_size):
+    """
+    :param programs: decoded program of each core
+    :param cfg_size: configuration size in bits
+    :return: mask of the configuration bits loaded or stored by the programs, every
+    bit if an address comes from a register
+    """
+    used = 0
+    for program in programs:
+        for instruction in program:
+            if instruction.op_code == OP_LOAD and instruction.cfg_mask == LOAD_ADR or \
+                    instruction.op_code == OP_STORE and instruction.cfg_mask == STORE_ADR:
+                used |= ((1 << TYPES_TO_SIZE[instruction.type]) - 1) << instruction.address
+            elif instruction.op_code == OP_LOAD and instruction.cfg_mask == LOAD_RAA or \
+                    instruction.op_code == OP_STORE and instruction.cfg_mask == STORE_RAA:
+                return (1 << cfg_size) - 1
+    return used
+
+
+class CompactLayout:
+    """
+    Packing of the used bits of the configurations into one 64-bit word, the
+    other bits keeping the value they have in base. Runs of used bits are
+    stored one after the other from the least significant bit of the word.
+    """
+
+    def __init__(self, used, base):
+        self.used = used
+        self.base = base & ~used
+        self.width = bin(used).count("1")
+        # (shift in the configuration, width) of each run of used bits
+        self.segments = []
+        shift = 0
+        while used >> shift:
+            if used >> shift & 1:
+                width = 0
+                while used >> (shift + width) & 1:
+                    width += 1
+                self.segments.append((shift, width))
+                shift += width
+            else:
+                shift += 1
+        # Single run from bit 0: packing is a mask
+        self.identity = len(self.segments) <= 1 and not (self.segments and self.segments[0][0])
+
+    @classmethod
+    def from_decoders(cls, decoders, cfg_size, base):
+        """
+        :param decoders: decoder of each core
+        :param cfg_size: configuration size in bits
+        :param base: configuration giving the value of the bits no program uses
+        :return: layout of the configurations, None if their used bits do not fit in a word
+        """
+        used = used_bits([decoder.program for decoder in decoders], cfg_size)
+        if bin(used).count("1") > WORD_SIZE:
+            return None
+        return cls(used, base)
+
+    def pack(self, config):
+        """
+        :param config: configuration
+        :return: word of the configuration, None if it has unused bits differing from base
+        (such as a store overflowing its field)
+        """
+        if config & ~self.used != self.base:
+            return None
+        if self.identity:
+            return config & self.used
+        word = 0
+        offset = 0
+        for shift, width in self.segments:
+            word |= ((config >> shift) & ((1 << width) - 1)) << offset
+            offset += width
+        return word
+
+    def unpack(self, word):
+        """
+        :param word: word returned by pack
+        :return: configuration
+        """
+        if self.identity:
+            return self.base | word
+        config = self.base
+        for shift, width in self.segments:
+            config |= (word & ((1 << width) - 1)) << shift
+            word >>= width
+        return config
+
+
+class CompactConfigSet:
+    """
+    Set of configurations stored as packed words in an open-addressing table
+    of array('Q'), 0 marking empty slots (the null word is kept apart). The
+    configurations the layout cannot pack are kept in a regular set.
+    """
+
+    def __init__(self, layout, slots=INITIAL_SLOTS):
+        self.layout = layout
+        self.slots = array("Q", bytes(8 * slots))
+        self.shift = WORD_SIZE - (slots.bit_length() - 1)
+        self.used = 0
+        self.zero = False
+        self.overflow = set()
+
+    def index(self, word):
+        return ((word * MULTIPLIER) & WORD_MASK) >> self.shift
+
+    def add_word(self, word):
+        """
+        :param word: packed configuration
+        :return: True if the word was not already in the set
+        """
+        if word == 0:
+            new = not self.zero
+            self.zero = True
+            return new
+        slots = self.slots
+        mask = len(slots) - 1
+        index = ((word * MULTIPLIER) & WORD_MASK) >> self.shift
+        while True:
+            current = slots[index]
+            if current == 0:
+                slots[index] = word
+                self.used += 1
+                if self.used > MAX_LOAD * len(slots):
+                    self.grow()
+                return True
+            if current == word:
+                return False
+            index = (index + 1) & mask
+
+    def contains_word(self, word):
+        if word == 0:
+            return self.zero
+        slots = self.slots
+        mask = len(slots) - 1
+        index = self.index(word)
+        while True:
+            current = slots[index]
+            if current == word:
+                return True
+            if current == 0:
+                return False
+            index = (index + 1) & mask
+
+    def grow(self):
+        old_slots = self.slots
+        self.slots = array("Q", bytes(16 * len(old_slots)))
+        self.shift -= 1
+        self.used = 0
+        for word in old_slots:
+            if word:
+                self.add_word(word)
+
+    def add(self, config, config_hash=None):
+        """
+        Add a configuration to the set.
+        :param config: configuration to add
+        :param config_hash: unused, for compatibility with HashedConfigSet
+        :return: True if the configuration was not already in the set
+        """
+        word = self.layout.pack(config)
+        if word is None:
+            if config in self.overflow:
+                return False
+            self.overflow.add(config)
+            return True
+        return self.add_word(word)
+
+    def __contains__(self, config):
+        word = self.layout.pack(config)
+        if word is None:
+            return config in self.overflow
+        return self.contains_word(word)
+
+    def __len__(self):
+        return self.used + self.zero + len(self.overflow)
+
+    def __iter__(self):
+        unpack = self.layout.unpack
+        if self.zero:
+            yield unpack(0)
+        for word in self.slots:
+            if word:
+                yield unpack(word)
+        yield from self.overflow
+
+
+class CompactFrontier:
+    """
+    Stack of (configuration, hash) stored as packed words and hashes in
+    array('Q'). A configuration the layout cannot pack is kept in a list, its
+    word being its index in the list and its flag 1.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.words = array("Q")
+        self.hashes = array("Q")
+        self.flags = bytearray()
+        self.overflow = []
+
+    def append(self, item):
+        """
+        :param item: (configuration, hash) pair, the hash being None if unknown
+        """
+        config, config_hash = item
+        word = self.layout.pack(config)
+        if word is None:
+            word = len(self.overflow)
+            self.overflow.append(config)
+            self.flags.append(1)
+        else:
+            self.flags.append(0)
+        self.words.append(word)
+        # The hash of an empty configuration is 0 as well: 0 stands for no hash
+        self.hashes.append(config_hash or 0)
+
+    def pop(self):
+        """
+        :return: last (configuration, hash) pair
+        """
+        word = self.words.pop()
+        config_hash = self.hashes.pop()
+        if self.flags.pop():
+            config = self.overflow.pop()
+        else:
+            config = self.layout.unpack(word)
+        return config, config_hash if config_hash or config == 0 else None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        for word, config_hash, flag in zip(self.words, self.hashes, self.flags):
+            yield (self.overflow[word] if flag else self.layout.unpack(word)), config_hash
+
+
+class CompactChecker(Checker):
+    """
+    Checker whose visited set and frontier hold the configurations as packed
+    64-bit words: about 16 bytes per visited configuration instead of a
+    dictionary entry and an integer object.
+    """
+
+    def __init__(self, layout, hasher=None, prop=None):
+        super(CompactChecker, self).__init__(hasher, prop)
+        self.layout = layout
+        self.known = CompactConfigSet(layout)
+        self.frontier = CompactFrontier(layout)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Compile cache: Reuse the sdvc outputs of a model, keyed by source, compiler and number of cores
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Output name given to sdvc, core i binary is OUTPUT_NAME.i
+OUTPUT_NAME = "a.out"
+
+
+class CompilationException(Exception):
+    """
+    The compiler failed or did not produce every per-core binary.
+    """
+    pass
+
+
+class CompileCache:
+    """
+    Run sdvc at most once per (source, compiler, number of cores). Binaries go to
+    directory/<model name>/<key>/a.out.i where the key hashes the content of the
+    source and of the compiler binary along with the number of cores. Compilation
+    happens in a temporary directory renamed once complete, so concurrent runs,
+    even of the same model, never see partial outputs.
+    """
+
+    def __init__(self, directory="bin"):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_file(file_name, digest):
+        with open(file_name, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+
+    def key(self, source, compiler, ncores):
+        """
+        :param source: SDVE model source file
+        :param compiler: sdvc path or command name
+        :param ncores: number of cores
+        :return: hexadecimal key of the compilation
+        """
+        digest = hashlib.sha256()
+        self.hash_file(source, digest)
+        compiler_path = compiler if os.path.isfile(compiler) else shutil.which(compiler)
+        if compiler_path is not None:
+            self.hash_file(compiler_path, digest)
+        else:
+            digest.update(compiler.encode())
+        digest.update(str(int(ncores)).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def binaries(directory, ncores):
+        return [os.path.join(directory, "{}.{}".format(OUTPUT_NAME, i)) for i in range(int(ncores))]
+
+    def compile(self, source, compiler, ncores):
+        """
+        Compile a model unless it was already compiled with the same inputs.
+        :param source: SDVE model source file
+        :param compiler: sdvc path or command name
+        :param ncores: number of cores
+        :return: paths of the per-core binaries
+        """
+        model_name = os.path.splitext(os.path.basename(source))[0]
+        model_directory = os.path.join(self.directory, model_name)
+        output_directory = os.path.join(model_directory, self.key(source, compiler, ncores)[:16])
+        bin_paths = self.binaries(output_directory, ncores)
+        if all(os.path.isfile(bin_path) for bin_path in bin_paths):
+            self.hits += 1
+            return bin_paths
+        self.misses += 1
+        os.makedirs(model_directory, exist_ok=True)
+        temp_directory = tempfile.mkdtemp(dir=model_directory, prefix=".tmp")
+        try:
+            result = subprocess.run([compiler, "-c", source, "-o", os.path.join(temp_directory, OUTPUT_NAME),
+                                     "-n", str(ncores)])
+            if result.returncode != 0:
+                raise CompilationException("{} exited with code {}".format(compiler, result.returncode))
+            if not all(os.path.isfile(bin_path) for bin_path in self.binaries(temp_directory, ncores)):
+                raise CompilationException("{} did not produce {} binaries".format(compiler, ncores))
+            try:
+                os.rename(temp_directory, output_directory)
+            except OSError:
+                # Another run completed the same compilation first
+                if not all(os.path.isfile(bin_path) for bin_path in bin_paths):
+                    raise
+        finally:
+            if os.path.isdir(temp_directory):
+                shutil.rmtree(temp_directory)
+        return bin_paths
@@ -13,24 +13,85 @@ from sdvs.memory import Memory
 
 class Coordinator:
 
-    def __init__(self, decoders, cfg_size):
+    def __init__(self, decoders, cfg_size, hasher=None, engine=None):
         self.cfg_size = cfg_size
+        self.hasher = hasher
         self.cores = []
         for i, decoder in enumerate(decoders):
-            self.cores.append(Core(decoder, i))
+            core = Core(decoder, i)
+            # Engine factory, called with the decoder of each core (e.g. sdvs.engine.FastEngine)
+            if engine is not None:
+                core.engine = engine(decoder)
+            # Memories reused by every expansion, see Core.load_config
+            core.setup_cfg_memory(Memory(cfg_size, 0, hasher))
+            self.cores.append(core)
+        # Maximum execution time of the cores run by the last call to successors
         self.executed_cycles = 0
+        # (core, guard pc, cycles) of the last successors, see record_labels
+        self.labels = None
 
-    def process_config(self, config):
+    def record_labels(self):
+        """
+        Record the label of each successor: the core and the guard block (pc of
+        its endga) that produced it and the cycles spent since the previous one.
+        """
+        self.labels = []
+        for core in self.cores:
+            core.labels = []
+
+    def process_config(self, config, config_hash=None):
+        """
+        Run every core on the given configuration.
+        :param config: configuration to process
+        :param config_hash: hash of the configuration, computed if a hasher is set and none is given
+        :return: maximum execution time of the cores on this configuration, successor configurations
+        and their hashes (their labels are in self.labels if recorded)
+        """
         max_exec_time = 0
         new_configs = []
+        new_hashes = []
+        if self.hasher is not None and config_hash is None:
+            config_hash = self.hasher.hash_config(config)
+        labels = None if self.labels is None else []
         for core in self.cores:
-            core.reset_execution()
-            core.setup_cfg_memory(Memory(self.cfg_size, config))
-            # core.setup_cfg_memory(config)
+            # Cores count their cycles over the whole exploration
+            start_cycles = core.executed_cycles
+            core.load_config(config, config_hash)
             core.process_instructions()
             new_configs += core.new_configs
-            max_exec_time = max(core.executed_cycles, max_exec_time)
-        return max_exec_time, new_configs
+            new_hashes += core.new_hashes
+            if labels is not None:
+                labels += [(core.nb, pc, cycles) for pc, cycles in core.labels]
+            max_exec_time = max(core.executed_cycles - start_cycles, max_exec_time)
+        self.labels = labels
+        return max_exec_time, new_configs, new_hashes
+
+    def successors(self, config, config_hash=None):
+        """
+        Generator version of process_config: yield each successor as soon as a
+        core produces it, so that the consumer can check it right away and stop
+        the expansion by closing the generator. executed_cycles holds the
+        maximum execution time of the cores run so far on this configuration.
+        :param config: configuration to process
+        :param config_hash: hash of the configuration, computed if a hasher is set and none is given
+        :return: iterator over the (config, hash, label) successors, label being
+        (core, guard pc, cycles) if labels are recorded and None otherwise
+        """
+        self.executed_cycles = 0
+        if self.hasher is not None and config_hash is None:
+            config_hash = self.hasher.hash_config(config)
+        for core in self.cores:
+            start_cycles = core.executed_cycles
+            core.load_config(config, config_hash)
+            try:
+                if core.labels is None:
+                    yield from core.successors()
+                else:
+                    for new_config, new_hash, label in core.successors():
+                        yield new_config, new_hash, (core.nb,) + label
+            finally:
+                # Also reached when the consumer closes the generator
+                self.executed_cycles = max(core.executed_cycles - start_cycles, self.executed_cycles)
 
 
 if __name__ == "__main__":
@@ -45,7 +106,7 @@ if __name__ == "__main__":
     decoder2 = Decoder(bin_instructions2)
     add_decoders = [decoder0, decoder1, decoder2]
     coordinator = Coordinator(add_decoders, 128)
-    max_time, cfgs = coordinator.process_config(0x1)
+    max_time, cfgs, hashes = coordinator.process_config(0x1)
 
     print(max_time)
     print(list(map(hex, cfgs)))
@@ -8,6 +8,7 @@
 
 from sdvs.constants import *
 import copy
+import time
 
 def bool_to_int(boolean):
     return 1 if boolean else 0
@@ -29,23 +30,59 @@ class Core:
         self.current_instruction = None
         self.memory = None
         self.init_memory = None
-        self.registers = []
+        # Register file: one int per register, see register_objects for the Register view
+        self.registers = [0] * REG_NUMBER
         self.executed_cycles = 0
         self.idle = False
         self.new_configs = []
-        for i in range(REG_NUMBER):
-            self.registers.append(Register(i, REG_SIZE))
+        self.new_hashes = []
+        # (guard pc, cycles since the previous emission) of each new config, recorded when a list
+        self.labels = None
+        self.emitted_cycles = 0
+        # Optional instrumentation, see sdvs.profiler
+        self.profiler = None
+        # Optional execution engine replacing the interpreter, see sdvs.engine
+        self.engine = None
 
     def setup_cfg_memory(self, cfg_memory):
         self.init_memory = cfg_memory
+        # Working memory, allocated once and reloaded in place afterwards
+        if self.memory is None or self.memory is cfg_memory:
+            self.memory = copy.copy(cfg_memory)
+        else:
+            self.memory.size = cfg_memory.size
+            self.memory.hasher = cfg_memory.hasher
         self.reset_cfg_memory()
 
     def reset_cfg_memory(self):
-        self.memory = copy.deepcopy(self.init_memory)
+        memory = self.memory
+        memory.raw_memory = self.init_memory.raw_memory
+        memory.hash = self.init_memory.hash
+
+    def load_config(self, config, config_hash=None):
+        """
+        Prepare the core for the expansion of a configuration without allocating:
+        the successor lists are cleared and the configuration is loaded in the
+        memories set up by setup_cfg_memory. Registers are kept, as on the SDVU.
+        :param config: configuration to process
+        :param config_hash: hash of the configuration, computed if the memory has a hasher and none is given
+        """
+        self.reset_execution()
+        init_memory = self.init_memory
+        init_memory.raw_memory = config
+        if init_memory.hasher is not None:
+            init_memory.hash = init_memory.hasher.hash_config(config) if config_hash is None else config_hash
+        self.reset_cfg_memory()
 
     def reset_execution(self):
         self.idle = False
         self.decoder.next_instruction_index = 0
+        self.emitted_cycles = self.executed_cycles
+        # Successors (and their labels) of the previous configuration were already collected
+        self.new_configs.clear()
+        self.new_hashes.clear()
+        if self.labels is not None:
+            self.labels.clear()
 
     def assign_register_value(self, number, value):
         """
@@ -53,7 +90,7 @@ class Core:
         :param number: number of the register to assign
         :param value: value to assign
         """
-        self.registers[number].value = value
+        self.registers[number] = value
 
     def retrieve_register_value(self, number):
         """
@@ -61,7 +98,19 @@ class Core:
         :param number: number of the register to look into
         :return: value held by the register
         """
-        return self.registers[number].value
+        return self.registers[number]
+
+    def register_objects(self):
+        """
+        Materialise the register file for the GUI and printing.
+        :return: list of Register holding the current values
+        """
+        register_objects = []
+        for number, value in enumerate(self.registers):
+            register = Register(number, REG_SIZE)
+            register.value = value
+            register_objects.append(register)
+        return register_objects
 
     def process_one_instruction(self):
         """
@@ -79,21 +128,17 @@ class Core:
         """
         Returns the operands corresponding to the given configuration
         """
-        left_operand = None
-        right_operand = None
-        if self.current_instruction.cfg_mask == CFG_RR:
-            left_operand = self.retrieve_register_value(self.current_instruction.ra)
-            right_operand = self.retrieve_register_value(self.current_instruction.rb)
-        elif self.current_instruction.cfg_mask == CFG_RI:
-            left_operand = self.retrieve_register_value(self.current_instruction.ra)
-            right_operand = self.current_instruction.immb
-        elif self.current_instruction.cfg_mask == CFG_IR:
-            left_operand = self.current_instruction.imma
-            right_operand = self.retrieve_register_value(self.current_instruction.rb)
-        elif self.current_instruction.cfg_mask == CFG_II:
-            left_operand = self.current_instruction.imma
-            right_operand = self.current_instruction.immb
-        return left_operand, right_operand
+        instruction = self.current_instruction
+        cfg_mask = instruction.cfg_mask
+        if cfg_mask == CFG_RR:
+            return self.registers[instruction.ra], self.registers[instruction.rb]
+        elif cfg_mask == CFG_RI:
+            return self.registers[instruction.ra], instruction.immb
+        elif cfg_mask == CFG_IR:
+            return instruction.imma, self.registers[instruction.rb]
+        elif cfg_mask == CFG_II:
+            return instruction.imma, instruction.immb
+        return None, None
 
     def process_add(self):
         """
@@ -101,8 +146,7 @@ class Core:
         Assign left operand + right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   left_operand + right_operand)
+        self.registers[self.current_instruction.rd] = left_operand + right_operand
 
     def process_sub(self):
         """
@@ -110,8 +154,7 @@ class Core:
         Assign left operand - right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   left_operand - right_operand)
+        self.registers[self.current_instruction.rd] = left_operand - right_operand
 
     def process_mul(self):
         """
@@ -119,8 +162,7 @@ class Core:
         Assign left operand * right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   left_operand * right_operand)
+        self.registers[self.current_instruction.rd] = left_operand * right_operand
 
     def process_div(self):
         """
@@ -128,8 +170,7 @@ class Core:
         Assign left operand / right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   left_operand // right_operand)
+        self.registers[self.current_instruction.rd] = left_operand // right_operand
 
     def process_mod(self):
         """
@@ -137,8 +178,7 @@ class Core:
         Assign left operand % right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   left_operand % right_operand)
+        self.registers[self.current_instruction.rd] = left_operand % right_operand
 
     def process_and(self):
         """
@@ -146,8 +186,7 @@ class Core:
         Assign left operand and right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(left_operand and right_operand))
+        self.registers[self.current_instruction.rd] = bool_to_int(left_operand and right_operand)
 
     def process_or(self):
         """
@@ -155,8 +194,7 @@ class Core:
         Assign left operand or right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(left_operand or right_operand))
+        self.registers[self.current_instruction.rd] = bool_to_int(left_operand or right_operand)
 
     def process_less_than(self):
         """
@@ -164,8 +202,7 @@ class Core:
         Assign left operand < right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(left_operand < right_operand))
+        self.registers[self.current_instruction.rd] = bool_to_int(left_operand < right_operand)
 
     def process_greater_than(self):
         """
@@ -173,8 +210,7 @@ class Core:
         Assign left operand > right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(left_operand > right_operand))
+        self.registers[self.current_instruction.rd] = bool_to_int(left_operand > right_operand)
 
     def process_equal(self):
         """
@@ -182,23 +218,21 @@ class Core:
         Assign left operand == right operand in the destination register
         """
         left_operand, right_operand = self.process_binary_operands()
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(left_operand == right_operand))
+        self.registers[self.current_instruction.rd] = bool_to_int(left_operand == right_operand)
 
     def process_not(self):
         """
         Process the NOT operation
         Assign not(ra) in the destination register
         """
-        self.assign_register_value(self.current_instruction.rd,
-                                   bool_to_int(not (self.retrieve_register_value(self.current_instruction.ra))))
+        self.registers[self.current_instruction.rd] = bool_to_int(not (self.registers[self.current_instruction.ra]))
 
     def process_jmp(self):
         """
         Change the decoder current instruction to the given one if the
         condition in rd is true
         """
-        if self.retrieve_register_value(self.current_instruction.rd) == 0:
+        if self.registers[self.current_instruction.rd] == 0:
             self.decoder.next_instruction_index = self.current_instruction.address
 
     def process_store(self):
@@ -206,13 +240,13 @@ class Core:
         Store the content of a given register in memory
         """
         # Get value from rd
-        value = self.retrieve_register_value(self.current_instruction.rd)
+        value = self.registers[self.current_instruction.rd]
         if self.current_instruction.cfg_mask == STORE_ADR:
             # Store in memory
             self.memory.set_at_address(self.current_instruction.type, value, self.current_instruction.address)
         elif self.current_instruction.cfg_mask == STORE_RAA:
             # Get address out of register
-            address = self.retrieve_register_value(self.current_instruction.ra)
+            address = self.registers[self.current_instruction.ra]
             # Store in memory
             self.memory.set_at_address(self.current_instruction.type, value, address)
 
@@ -227,22 +261,21 @@ class Core:
             value = self.memory.retrieve_at_address(self.current_instruction.type,
                                                     self.current_instruction.address)
             # Assign to the destination register
-            self.assign_register_value(self.current_instruction.rd, value)
+            self.registers[self.current_instruction.rd] = value
 
         elif self.current_instruction.cfg_mask == LOAD_RAA:
             # Get address from register
-            address = self.retrieve_register_value(self.current_instruction.ra)
+            address = self.registers[self.current_instruction.ra]
             # Get value from memory
             value = self.memory.retrieve_at_address(self.current_instruction.type, address)
             # Assign to the destination register
-            self.assign_register_value(self.current_instruction.rd, value)
+            self.registers[self.current_instruction.rd] = value
 
         elif self.current_instruction.cfg_mask == LOAD_REG:
-            self.assign_register_value(self.current_instruction.rd,
-                                       self.retrieve_register_value(self.current_instruction.ra))
+            self.registers[self.current_instruction.rd] = self.registers[self.current_instruction.ra]
 
         elif self.current_instruction.cfg_mask == LOAD_IMM:
-            self.assign_register_value(self.current_instruction.rd, self.current_instruction.imma)
+            self.registers[self.current_instruction.rd] = self.current_instruction.imma
 
     def process_endga(self):
         """
@@ -250,6 +283,10 @@ class Core:
         :return:
         """
         self.new_configs.append(self.memory.raw_memory) # or self.memory
+        self.new_hashes.append(self.memory.hash)
+        if self.labels is not None:
+            self.labels.append((self.decoder.next_instruction_index - 1, self.executed_cycles - self.emitted_cycles))
+            self.emitted_cycles = self.executed_cycles
         self.reset_cfg_memory()
 
     def process_nop(self):
@@ -260,14 +297,61 @@ class Core:
         self.idle = True
 
     def process_instructions(self):
+        if self.profiler is not None:
+            self.process_instructions_profiled()
+            return
+        # Labels need the cycles at each endga, only the interpreter tracks them
+        if self.engine is not None and self.labels is None:
+            self.engine.run(self)
+            return
         self.executed_cycles += 2  # Reset routine (2)
         while not self.idle:
             self.executed_cycles += 4  # fetch (2) and decode (2)
             self.process_one_instruction()
 
+    def process_instructions_profiled(self):
+        """
+        Same as process_instructions but reports every instruction to the profiler.
+        """
+        self.executed_cycles += 2  # Reset routine (2)
+        while not self.idle:
+            self.process_one_instruction_profiled()
+
+    def process_one_instruction_profiled(self):
+        pc = self.decoder.next_instruction_index
+        start_cycles = self.executed_cycles
+        start_time = time.perf_counter()
+        self.executed_cycles += 4  # fetch (2) and decode (2)
+        self.process_one_instruction()
+        self.profiler.record(self.nb, pc, self.current_instruction,
+                             self.executed_cycles - start_cycles, time.perf_counter() - start_time)
+
+    def successors(self):
+        """
+        Same as process_instructions but yield each successor as soon as its
+        endga is executed, instead of accumulating them in new_configs. The
+        consumer can stop the execution by closing the generator.
+        :return: iterator over the (config, hash, label) successors, label being
+        (guard pc, cycles) when labels are recorded and None otherwise
+        """
+        if self.profiler is None and self.engine is not None and self.labels is None:
+            yield from self.engine.successors(self)
+            return
+        # The profiled step counts the fetch and decode cycles itself
+        fetch_decode_cycles = 4 if self.profiler is None else 0
+        process = self.process_one_instruction if self.profiler is None else self.process_one_instruction_profiled
+        new_configs = self.new_configs
+        self.executed_cycles += 2  # Reset routine (2)
+        while not self.idle:
+            self.executed_cycles += fetch_decode_cycles  # fetch (2) and decode (2)
+            process()
+            if new_configs:
+                label = None if self.labels is None else self.labels.pop()
+                yield new_configs.pop(), self.new_hashes.pop(), label
+
     def print_registers(self):
         print("Registers State:")
-        for reg in self.registers:
+        for reg in self.register_objects():
             print("R{}: {}".format(reg.number, hex(reg.value)))
         print("----------------")
 
@@ -282,6 +366,22 @@ class Core:
             else:
                 self.executed_cycles += 1
 
+    @classmethod
+    def instruction_cycles(cls, instruction):
+        """
+        Cycles of an instruction as counted by add_exec_cycles (fetch and decode excluded).
+        :param instruction: decoded instruction
+        :return: number of cycles
+        """
+        if instruction.op_code != OP_LOAD:
+            return cls.INSTR_CYCLES[instruction.op_code]
+        elif instruction.cfg_mask == LOAD_ADR:
+            return 2
+        elif instruction.cfg_mask == LOAD_RAA:
+            return 3
+        else:
+            return 1
+
     PROCESS_FUNCTIONS = {
         OP_ADD: process_add,
         OP_SUB: process_sub,
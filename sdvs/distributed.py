@@ -0,0 +1,622 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Distributed: Exploration over nodes each owning a partition of the visited set, linked over TCP
+
+import functools
+import json
+import multiprocessing
+import select
+import selectors
+import socket
+import struct
+import time
+from collections import deque
+
+from sdvs.binary_reader import BinaryReader
+from sdvs.checker import HashedConfigSet
+from sdvs.coordinator import Coordinator
+from sdvs.decoder import Decoder
+from sdvs.engine import ENGINES, FastEngine
+from sdvs.hashing import ZobristHasher
+from sdvs.state_file import record_width
+from sdvs.transport import BATCH, decode_batch, encode_batch
+
+DEFAULT_PORT = 7571
+# Configurations per batch sent to another node
+BATCH_SIZE = 256
+# Batches a node may have received and not yet pushed on its frontier, the others wait in the hub
+CREDITS = 4
+# Batches a node may have sent and the hub not yet delivered, the node waiting before sending more
+SEND_CREDITS = 4
+# Expansions of a node between two checks of the frames of the hub
+POLL_EXPANSIONS = 16
+RECV_SIZE = 1 << 16
+
+# Frame header: payload length and message type
+FRAME = struct.Struct("<IB")
+# Setup header: length of the JSON parameters, followed by the programs
+SETUP = struct.Struct("<I")
+# Destination node of a batch sent to the hub
+DESTINATION = struct.Struct("<H")
+# Cumulated counters of a node: states, processed, successors, exec_time, batches received, batches sent,
+# waits for a send credit, busy time
+COUNTERS = struct.Struct("<QQQQQQQd")
+COUNTER_NAMES = ("states", "processed", "successors", "exec_time", "batches_in", "batches_out", "send_waits",
+                 "busy_time")
+# Batches received by a node when it reported its frontier empty
+RECEIVED = struct.Struct("<Q")
+
+# Message types
+MSG_SETUP = 1
+MSG_CONFIGS = 2
+MSG_DONE = 3
+MSG_STOP = 4
+MSG_STATES = 5
+MSG_STATS = 6
+MSG_ACK = 7
+MSG_CREDIT = 8
+
+
+def frame(kind, payload=b""):
+    return FRAME.pack(len(payload), kind) + payload
+
+
+class FrameReader:
+    """
+    Split the bytes received on a stream into (type, payload) frames.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """
+        :param data: received bytes
+        :return: list of the frames completed by data
+        """
+        self.buffer += data
+        frames = []
+        offset = 0
+        while len(self.buffer) - offset >= FRAME.size:
+            length, kind = FRAME.unpack_from(self.buffer, offset)
+            end = offset + FRAME.size + length
+            if end > len(self.buffer):
+                break
+            frames.append((kind, bytes(self.buffer[offset + FRAME.size:end])))
+            offset = end
+        del self.buffer[:offset]
+        return frames
+
+
+def receive_frame(connection, reader, frames):
+    """
+    Blocking read of the next frame of a connection.
+    :param frames: deque of the frames already split by reader
+    :return: (type, payload)
+    """
+    while not frames:
+        data = connection.recv(RECV_SIZE)
+        if not data:
+            raise ConnectionError("Connection closed by the peer")
+        frames.extend(reader.feed(data))
+    return frames.popleft()
+
+
+def encode_engine(engine):
+    """
+    :param engine: engine factory, None for the interpreter
+    :return: name of the engine in ENGINES and options of the fast engine
+    """
+    options = {}
+    if isinstance(engine, functools.partial) and engine.func is FastEngine and not engine.args:
+        if not set(engine.keywords) <= {"optimize", "guards", "report"}:
+            raise ValueError("Fast engine options {} cannot be sent to nodes".format(sorted(engine.keywords)))
+        # Nodes print no fusion report
+        options = {key: bool(value) for key, value in engine.keywords.items() if key in ("optimize", "guards")}
+        engine = FastEngine
+    for name, factory in ENGINES.items():
+        if factory is engine:
+            return name, options
+    raise ValueError("Engine {!r} cannot be sent to nodes".format(engine))
+
+
+def decode_engine(name, options):
+    """
+    :return: engine factory of a name and options returned by encode_engine
+    """
+    engine = ENGINES[name]
+    if options:
+        return functools.partial(engine, optimize=bool(options.get("optimize")), guards=bool(options.get("guards")))
+    return engine
+
+
+def encode_setup(programs, cfg_size, index, nodes, batch_size, engine):
+    """
+    :param programs: bytes of the program binaries
+    :param engine: engine factory, see encode_engine
+    :return: JSON parameters, then the programs whose lengths they hold
+    """
+    name, options = encode_engine(engine)
+    header = json.dumps({"cfg_size": cfg_size, "index": index, "nodes": nodes, "batch_size": batch_size,
+                         "engine": name, "engine_options": options,
+                         "programs": [len(program) for program in programs]}).encode()
+    return b"".join([SETUP.pack(len(header)), header] + list(programs))
+
+
+def decode_setup(payload):
+    """
+    :param payload: bytes returned by encode_setup
+    :return: dictionary of the parameters, programs holding their bytes and engine the factory
+    """
+    try:
+        (length,) = SETUP.unpack_from(payload)
+        setup = json.loads(payload[SETUP.size:SETUP.size + length].decode())
+        offset = SETUP.size + length
+        programs = []
+        for size in setup["programs"]:
+            programs.append(payload[offset:offset + size])
+            offset += size
+        if offset != len(payload) or setup["engine"] not in ENGINES:
+            raise ValueError("Inconsistent setup")
+        setup["programs"] = programs
+        setup["engine"] = decode_engine(setup["engine"], setup["engine_options"])
+        for key in ("cfg_size", "index", "nodes", "batch_size"):
+            if not isinstance(setup[key], int) or setup[key] < 0:
+                raise ValueError("Invalid {}".format(key))
+        if setup["index"] >= setup["nodes"] or setup["batch_size"] == 0:
+            raise ValueError("Invalid node index or batch size")
+    except (struct.error, ValueError, KeyError, TypeError, AttributeError) as error:
+        raise ConnectionError("Invalid setup message: {}".format(error))
+    return setup
+
+
+def parse_nodes(text):
+    """
+    :param text: number of local nodes or comma-separated host:port addresses
+    :return: int or list of (host, port)
+    """
+    if text.isdigit():
+        return int(text)
+    addresses = []
+    for address in text.split(","):
+        host, _, port = address.rpartition(":")
+        addresses.append((host, int(port)) if host else (port, DEFAULT_PORT))
+    return addresses
+
+
+class Node:
+    """
+    Exploration session of a node. The node owns the configurations whose
+    hash modulo the number of nodes is its index: it keeps them in its visited
+    set and explores them depth-first, successors owned by other nodes being
+    sent to the hub in batches. Frames of the hub are handled between two
+    expansions: a received batch is pushed on the frontier and acknowledged
+    right away, which returns a credit to the hub. A node may have at most
+    SEND_CREDITS batches waiting in the hub and waits for the hub to deliver
+    one before sending more, still pushing the batches it receives meanwhile.
+    Once its frontier is empty and its batches sent, the node reports the
+    number of batches it received with its counters.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.reader = FrameReader()
+        self.frames = deque()
+        kind, payload = receive_frame(connection, self.reader, self.frames)
+        if kind != MSG_SETUP:
+            raise ConnectionError("Expected a setup message, got type {}".format(kind))
+        setup = decode_setup(payload)
+        decoders = [Decoder(BinaryReader.instructions_from_bytes(program)) for program in setup["programs"]]
+        self.hasher = ZobristHasher()
+        self.coordinator = Coordinator(decoders, setup["cfg_size"], self.hasher, setup["engine"])
+        self.width = record_width(setup["cfg_size"])
+        self.index = setup["index"]
+        self.nodes = setup["nodes"]
+        self.batch_size = setup["batch_size"]
+        self.known = HashedConfigSet(self.hasher)
+        self.frontier = []
+        self.outgoing = [[] for _ in range(self.nodes)]
+        self.send_credits = SEND_CREDITS
+        self.processed = 0
+        self.successors = 0
+        self.exec_time = 0
+        self.batches_in = 0
+        self.batches_out = 0
+        self.send_waits = 0
+        self.busy_time = 0.0
+
+    def counters(self):
+        return COUNTERS.pack(len(self.known), self.processed, self.successors, self.exec_time,
+                             self.batches_in, self.batches_out, self.send_waits, self.busy_time)
+
+    def handle(self, kind, payload):
+        """
+        :return: False once the hub stops the exploration
+        """
+        if kind == MSG_CONFIGS:
+            known = self.known
+            frontier = self.frontier
+            for config, config_hash in decode_batch(payload, self.width):
+                if known.add(config, config_hash):
+                    frontier.append((config, config_hash))
+            self.batches_in += 1
+            self.connection.sendall(frame(MSG_ACK))
+        elif kind == MSG_CREDIT:
+            self.send_credits += 1
+        elif kind == MSG_STOP:
+            if payload[0]:
+                states = list(zip(self.known, (0 for _ in range(len(self.known)))))
+                for start in range(0, len(states), self.batch_size):
+                    self.connection.sendall(frame(MSG_STATES,
+                                                  encode_batch(states[start:start + self.batch_size], self.width)))
+            self.connection.sendall(frame(MSG_STATS, self.counters()))
+            return False
+        else:
+            raise ConnectionError("Unexpected message type {}".format(kind))
+        return True
+
+    def poll(self):
+        """
+        Handle the frames received so far, without waiting.
+        """
+        if select.select([self.connection], [], [], 0)[0]:
+            data = self.connection.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionError("Connection closed by the peer")
+            self.frames.extend(self.reader.feed(data))
+        while self.frames:
+            self.handle(*self.frames.popleft())
+
+    def send_batch(self, owner):
+        if not self.send_credits:
+            self.send_waits += 1
+            while not self.send_credits:
+                self.handle(*receive_frame(self.connection, self.reader, self.frames))
+        self.send_credits -= 1
+        self.connection.sendall(frame(MSG_CONFIGS, DESTINATION.pack(owner) +
+                                      encode_batch(self.outgoing[owner], self.width)))
+        self.outgoing[owner] = []
+        self.batches_out += 1
+
+    def explore(self):
+        known = self.known
+        frontier = self.frontier
+        process_config = self.coordinator.process_config
+        index, nodes, batch_size = self.index, self.nodes, self.batch_size
+        outgoing = self.outgoing
+        expansions = 0
+        while frontier:
+            config, config_hash = frontier.pop()
+            exec_time, new_configs, new_hashes = process_config(config, config_hash)
+            self.exec_time += exec_time
+            self.processed += 1
+            self.successors += len(new_configs)
+            for new_config, new_hash in zip(new_configs, new_hashes):
+                owner = new_hash % nodes
+                if owner == index:
+                    if known.add(new_config, new_hash):
+                        frontier.append((new_config, new_hash))
+                else:
+                    outgoing[owner].append((new_config, new_hash))
+                    if len(outgoing[owner]) >= batch_size:
+                        self.send_batch(owner)
+            expansions += 1
+            if expansions % POLL_EXPANSIONS == 0:
+                self.poll()
+            if not frontier:
+                # Batches received while the last ones are sent are explored as well
+                for owner in range(nodes):
+                    if outgoing[owner]:
+                        self.send_batch(owner)
+
+    def run(self):
+        while True:
+            kind, payload = receive_frame(self.connection, self.reader, self.frames)
+            if not self.handle(kind, payload):
+                return
+            if kind == MSG_CONFIGS:
+                start = time.perf_counter()
+                self.explore()
+                self.busy_time += time.perf_counter() - start
+                # Successors are sent before the report
+                self.connection.sendall(frame(MSG_DONE, self.counters() + RECEIVED.pack(self.batches_in)))
+
+
+def listen(host, port):
+    """
+    :return: TCP socket listening on host and port (socket.create_server needs Python 3.8)
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((host, port))
+        listener.listen()
+    except OSError:
+        listener.close()
+        raise
+    return listener
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, sessions=None, listener=None):
+    """
+    Run a node: accept hub connections one at a time and run their sessions.
+    :param sessions: number of sessions before returning, None to serve forever
+    :param listener: listening socket to use instead of binding host and port
+    """
+    if listener is None:
+        listener = listen(host, port)
+    with listener:
+        while sessions is None or sessions > 0:
+            connection, _ = listener.accept()
+            with connection:
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                Node(connection).run()
+            if sessions is not None:
+                sessions -= 1
+
+
+def run_local_node(pipe):
+    # Bound to an ephemeral port, sent to the hub before serving its session
+    listener = listen("127.0.0.1", 0)
+    pipe.send(listener.getsockname()[1])
+    pipe.close()
+    serve(sessions=1, listener=listener)
+
+
+class Link:
+    """
+    Hub side of the connection to a node: batches waiting for a credit and
+    bytes waiting for the socket to be writable.
+    """
+
+    def __init__(self, index, connection, address):
+        self.index = index
+        self.connection = connection
+        self.address = address
+        self.reader = FrameReader()
+        self.output = bytearray()
+        # (frame, number of configurations, producer link) of the batches waiting for a credit
+        self.queue = deque()
+        self.queued = 0
+        self.max_queued = 0
+        self.credits = CREDITS
+        self.delivered = 0
+        # Frontier empty after receiving every delivered batch, as last reported
+        self.idle = True
+        self.counters = dict.fromkeys(COUNTER_NAMES, 0)
+        self.stopped = False
+
+
+class DistributedSimulator:
+    """
+    Exploration spread over nodes, each owning the configurations whose hash
+    modulo the number of nodes is its index (see Node). This process is the
+    hub: it starts the exploration, forwards the batches of configurations
+    between nodes and aggregates their counters. A node holds at most CREDITS
+    batches it has not acknowledged, the batches for a slow node waiting in the
+    hub, and the hub never blocks on a socket. The hub returns the send credit
+    of a producer once its batch is delivered: the batches waiting for a node
+    are at most SEND_CREDITS per other node, and a producer waiting for a credit
+    still acknowledges the batches it receives, so that no node waits on
+    another. The exploration ends once every node reported its frontier empty
+    after the last batch delivered to it and no batch waits in the hub. Nodes are launched as local
+    processes or are nodes already serving at the given addresses
+    (python -m sdvs.distributed). The setup message holds the programs and the
+    engine name, never Python objects: the engine is one of ENGINES.
+    """
+
+    def __init__(self, bin_paths, cfg_size, nodes=2, engine=None, metrics=None, batch_size=BATCH_SIZE):
+        """
+        :param nodes: number of local nodes to launch or list of (host, port) of running nodes
+        """
+        self.bin_paths = bin_paths
+        self.cfg_size = cfg_size
+        self.nodes = nodes
+        self.engine = engine
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.width = record_width(cfg_size)
+        self.hasher = ZobristHasher()
+        self.links = []
+        self.states = None
+        self.host_time = 0.0
+        self.stop_reason = None
+
+    def launch_nodes(self, count):
+        """
+        :return: local node processes and their addresses
+        """
+        processes = []
+        addresses = []
+        for _ in range(count):
+            pipe, node_pipe = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_local_node, args=(node_pipe,), daemon=True)
+            process.start()
+            node_pipe.close()
+            processes.append(process)
+            addresses.append(("127.0.0.1", pipe.recv()))
+            pipe.close()
+        return processes, addresses
+
+    def launch_checking(self, init_cfg, collect=False):
+        """
+        Explore the configurations reachable from the initial one.
+        :param init_cfg: initial configuration
+        :param collect: gather the configurations of every node at the end
+        :return: execution time in cycles and encountered configurations (None unless collect)
+        """
+        processes = []
+        if isinstance(self.nodes, int):
+            processes, addresses = self.launch_nodes(self.nodes)
+        else:
+            addresses = list(self.nodes)
+        programs = []
+        for path in self.bin_paths:
+            with open(path, "rb") as file:
+                programs.append(file.read())
+        start = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.start()
+        selector = selectors.DefaultSelector()
+        try:
+            for index, address in enumerate(addresses):
+                connection = socket.create_connection(address)
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                connection.sendall(frame(MSG_SETUP, encode_setup(programs, self.cfg_size, index, len(addresses),
+                                                                 self.batch_size, self.engine)))
+                connection.setblocking(False)
+                link = Link(index, connection, address)
+                self.links.append(link)
+                selector.register(connection, selectors.EVENT_READ, link)
+            init_hash = self.hasher.hash_config(init_cfg)
+            owner = self.links[init_hash % len(self.links)]
+            self.enqueue(selector, owner, encode_batch([(init_cfg, init_hash)], self.width), None)
+            self.pump(selector, lambda: not all(link.idle and not link.queue for link in self.links))
+            if collect:
+                self.states = []
+            for link in self.links:
+                self.send(selector, link, frame(MSG_STOP, bytes([collect])))
+            self.pump(selector, lambda: not all(link.stopped for link in self.links))
+            for process in processes:
+                process.join()
+        finally:
+            for link in self.links:
+                link.connection.close()
+            selector.close()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        self.host_time = time.perf_counter() - start
+        if self.metrics is not None:
+            self.report(self.metrics.report, final=True)
+            self.metrics.close()
+        return self.exec_time, self.states
+
+    def send(self, selector, link, data):
+        if not link.output:
+            selector.modify(link.connection, selectors.EVENT_READ | selectors.EVENT_WRITE, link)
+        link.output += data
+
+    def enqueue(self, selector, link, batch, producer):
+        """
+        Queue a batch of configurations for a node, producer being the link it came from (None for the hub).
+        """
+        count = sum(BATCH.unpack_from(batch))
+        link.queue.append((frame(MSG_CONFIGS, batch), count, producer))
+        link.queued += count
+        link.max_queued = max(link.max_queued, link.queued)
+        self.dispatch(selector, link)
+
+    def dispatch(self, selector, link):
+        while link.credits and link.queue:
+            link.credits -= 1
+            data, count, producer = link.queue.popleft()
+            link.queued -= count
+            link.delivered += 1
+            link.idle = False
+            self.send(selector, link, data)
+            if producer is not None:
+                self.send(selector, producer, frame(MSG_CREDIT))
+
+    def pump(self, selector, running):
+        """
+        Handle the events of the node connections while running() is true.
+        """
+        while running():
+            for key, events in selector.select():
+                link = key.data
+                if events & selectors.EVENT_WRITE:
+                    sent = link.connection.send(link.output)
+                    del link.output[:sent]
+                    if not link.output:
+                        selector.modify(link.connection, selectors.EVENT_READ, link)
+                if events & selectors.EVENT_READ:
+                    data = link.connection.recv(RECV_SIZE)
+                    if not data:
+                        raise ConnectionError("Node {} at {}:{} closed the connection".format(link.index,
+                                                                                              *link.address))
+                    for kind, payload in link.reader.feed(data):
+                        self.handle(selector, link, kind, payload)
+
+    def handle(self, selector, link, kind, payload):
+        if kind == MSG_CONFIGS:
+            (owner,) = DESTINATION.unpack_from(payload)
+            self.enqueue(selector, self.links[owner], payload[DESTINATION.size:], link)
+        elif kind == MSG_ACK:
+            link.credits += 1
+            self.dispatch(selector, link)
+        elif kind == MSG_DONE:
+            link.counters = dict(zip(COUNTER_NAMES, COUNTERS.unpack_from(payload)))
+            (received,) = RECEIVED.unpack_from(payload, COUNTERS.size)
+            # Batches delivered since the report are still to explore
+            link.idle = received == link.delivered
+            if self.metrics is not None:
+                self.report(self.metrics.poll)
+        elif kind == MSG_STATES:
+            self.states += [config for config, _ in decode_batch(payload, self.width)]
+        elif kind == MSG_STATS:
+            link.counters = dict(zip(COUNTER_NAMES, COUNTERS.unpack(payload)))
+            link.stopped = True
+            # The node closes the connection after its statistics
+            selector.unregister(link.connection)
+        else:
+            raise ConnectionError("Unexpected message type {} from node {}".format(kind, link.index))
+
+    def report(self, function, **kwargs):
+        statistics = self.statistics()
+        function(statistics["processed"], statistics["frontier"], statistics["states"], statistics["successors"],
+                 statistics["exec_time"], **kwargs)
+
+    def total(self, name):
+        return sum(link.counters[name] for link in self.links)
+
+    @property
+    def exec_time(self):
+        return self.total("exec_time")
+
+    def node_statistics(self):
+        """
+        :return: counters of each node with its throughput in processed configurations per
+        second of exploration (rate) and of the whole run (overall_rate), and the most
+        configurations that waited for it in the hub (max_queued)
+        """
+        rows = []
+        for link in self.links:
+            row = dict(link.counters, node=link.index, address="{}:{}".format(*link.address),
+                       max_queued=link.max_queued)
+            row["rate"] = row["processed"] / row["busy_time"] if row["busy_time"] else 0.0
+            row["overall_rate"] = row["processed"] / self.host_time if self.host_time else 0.0
+            rows.append(row)
+        return rows
+
+    def statistics(self):
+        """
+        :return: statistics of the exploration, see Simulator.statistics, and the counters of
+        each node (see node_statistics)
+        """
+        return {
+            "stop_reason": self.stop_reason,
+            "states": self.total("states"),
+            "processed": self.total("processed"),
+            "frontier": sum(link.queued for link in self.links),
+            "successors": self.total("successors"),
+            "exec_time": self.exec_time,
+            "violation": None,
+            "nodes": self.node_statistics()
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve an SDVS exploration node")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address to listen on (default: loopback only, 0.0.0.0 for every interface)")
+    parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--sessions", type=int, default=None, help="Exit after this many explorations")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.sessions)
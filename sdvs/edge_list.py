@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Edge list: Labelled transition system of an exploration in a binary edge-list file
+
+import os
+import struct
+
+from sdvs.state_file import RECORD_WIDE_SOURCE, RECORD_WIDE_TARGET, pack_config, read_config, record_width
+from sdvs.write_behind import default_writer
+
+# Header: magic, format version, configuration size in bits
+HEADER = struct.Struct("<4sBxxxI")
+MAGIC = b"SDVE"
+EDGE_LIST_VERSION = 2
+# Label of an edge: core, guard pc (pc of the endga), cycles
+LABEL = struct.Struct("<HIQ")
+# Above this number of edges, text exports are refused
+MAX_TEXT_EDGES = 100000
+
+
+class EdgeWriter:
+    """
+    Write every transition of the exploration as a (flags, source, target,
+    label) record, configurations being little-endian integers of the
+    configuration width. As in state files, flags tell which configurations
+    do not fit in the width and are written with their length instead (see
+    sdvs.state_file.pack_config). Records are written by the write-behind thread.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.width = None
+        self.file = None
+        self.edges = 0
+
+    def start(self, cfg_size):
+        """
+        Open the file and write its header.
+        :param cfg_size: configuration size in bits
+        """
+        if self.file is None:
+            self.width = record_width(cfg_size)
+            self.file = default_writer().open(self.file_name)
+            self.file.write(HEADER.pack(MAGIC, EDGE_LIST_VERSION, cfg_size))
+
+    def write_edges(self, source, targets, labels):
+        """
+        :param source: configuration the successors were generated from
+        :param targets: successor configurations
+        :param labels: (core, guard pc, cycles) of each successor
+        """
+        width = self.width
+        source_bytes, wide_source = pack_config(source, width)
+        records = []
+        for target, label in zip(targets, labels):
+            target_bytes, wide_target = pack_config(target, width)
+            flags = (RECORD_WIDE_SOURCE if wide_source else 0) | (RECORD_WIDE_TARGET if wide_target else 0)
+            records.append(bytes([flags]) + source_bytes + target_bytes + LABEL.pack(*label))
+        self.file.write(b"".join(records))
+        self.edges += len(targets)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class EdgeReader:
+    """
+    Read a file written by EdgeWriter.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        with open(file_name, "rb") as file:
+            magic, version, self.cfg_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != EDGE_LIST_VERSION:
+            raise ValueError("{} is not a version {} edge list".format(file_name, EDGE_LIST_VERSION))
+        self.width = record_width(self.cfg_size)
+
+    def edges(self):
+        """
+        :return: iterator over the (source, target, core, guard pc, cycles) edges
+        """
+        width = self.width
+        with open(self.file_name, "rb") as file:
+            file.seek(HEADER.size)
+            for flags in iter(lambda: file.read(1), b""):
+                source = read_config(file, width, flags[0] & RECORD_WIDE_SOURCE)
+                target = read_config(file, width, flags[0] & RECORD_WIDE_TARGET)
+                yield (source, target) + LABEL.unpack(file.read(LABEL.size))
+
+    def check_size(self, max_edges):
+        if max_edges is None:
+            return
+        # Records have no fixed size: count them, at most up to the limit
+        record_size = 1 + 2 * self.width + LABEL.size
+        if (os.path.getsize(self.file_name) - HEADER.size) // record_size <= max_edges:
+            return
+        for edges, _ in enumerate(self.edges(), 1):
+            if edges > max_edges:
+                raise ValueError("{} has more than {} edges, the limit of text exports".format(self.file_name,
+                                                                                            max_edges))
+
+    def write_dot(self, output, max_edges=MAX_TEXT_EDGES):
+        """
+        Write the graph in the DOT format, configurations as hexadecimal nodes.
+        :param output: text stream
+        :param max_edges: maximum number of edges, None for no limit
+        """
+        self.check_size(max_edges)
+        output.write("digraph sdvs {\n")
+        for source, target, core, pc, cycles in self.edges():
+            output.write('    "{:#x}" -> "{:#x}" [label="c{} @{} {}cy"];\n'.format(source, target, core, pc, cycles))
+        output.write("}\n")
+
+    def write_text(self, output, max_edges=MAX_TEXT_EDGES):
+        """
+        Write one "source target core pc cycles" line per edge, configurations in hexadecimal.
+        :param output: text stream
+        :param max_edges: maximum number of edges, None for no limit
+        """
+        self.check_size(max_edges)
+        for source, target, core, pc, cycles in self.edges():
+            output.write("{:x} {:x} {} {} {}\n".format(source, target, core, pc, cycles))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="Convert an SDVS edge list to text")
+    parser.add_argument("edge_list", help="Edge list written by --edges-file")
+    parser.add_argument("--format", "-f", choices=["dot", "text"], default="dot", help="Output format")
+    parser.add_argument("--max-edges", type=int, default=MAX_TEXT_EDGES, help="Refuse larger graphs")
+    args = parser.parse_args()
+    reader = EdgeReader(args.edge_list)
+    if args.format == "dot":
+        reader.write_dot(sys.stdout, args.max_edges)
+    else:
+        reader.write_text(sys.stdout, args.max_edges)
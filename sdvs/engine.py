@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Engine: Fast execution of a decoded program with specialised handlers and superinstructions
+
+from collections import Counter
+
+from sdvs.constants import *
+from sdvs.core import Core
+from sdvs.guards import ChainCache, GuardCache, analyse_guards
+from sdvs.optimizer import is_nop_move, optimize_decoder
+
+# Longest sequence of instructions fused into one superinstruction
+MAX_FUSION_LENGTH = 4
+# Number of occurrences of a sequence in the program before it is fused
+MIN_FUSION_COUNT = 2
+# Fetch (2) and decode (2) of every instruction
+FETCH_DECODE_CYCLES = 4
+# Reset routine run before each configuration
+RESET_CYCLES = 2
+
+BINARY_EXPRESSIONS = {
+    OP_ADD: "{a} + {b}",
+    OP_SUB: "{a} - {b}",
+    OP_MUL: "{a} * {b}",
+    OP_DIV: "{a} // {b}",
+    OP_MOD: "{a} % {b}",
+    OP_AND: "1 if ({a} and {b}) else 0",
+    OP_OR: "1 if ({a} or {b}) else 0",
+    OP_LT: "1 if {a} < {b} else 0",
+    OP_GT: "1 if {a} > {b} else 0",
+    OP_EQ: "1 if {a} == {b} else 0"
+}
+
+# Instructions ending a superinstruction, they are never fused in the middle of one
+CONTROL_OP_CODES = {OP_JMP, OP_NOP, OP_ENDGA}
+
+
+def instruction_kind(instruction):
+    """
+    :param instruction: decoded instruction
+    :return: name of the instruction family used to find frequent sequences
+    """
+    if instruction.op_code == OP_LOAD:
+        return {LOAD_REG: "mov", LOAD_IMM: "movi", LOAD_ADR: "load", LOAD_RAA: "loadr"}[instruction.cfg_mask]
+    if instruction.op_code == OP_STORE:
+        return "store"
+    if instruction.op_code in BINARY_EXPRESSIONS:
+        return "cmp" if instruction.op_code in (OP_LT, OP_GT, OP_EQ) else "alu"
+    return {OP_NOT: "not", OP_JMP: "jmp", OP_NOP: "nop", OP_ENDGA: "endga"}[instruction.op_code]
+
+
+def instruction_source(instruction, pc):
+    """
+    Python statements executing an instruction, registers being in the local
+    registers and the core in the local core.
+    :param instruction: decoded instruction
+    :param pc: index of the instruction
+    :return: list of statements and expression of the next pc
+    """
+    op_code = instruction.op_code
+    rd, ra, rb = instruction.rd, instruction.ra, instruction.rb
+    if op_code in BINARY_EXPRESSIONS:
+        a = "registers[{}]".format(ra) if instruction.cfg_mask in (CFG_RR, CFG_RI) else str(instruction.imma)
+        b = "registers[{}]".format(rb) if instruction.cfg_mask in (CFG_RR, CFG_IR) else str(instruction.immb)
+        return ["registers[{}] = {}".format(rd, BINARY_EXPRESSIONS[op_code].format(a=a, b=b))], str(pc + 1)
+    if op_code == OP_NOT:
+        return ["registers[{}] = 0 if registers[{}] else 1".format(rd, ra)], str(pc + 1)
+    if op_code == OP_JMP:
+        return [], "{} if registers[{}] == 0 else {}".format(instruction.address, rd, pc + 1)
+    if op_code == OP_LOAD:
+        if is_nop_move(instruction):
+            return [], str(pc + 1)
+        mask = (1 << TYPES_TO_SIZE[instruction.type]) - 1
+        if instruction.cfg_mask == LOAD_REG:
+            statement = "registers[{}] = registers[{}]".format(rd, ra)
+        elif instruction.cfg_mask == LOAD_IMM:
+            statement = "registers[{}] = {}".format(rd, instruction.imma)
+        elif instruction.cfg_mask == LOAD_ADR:
+            statement = "registers[{}] = (core.memory.raw_memory >> {}) & {}".format(rd, instruction.address, mask)
+        else:
+            statement = "registers[{}] = (core.memory.raw_memory >> registers[{}]) & {}".format(rd, ra, mask)
+        return [statement], str(pc + 1)
+    if op_code == OP_STORE:
+        if instruction.cfg_mask == STORE_ADR:
+            address = str(instruction.address)
+        elif instruction.cfg_mask == STORE_RAA:
+            address = "registers[{}]".format(ra)
+        else:
+            return [], str(pc + 1)
+        return ["core.memory.set_bits(registers[{}], {}, {})".format(rd, address, instruction.type)], str(pc + 1)
+    if op_code == OP_ENDGA:
+        return ["core.new_configs.append(core.memory.raw_memory)",
+                "core.new_hashes.append(core.memory.hash)",
+                "core.reset_cfg_memory()"], str(pc + 1)
+    # OP_NOP
+    return [], "-1"
+
+
+class FastEngine:
+    """
+    Execute the program of a decoder with one handler per pc, compiled from the
+    instruction with its operands inlined. Handlers return the next pc, -1 once
+    the core is idle. Frequent sequences of adjacent instructions (such as a
+    load, a comparison and a jmp) are fused into superinstructions: the handler
+    at the first pc of the sequence executes all of it in one dispatch while
+    the other handlers stay available as jump targets. Cycles are accounted per
+    pc from Core.instruction_cycles, a superinstruction costing the sum of the
+    instructions it replaces.
+    With optimize, handlers are compiled from the program of sdvs.optimizer
+    while cycles are still charged from the original program. A threaded jump
+    targets a virtual pc, appended after the program, running the handler of
+    the end of the chain and costing the jumps it skips as well.
+    With guards, the handler at the start of each guard block of sdvs.guards
+    looks its result up in a cache keyed by the memory bits the guard reads.
+    When the program is a chain of guards, run first finds the effects of the
+    first enabled guard with one lookup on the bits read by all of them, the
+    disabled guards before it being charged without being executed.
+    With report, superinstructions count their executions for fusion_report.
+    """
+
+    def __init__(self, decoder, fusion=True, min_fusion_count=MIN_FUSION_COUNT, optimize=False, guards=False,
+                 report=False):
+        self.decoder = decoder
+        self.report = report
+        self.optimized = optimize_decoder(decoder) if optimize else None
+        program = decoder.program if self.optimized is None else self.optimized.program
+        self.program = program
+        # Cycles always come from the original program
+        self.costs = [FETCH_DECODE_CYCLES + Core.instruction_cycles(instruction) for instruction in decoder.program]
+        self.sources = [instruction_source(instruction, pc) for pc, instruction in enumerate(program)]
+        # Virtual pc of each threaded jump, executing the end of its chain
+        self.virtual_pcs = {}
+        if self.optimized is not None:
+            for pc, skipped in self.optimized.threads.items():
+                virtual_pc = len(program) + len(self.virtual_pcs)
+                self.virtual_pcs[pc] = virtual_pc
+                rd = program[pc].rd
+                self.sources[pc] = ([], "{} if registers[{}] == 0 else {}".format(virtual_pc, rd, pc + 1))
+        # pc -> (pattern, length) and number of executions of each superinstruction
+        self.fusions = {}
+        self.hits = [0] * len(program)
+        self.handlers = [self.compile_handler(pc, 1) for pc in range(len(program))]
+        instruction_costs = list(self.costs)
+        if fusion:
+            self.fuse(min_fusion_count)
+        # Start pc -> GuardCache of the block
+        self.guard_caches = {}
+        self.chain_cache = None
+        if guards:
+            self.split_guards(instruction_costs)
+        for pc, virtual_pc in sorted(self.virtual_pcs.items(), key=lambda item: item[1]):
+            target = program[pc].address
+            skipped_cycles = sum(instruction_costs[skipped] for skipped in self.optimized.threads[pc])
+            self.handlers.append(self.handlers[target])
+            self.costs.append(skipped_cycles + self.costs[target])
+
+    def compile_handler(self, pc, length):
+        """
+        :param pc: first instruction of the handler
+        :param length: number of instructions executed by the handler
+        :return: handler function(core, registers) returning the next pc
+        """
+        lines = []
+        for offset in range(length):
+            statements, next_pc = self.sources[pc + offset]
+            lines += statements
+        if length > 1 and self.report:
+            lines.append("hits[{}] += 1".format(pc))
+        lines.append("return " + next_pc)
+        source = "def handler(core, registers):\n" + "".join("    " + line + "\n" for line in lines)
+        namespace = {"hits": self.hits}
+        exec(compile(source, "<sdvs pc {}>".format(pc), "exec"), namespace)
+        return namespace["handler"]
+
+    def compile_guard_handler(self, cache):
+        """
+        :param cache: GuardCache of the block
+        :return: handler function(core, registers) setting the registers of the guard and returning the next pc
+        """
+        block = cache.block
+        targets = "".join(", registers[{}]".format(register) for register in block.registers)
+        source = ("def handler(core, registers):\n"
+                  "    key = core.memory.raw_memory & {}\n"
+                  "    result = results.get(key)\n"
+                  "    if result is None:\n"
+                  "        result = evaluate(key)\n"
+                  "    next_pc{} = result\n"
+                  "    return next_pc\n").format(block.mask, targets)
+        namespace = {"results": cache.results, "evaluate": cache.evaluate}
+        exec(compile(source, "<sdvs guard {}>".format(block.start), "exec"), namespace)
+        return namespace["handler"]
+
+    def split_guards(self, instruction_costs):
+        """
+        Replace the handlers starting guard blocks by cached guard handlers.
+        :param instruction_costs: cycles of each instruction of the original program
+        """
+        analysis = analyse_guards(self.decoder)
+        for start, block in analysis.blocks.items():
+            cache = GuardCache(block)
+            self.guard_caches[start] = cache
+            self.handlers[start] = self.compile_guard_handler(cache)
+            self.costs[start] = sum(instruction_costs[start:block.jump + 1])
+            self.fusions.pop(start, None)
+        if analysis.chain:
+            self.chain_cache = ChainCache(analysis.chain, analysis.end,
+                                          [self.costs[block.start] for block in analysis.chain])
+
+    def sequences(self):
+        """
+        :return: (pc, kinds) of every sequence of adjacent instructions that can be fused
+        """
+        program = self.program
+        kinds = [instruction_kind(instruction) for instruction in program]
+        for pc in range(len(program)):
+            for length in range(2, MAX_FUSION_LENGTH + 1):
+                last = pc + length - 1
+                if last >= len(program) or program[last - 1].op_code in CONTROL_OP_CODES:
+                    break
+                if program[last].op_code in (OP_NOP, OP_ENDGA):
+                    break
+                yield pc, tuple(kinds[pc:last + 1])
+                if program[last].op_code == OP_JMP:
+                    break
+
+    def fuse(self, min_count):
+        """
+        Replace the handlers starting the most frequent sequences by superinstructions.
+        :param min_count: number of occurrences of a sequence before it is fused
+        """
+        frequent = {pattern for pattern, count in Counter(pattern for _, pattern in self.sequences()).items()
+                    if count >= min_count}
+        best = {}
+        for pc, pattern in self.sequences():
+            if pattern in frequent and len(pattern) > len(best.get(pc, ())):
+                best[pc] = pattern
+        pc = 0
+        while pc < len(self.program):
+            pattern = best.get(pc)
+            if pattern is None:
+                pc += 1
+                continue
+            length = len(pattern)
+            self.handlers[pc] = self.compile_handler(pc, length)
+            self.costs[pc] = sum(self.costs[pc:pc + length])
+            self.fusions[pc] = ("+".join(pattern), length)
+            pc += length
+
+    def run(self, core):
+        """
+        Execute the program on the memory of a core until it is idle, with the
+        same effects and cycle count as Core.process_instructions.
+        :param core: core whose memory and registers are used
+        """
+        handlers = self.handlers
+        costs = self.costs
+        registers = core.registers
+        pc, cycles = self.start(core)
+        while pc >= 0:
+            cycles += costs[pc]
+            pc = handlers[pc](core, registers)
+        core.executed_cycles += cycles
+        core.idle = True
+
+    def successors(self, core):
+        """
+        Same as run but yield each (config, hash, None) successor as soon as its
+        endga is executed, see Core.successors.
+        :param core: core whose memory and registers are used
+        """
+        handlers = self.handlers
+        costs = self.costs
+        registers = core.registers
+        new_configs = core.new_configs
+        new_hashes = core.new_hashes
+        pc, cycles = self.start(core)
+        while pc >= 0:
+            cycles += costs[pc]
+            pc = handlers[pc](core, registers)
+            if new_configs:
+                # Superinstructions never contain an endga: one successor at most
+                core.executed_cycles += cycles
+                cycles = 0
+                yield new_configs.pop(), new_hashes.pop(), None
+        core.executed_cycles += cycles
+        core.idle = True
+
+    def start(self, core):
+        """
+        :param core: core about to run
+        :return: first pc to execute and cycles spent before it, the disabled
+        guards of a chain being resolved at once
+        """
+        chain = self.chain_cache
+        if chain is None:
+            return 0, RESET_CYCLES
+        key = core.memory.raw_memory & chain.mask
+        result = chain.results.get(key)
+        if result is None:
+            result = chain.evaluate(key)
+        pc, guard_cycles, values = result
+        registers = core.registers
+        for register, value in values:
+            registers[register] = value
+        return pc, RESET_CYCLES + guard_cycles
+
+    def fusion_report(self):
+        """
+        :return: one row per fused pattern with its sites, executions and saved dispatches
+        (executions are only counted by an engine created with report)
+        """
+        rows = {}
+        for pc, (pattern, length) in self.fusions.items():
+            row = rows.setdefault(pattern, {"pattern": pattern, "length": length, "sites": 0,
+                                            "executions": 0, "dispatches_saved": 0})
+            row["sites"] += 1
+            row["executions"] += self.hits[pc]
+            row["dispatches_saved"] += self.hits[pc] * (length - 1)
+        return sorted(rows.values(), key=lambda row: row["dispatches_saved"], reverse=True)
+
+
+    def guard_report(self):
+        """
+        :return: one row per guard block (and one for the chain) with its bits, cached results and evaluations
+        """
+        rows = [{"guard": start, "bits": bin(cache.block.mask).count("1"), "entries": len(cache.results),
+                 "evaluations": cache.evaluations} for start, cache in sorted(self.guard_caches.items())]
+        if self.chain_cache is not None:
+            rows.append({"guard": "chain", "bits": bin(self.chain_cache.mask).count("1"),
+                         "entries": len(self.chain_cache.results), "evaluations": self.chain_cache.evaluations})
+        return rows
+
+
+# Engine factories by name, None being the Core interpreter
+ENGINES = {
+    "interpreter": None,
+    "fast": FastEngine
+}
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Generator: Synthetic multi-core models with a known number of reachable configurations
+
+import random
+
+from sdvs.constants import *
+from sdvs.model import Model
+
+# Largest value of an immediate operand (11 bits)
+MAX_IMMEDIATE = 0x7FF
+
+
+class ModelGenerator:
+    """
+    Generate models made of nvars cyclic counters going from 0 to counter_range - 1
+    and back to 0. Counters are distributed round-robin over the cores and each
+    counter is driven by two guard blocks (increment and reset). Every guard also
+    reads each other counter with probability guard_density through an always true
+    comparison, which makes guards more expensive without changing the state space.
+    Counters being independent, counter_range ** nvars configurations are reachable.
+    """
+
+    def __init__(self, ncores, nvars, counter_range=4, guard_density=0.0, seed=0):
+        if ncores < 1 or nvars < 1:
+            raise ValueError("At least one core and one variable are needed")
+        if not 2 <= counter_range <= MAX_IMMEDIATE:
+            raise ValueError("Counter range should be between 2 and {}".format(MAX_IMMEDIATE))
+        if not 0.0 <= guard_density <= 1.0:
+            raise ValueError("Guard density should be between 0 and 1")
+        self.ncores = ncores
+        self.nvars = nvars
+        self.counter_range = counter_range
+        self.guard_density = guard_density
+        self.seed = seed
+        # Smallest type holding the counter values
+        if counter_range - 1 <= 0xFF:
+            self.type_name, self.type_size = "byte", SIZE_BYTE
+        else:
+            self.type_name, self.type_size = "state", SIZE_STATE
+
+    @property
+    def name(self):
+        return "gen.{}c{}v{}r{}d".format(self.ncores, self.nvars, self.counter_range,
+                                         int(self.guard_density * 100))
+
+    @property
+    def cfg_size(self):
+        return self.nvars * self.type_size
+
+    @property
+    def expected_states(self):
+        return self.counter_range ** self.nvars
+
+    def address(self, var):
+        return var * self.type_size
+
+    def generate(self):
+        """
+        Generate the model.
+        :return: Model with one assembler program per core
+        """
+        rand = random.Random(self.seed)
+        programs = []
+        for core_nb in range(self.ncores):
+            lines = []
+            for var in range(core_nb, self.nvars, self.ncores):
+                others = [other for other in range(self.nvars)
+                          if other != var and rand.random() < self.guard_density]
+                lines += self.counter_block(len(lines), var, "lt", self.counter_range - 1, "add r1 r1 1", others)
+                lines += self.counter_block(len(lines), var, "eq", self.counter_range - 1, "mov r1 0", others)
+            lines.append("nop")
+            programs.append("\n".join(lines) + "\n")
+        return Model(self.name, programs, self.cfg_size, 0, self.expected_states)
+
+    def counter_block(self, start, var, comparison, bound, effect, others):
+        """
+        Guard block comparing a counter to a bound then applying an effect.
+        :param start: address of the first instruction of the block
+        :param var: counter driven by the block
+        :param comparison: comparison operation of the guard
+        :param bound: right operand of the comparison
+        :param effect: instruction updating r1, holding the counter
+        :param others: other counters read by the guard
+        :return: list of assembler lines
+        """
+        load = "load" + self.type_name
+        store = "store" + self.type_name
+        guard = ["{} r1 {}".format(load, self.address(var)),
+                 "{} r2 r1 {}".format(comparison, bound)]
+        for other in others:
+            guard += ["{} r3 {}".format(load, self.address(other)),
+                      "lt r4 r3 {}".format(self.counter_range),
+                      "and r2 r2 r4"]
+        effects = [effect,
+                   "{} r1 {}".format(store, self.address(var)),
+                   "endga"]
+        next_block = start + len(guard) + 1 + len(effects)
+        return guard + ["jmp r2 {}".format(next_block)] + effects
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description="Synthetic SDVE model generator")
+    parser.add_argument("--ncores", "-n", type=int, default=2, help="Number of cores.")
+    parser.add_argument("--nvars", "-v", type=int, default=4, help="Number of counters.")
+    parser.add_argument("--range", "-r", type=int, default=4, help="Number of values of each counter.")
+    parser.add_argument("--density", "-d", type=float, default=0.0, help="Guard density.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--outputdir", "-o", default="bin", help="Output directory.")
+    args = parser.parse_args()
+    model = ModelGenerator(args.ncores, args.nvars, args.range, args.density, args.seed).generate()
+    os.makedirs(args.outputdir, exist_ok=True)
+    model.write_asm(args.outputdir)
+    model.write_binaries(args.outputdir)
+    model.write_cfg(os.path.join(args.outputdir, model.name + ".cfg"))
+    print("{}: {} configurations of {} bits".format(model.name, model.expected_states, model.cfg_size))
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Guards: Guard blocks of a decoded program and the cache of their results
+
+from sdvs.constants import *
+from sdvs.optimizer import FOLD_FUNCTIONS, is_pure, register_uses
+
+# Name of the result in Decoder.analyses
+ANALYSIS_NAME = "guards"
+# Entries of a guard cache, evaluations are no longer stored above it
+MAX_CACHE_ENTRIES = 1 << 16
+
+
+class GuardBlock:
+    """
+    Straight-line sequence of pure instructions from start to a forward jmp
+    that skips the effects of the block when its register is null. The guard
+    reads no register it did not write before, so the jump and the registers it
+    leaves are a function of the memory bits in mask alone.
+    """
+
+    def __init__(self, start, jump, program):
+        self.start = start
+        self.jump = jump
+        self.target = program[jump].address
+        self.instructions = program[start:jump + 1]
+        self.mask = 0
+        written = 0
+        for instruction in self.instructions:
+            if instruction.op_code == OP_LOAD and instruction.cfg_mask == LOAD_ADR:
+                self.mask |= ((1 << TYPES_TO_SIZE[instruction.type]) - 1) << instruction.address
+            written |= register_uses(instruction)[1]
+        self.registers = [register for register in range(REG_NUMBER) if written >> register & 1]
+
+    def evaluate(self, memory):
+        """
+        :param memory: raw memory, only the bits of mask are read
+        :return: next pc of the guard followed by the values of the registers it writes
+        """
+        registers = {}
+        for instruction in self.instructions:
+            op_code, cfg_mask = instruction.op_code, instruction.cfg_mask
+            if op_code in FOLD_FUNCTIONS:
+                a = registers[instruction.ra] if cfg_mask in (CFG_RR, CFG_RI) else instruction.imma
+                b = registers[instruction.rb] if cfg_mask in (CFG_RR, CFG_IR) else instruction.immb
+                registers[instruction.rd] = FOLD_FUNCTIONS[op_code](a, b)
+            elif op_code == OP_NOT:
+                registers[instruction.rd] = 0 if registers[instruction.ra] else 1
+            elif op_code == OP_LOAD:
+                if cfg_mask == LOAD_REG:
+                    registers[instruction.rd] = registers[instruction.ra]
+                elif cfg_mask == LOAD_IMM:
+                    registers[instruction.rd] = instruction.imma
+                else:
+                    size_mask = (1 << TYPES_TO_SIZE[instruction.type]) - 1
+                    registers[instruction.rd] = (memory >> instruction.address) & size_mask
+        next_pc = self.target if registers[self.instructions[-1].rd] == 0 else self.jump + 1
+        return (next_pc,) + tuple(registers[register] for register in self.registers)
+
+
+def guard_block(program, start):
+    """
+    :param program: list of instructions
+    :param start: pc of the first instruction of the block
+    :return: GuardBlock starting at start, None if the code there is not a guard
+    """
+    defined = 0
+    for pc in range(start, len(program)):
+        instruction = program[pc]
+        read, written = register_uses(instruction)
+        if read & ~defined:
+            # Reads a register set before the block
+            return None
+        if instruction.op_code == OP_JMP:
+            if instruction.address <= pc:
+                return None
+            return GuardBlock(start, pc, program)
+        if not is_pure(instruction):
+            return None
+        defined |= written
+    return None
+
+
+class GuardAnalysis:
+    """
+    Guard blocks of a program, found at pc 0, after every endga and at every
+    jump target. When the program is a chain of guards, each one skipping to
+    the next and the last one to the final nop, chain lists them in order.
+    """
+
+    def __init__(self, program):
+        starts = {0}
+        for pc, instruction in enumerate(program):
+            if instruction.op_code == OP_ENDGA:
+                starts.add(pc + 1)
+            elif instruction.op_code == OP_JMP:
+                starts.add(instruction.address)
+        self.blocks = {}
+        for start in sorted(starts):
+            if start < len(program):
+                block = guard_block(program, start)
+                if block is not None:
+                    self.blocks[start] = block
+        self.chain = []
+        pc = 0
+        while pc in self.blocks:
+            self.chain.append(self.blocks[pc])
+            pc = self.blocks[pc].target
+        if not (pc < len(program) and program[pc].op_code == OP_NOP):
+            self.chain = None
+        self.end = pc
+
+
+def analyse_guards(decoder):
+    """
+    Find the guard blocks of the program of a decoder, reusing the result stored in its analyses.
+    :param decoder: decoder of the program
+    :return: GuardAnalysis
+    """
+    analysis = decoder.analyses.get(ANALYSIS_NAME)
+    if analysis is None:
+        analysis = GuardAnalysis(decoder.program)
+        decoder.analyses[ANALYSIS_NAME] = analysis
+    return analysis
+
+
+class GuardCache:
+    """
+    Results of a guard block keyed by the projection of the memory on the bits
+    it reads, so that a guard seen with the same bits costs one lookup.
+    """
+
+    def __init__(self, block, max_entries=MAX_CACHE_ENTRIES):
+        self.block = block
+        self.max_entries = max_entries
+        self.results = {}
+        self.evaluations = 0
+
+    def evaluate(self, key):
+        """
+        :param key: memory projected on the mask of the block
+        :return: result of the block, stored in the cache
+        """
+        self.evaluations += 1
+        result = self.block.evaluate(key)
+        if len(self.results) < self.max_entries:
+            self.results[key] = result
+        return result
+
+
+class ChainCache:
+    """
+    Guards of a chain evaluated together from the projection of the memory on
+    the bits any of them reads. A result gives the pc of the effects of the
+    first enabled guard (the final nop if none is), the cycles of the guards
+    evaluated until then and the registers they leave.
+    """
+
+    def __init__(self, chain, end, costs, max_entries=MAX_CACHE_ENTRIES):
+        self.chain = chain
+        self.end = end
+        self.costs = costs
+        self.mask = 0
+        for block in chain:
+            self.mask |= block.mask
+        self.max_entries = max_entries
+        self.results = {}
+        self.evaluations = 0
+
+    def evaluate(self, key):
+        """
+        :param key: memory projected on the mask of the chain
+        :return: (pc, cycles, ((register, value), ...)), stored in the cache
+        """
+        self.evaluations += 1
+        registers = {}
+        cycles = 0
+        pc = self.end
+        for block, cost in zip(self.chain, self.costs):
+            result = block.evaluate(key)
+            cycles += cost
+            registers.update(zip(block.registers, result[1:]))
+            if result[0] != block.target:
+                pc = result[0]
+                break
+        result = (pc, cycles, tuple(sorted(registers.items())))
+        if len(self.results) < self.max_entries:
+            self.results[key] = result
+        return result
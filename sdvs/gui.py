@@ -285,7 +285,7 @@ class GUI:
         self.memory.set(hex(self.simulator.memory.raw_memory))
 
     def display_registers(self):
-        for reg in self.simulator.registers:
+        for reg in self.simulator.register_objects():
             self.registers[reg.number].set(hex(reg.value))
 
     def clear_colors(self):
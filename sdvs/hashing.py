@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Hashing: Zobrist hashing of configurations, updated incrementally on stores
+
+import random
+
+# Number of bits covered by one entry of the Zobrist table
+CHUNK_SIZE = 8
+CHUNK_VALUES = 1 << CHUNK_SIZE
+CHUNK_MASK = CHUNK_VALUES - 1
+
+# Width of the produced hashes
+HASH_SIZE = 64
+
+DEFAULT_SEED = 0x5D5E
+
+
+class ZobristHasher:
+    """
+    Zobrist hash over the bytes of a configuration. The hash of a configuration is
+    the XOR of one random key per (byte position, byte value) pair, with null bytes
+    mapped to 0 so that the hash does not depend on the configuration width.
+    Changing a field only requires to XOR out the keys of the old bytes and XOR in
+    the keys of the new ones.
+    """
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.table = []
+
+    def extend_table(self, nb_chunks):
+        """
+        Generate the keys for the byte positions up to nb_chunks.
+        :param nb_chunks: number of byte positions that should be covered
+        """
+        while len(self.table) < nb_chunks:
+            keys = [0]
+            for _ in range(CHUNK_VALUES - 1):
+                keys.append(self.random.getrandbits(HASH_SIZE))
+            self.table.append(keys)
+
+    def hash_config(self, raw_memory):
+        """
+        Compute the hash of a whole configuration.
+        :param raw_memory: configuration to hash
+        :return: 64-bits hash
+        """
+        return self.hash_chunks(raw_memory, 0, (raw_memory.bit_length() + CHUNK_SIZE - 1) // CHUNK_SIZE)
+
+    def hash_chunks(self, raw_memory, first_chunk, last_chunk):
+        """
+        Compute the contribution of the bytes first_chunk (included) to
+        last_chunk (excluded) of a configuration.
+        :param raw_memory: configuration to hash
+        :param first_chunk: first byte position
+        :param last_chunk: last byte position (excluded)
+        :return: partial 64-bits hash
+        """
+        if len(self.table) < last_chunk:
+            self.extend_table(last_chunk)
+        table = self.table
+        result = 0
+        chunks = raw_memory >> (first_chunk * CHUNK_SIZE)
+        for position in range(first_chunk, last_chunk):
+            result ^= table[position][chunks & CHUNK_MASK]
+            chunks >>= CHUNK_SIZE
+        return result
+
+    def update(self, config_hash, old_memory, new_memory, address, size):
+        """
+        Update the hash of a configuration after a store of size bits at address.
+        :param config_hash: hash of the configuration before the store
+        :param old_memory: configuration before the store
+        :param new_memory: configuration after the store
+        :param address: address of the stored value
+        :param size: size of the stored value
+        :return: hash of the configuration after the store
+        """
+        first_chunk = address // CHUNK_SIZE
+        last_chunk = (address + size + CHUNK_SIZE - 1) // CHUNK_SIZE
+        return (config_hash
+                ^ self.hash_chunks(old_memory, first_chunk, last_chunk)
+                ^ self.hash_chunks(new_memory, first_chunk, last_chunk))
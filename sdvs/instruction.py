@@ -6,13 +6,23 @@
 # ===========================================
 # Instruction: Holder of the instructions information
 
+from collections import namedtuple
+
 from sdvs.constants import *
 
-class Instruction:
+# Field order of the underlying tuple, the constructor takes inst_type third
+INSTRUCTION_FIELDS = ["op_code", "cfg_mask", "rd", "ra", "rb", "imma", "immb", "address", "type"]
+
+
+class Instruction(namedtuple("InstructionFields", INSTRUCTION_FIELDS)):
     """
     Instruction structure to hold the decoded parts of the 32-bits instruction.
+    Immutable and without instance dictionary, an instruction can be shared by
+    every fetch of the pre-decoded program.
     """
 
+    __slots__ = ()
+
     OP_CODES_STR = {
         OP_ADD: "OP_ADD",
         OP_SUB: "OP_SUB",
@@ -58,30 +68,15 @@ class Instruction:
         VAL_STATE: "STATE"
     }
 
-    def __init__(self, op_code, cfg_mask=0b00, inst_type=0b00,
-                 rd=0b0000, ra=0b0000, rb=0b0000,
-                 imma=0b00000000000, immb=0b00000000000,
-                 address=0b000000000000000000000000):
-        self.op_code = op_code
-        self.cfg_mask = cfg_mask
-        self.rd = rd
-        self.ra = ra
-        self.rb = rb
-        self.imma = imma
-        self.immb = immb
-        self.address = address
-        self.type = inst_type
-
-    def __eq__(self, other):
-        return (self.op_code == other.op_code and
-                self.cfg_mask == other.cfg_mask and
-                self.rd == other.rd and
-                self.ra == other.ra and
-                self.rb == other.rb and
-                self.imma == other.imma and
-                self.immb == other.immb and
-                self.address == other.address and
-                self.type == other.type)
+    def __new__(cls, op_code, cfg_mask=0b00, inst_type=0b00,
+                rd=0b0000, ra=0b0000, rb=0b0000,
+                imma=0b00000000000, immb=0b00000000000,
+                address=0b000000000000000000000000):
+        return super(Instruction, cls).__new__(cls, op_code, cfg_mask, rd, ra, rb, imma, immb, address, inst_type)
+
+    def __getnewargs__(self):
+        # Arguments of __new__ for pickle and copy, in its order
+        return (self.op_code, self.cfg_mask, self.type, self.rd, self.ra, self.rb, self.imma, self.immb, self.address)
 
     def __str__(self):
         return "Instruction {}".format(self.op_str())
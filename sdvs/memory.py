@@ -18,9 +18,14 @@ def gen_bin_number_ones(width):
 
 class Memory:
 
-    def __init__(self, size=0, raw_memory=0b0):
+    def __init__(self, size=0, raw_memory=0b0, hasher=None, config_hash=None):
         self.raw_memory = raw_memory
         self.size = size
+        # Incremental hash of the configuration, only maintained with a hasher
+        self.hasher = hasher
+        self.hash = None
+        if hasher is not None:
+            self.hash = hasher.hash_config(raw_memory) if config_hash is None else config_hash
 
     def set_bits(self, value, address, data_type):
         """
@@ -36,7 +41,15 @@ class Memory:
         mask = left | right                       # Bitwise or to mask get all bits set except in the range
         masked_memory = self.raw_memory & mask    # Clear bits from address and for the type size
         value_shifted = value << address          # Move the value in the cleared position
-        self.raw_memory = masked_memory | value_shifted
+        new_memory = masked_memory | value_shifted
+        if self.hasher is not None:
+            if value >> type_size == 0 and self.raw_memory >= 0 and self.raw_memory >> self.size == 0:
+                self.hash = self.hasher.update(self.hash, self.raw_memory, new_memory, address, type_size)
+            else:
+                # Value overflowing its field, or bits above the configuration cleared by the
+                # mask: only the whole configuration can be rehashed
+                self.hash = self.hasher.hash_config(new_memory)
+        self.raw_memory = new_memory
 
     def retrieve_bool_at_address(self, address):
         return (self.raw_memory & (gen_bin_number_ones(SIZE_BOOL) << address)) >> address
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Metrics: Periodic exploration statistics on stderr and in a JSON-lines file
+
+import json
+import os
+import sys
+import time
+
+from sdvs.write_behind import default_writer
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Number of processed configurations between two clock reads
+POLL_PERIOD = 256
+
+
+def current_rss():
+    """
+    Resident set size of the current process.
+    :return: RSS in bytes, the peak RSS if the current one cannot be read, None if unknown
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss():
+    """
+    Peak resident set size of the current process.
+    :return: peak RSS in bytes, None if unknown
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MetricsReporter:
+    """
+    Emit exploration statistics every interval seconds, as text on a stream and
+    as JSON records, one per line, in an optional output file written by the
+    write-behind thread.
+    """
+
+    def __init__(self, interval=5.0, stream=sys.stderr, output_file=None):
+        self.interval = interval
+        self.stream = stream
+        self.output_file = output_file
+        self.output = None
+        self.start_time = None
+        self.next_report = None
+        self.last_time = None
+        self.last_states = 0
+
+    def start(self):
+        """
+        Reset the clocks and open the output file.
+        """
+        self.start_time = time.monotonic()
+        self.last_time = self.start_time
+        self.next_report = self.start_time + self.interval
+        self.last_states = 0
+        if self.output_file is not None and self.output is None:
+            self.output = default_writer().open(self.output_file)
+
+    def poll(self, states, frontier, visited, successors, cycles):
+        """
+        Report if the interval elapsed since the last report. Meant to be called
+        every POLL_PERIOD processed configurations.
+        :param states: number of processed configurations
+        :param frontier: size of the frontier
+        :param visited: number of encountered configurations
+        :param successors: number of generated successors (duplicates included)
+        :param cycles: simulated cycles so far
+        """
+        if time.monotonic() >= self.next_report:
+            self.report(states, frontier, visited, successors, cycles)
+
+    def report(self, states, frontier, visited, successors, cycles, final=False):
+        """
+        Emit one record. See poll for the parameters.
+        :param final: whether this is the last report of the exploration
+        """
+        now = time.monotonic()
+        elapsed = now - self.start_time
+        window = now - self.last_time
+        record = {
+            "elapsed": round(elapsed, 3),
+            "states": states,
+            "states_per_sec": round((states - self.last_states) / window, 1) if window > 0 else None,
+            "frontier": frontier,
+            "visited": visited,
+            "rss": current_rss(),
+            "successors_per_state": round(successors / states, 3) if states else None,
+            "cycles_per_state": round(cycles / states, 1) if states else None,
+            "final": final
+        }
+        self.last_time = now
+        self.last_states = states
+        self.next_report = now + self.interval
+        if self.stream is not None:
+            self.stream.write(self.format_record(record) + "\n")
+            self.stream.flush()
+        if self.output is not None:
+            self.output.write(json.dumps(record) + "\n")
+            self.output.flush()
+        return record
+
+    @staticmethod
+    def format_record(record):
+        fields = dict(record)
+        fields["rss"] = "?" if record["rss"] is None else record["rss"] // (1024 * 1024)
+        return ("[{elapsed:9.1f}s] {states} states ({states_per_sec}/s), frontier {frontier}, visited {visited}, "
+                "{successors_per_state} succ/state, {cycles_per_state} cycles/state, rss {rss}MB").format(**fields)
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
+            self.output = None
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Model: Multi-core SDVE program written in the textual assembler
+
+import os
+
+from sdvs.asm import ASM
+from sdvs.binary_reader import BinaryReader
+
+
+class Model:
+    """
+    SDVE model given as one textual assembler program per core, along with the
+    size and value of its initial configuration and, when known, the number of
+    reachable configurations.
+    """
+
+    def __init__(self, name, programs, cfg_size, init_cfg=0, expected_states=None):
+        self.name = name
+        self.programs = programs
+        self.cfg_size = cfg_size
+        self.init_cfg = init_cfg
+        self.expected_states = expected_states
+
+    def assemble(self):
+        """
+        Assemble the program of each core.
+        :return: list of 32-bits instructions lists, one per core
+        """
+        asm = ASM()
+        bin_programs = []
+        for program in self.programs:
+            lines = [line.strip() for line in program.splitlines()]
+            bin_programs.append([asm.process_line(line) for line in lines if line])
+        return bin_programs
+
+    def write_asm(self, directory):
+        """
+        Write the textual program of each core.
+        :param directory: output directory
+        :return: paths of the programs
+        """
+        asm_paths = []
+        for i, program in enumerate(self.programs):
+            asm_path = os.path.join(directory, "{}.asm.{}".format(self.name, i))
+            with open(asm_path, "w") as file:
+                file.write(program)
+            asm_paths.append(asm_path)
+        return asm_paths
+
+    def write_binaries(self, directory):
+        """
+        Assemble the model and write one binary per core, named as the sdvc output.
+        :param directory: output directory
+        :return: paths of the binaries
+        """
+        bin_paths = []
+        for i, instructions in enumerate(self.assemble()):
+            bin_path = os.path.join(directory, "{}.out.{}".format(self.name, i))
+            BinaryReader.write_instructions(bin_path, instructions)
+            bin_paths.append(bin_path)
+        return bin_paths
+
+    def write_cfg(self, file_name):
+        """
+        Write the initial configuration as an hexadecimal string, as expected by the CLI.
+        :param file_name: output file
+        """
+        with open(file_name, "w") as file:
+            file.write("{0:0{1}x}\n".format(self.init_cfg, (self.cfg_size + 3) // 4))
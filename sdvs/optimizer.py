@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Optimizer: Peephole optimisation of a decoded program for the execution engines
+
+from sdvs.constants import *
+from sdvs.instruction import Instruction
+
+# Registers live at the end of the program: they persist until the next configuration
+ALL_REGISTERS = (1 << REG_NUMBER) - 1
+
+# Name of the result in Decoder.analyses
+ANALYSIS_NAME = "peephole"
+
+FOLD_FUNCTIONS = {
+    OP_ADD: lambda a, b: a + b,
+    OP_SUB: lambda a, b: a - b,
+    OP_MUL: lambda a, b: a * b,
+    OP_DIV: lambda a, b: a // b,
+    OP_MOD: lambda a, b: a % b,
+    OP_AND: lambda a, b: 1 if (a and b) else 0,
+    OP_OR: lambda a, b: 1 if (a or b) else 0,
+    OP_LT: lambda a, b: 1 if a < b else 0,
+    OP_GT: lambda a, b: 1 if a > b else 0,
+    OP_EQ: lambda a, b: 1 if a == b else 0
+}
+
+
+def register_uses(instruction):
+    """
+    :param instruction: decoded instruction
+    :return: masks of the registers read and written by the instruction
+    """
+    op_code, cfg_mask = instruction.op_code, instruction.cfg_mask
+    if op_code in FOLD_FUNCTIONS:
+        read = 0
+        if cfg_mask in (CFG_RR, CFG_RI):
+            read |= 1 << instruction.ra
+        if cfg_mask in (CFG_RR, CFG_IR):
+            read |= 1 << instruction.rb
+        return read, 1 << instruction.rd
+    if op_code == OP_NOT:
+        return 1 << instruction.ra, 1 << instruction.rd
+    if op_code == OP_JMP:
+        return 1 << instruction.rd, 0
+    if op_code == OP_LOAD:
+        read = 1 << instruction.ra if cfg_mask in (LOAD_REG, LOAD_RAA) else 0
+        return read, 1 << instruction.rd
+    if op_code == OP_STORE:
+        if cfg_mask == STORE_ADR:
+            return 1 << instruction.rd, 0
+        if cfg_mask == STORE_RAA:
+            return (1 << instruction.rd) | (1 << instruction.ra), 0
+    return 0, 0
+
+
+def is_pure(instruction):
+    """
+    :param instruction: decoded instruction
+    :return: whether the instruction only writes its destination register and cannot raise
+    """
+    op_code, cfg_mask = instruction.op_code, instruction.cfg_mask
+    if op_code in (OP_DIV, OP_MOD):
+        # A null divisor raises
+        return cfg_mask in (CFG_RI, CFG_II) and instruction.immb != 0
+    if op_code in FOLD_FUNCTIONS or op_code == OP_NOT:
+        return True
+    # A negative address register raises
+    return op_code == OP_LOAD and cfg_mask != LOAD_RAA
+
+
+def is_nop_move(instruction):
+    """
+    :return: whether the instruction is the no-op written in place of a removed one
+    """
+    return instruction.op_code == OP_LOAD and instruction.cfg_mask == LOAD_REG and instruction.rd == instruction.ra
+
+
+class OptimizedProgram:
+    """
+    Result of the optimisation: a program with the same pcs as the original one,
+    where folded operations became immediate moves, dead writes became no-op
+    moves (mov rd rd) and threaded jumps target the end of their chain.
+    threads maps the pc of each threaded jump to the pcs of the jumps it skips,
+    whose cycles are still due when the jump is taken.
+    """
+
+    def __init__(self, program, folded, removed, threads):
+        self.program = program
+        self.folded = folded
+        self.removed = removed
+        self.threads = threads
+
+    def report(self):
+        return {"folded": len(self.folded), "removed": len(self.removed), "threaded": len(self.threads)}
+
+
+class Optimizer:
+    """
+    Peephole optimiser of a decoded program: constant folding of CFG_II
+    operations, elimination of register writes dead on every path and threading
+    of jumps to jumps testing the same register. Instructions keep their pc so
+    that the cycles of the original program can still be charged per pc.
+    """
+
+    def __init__(self, program):
+        self.program = program
+
+    def optimize(self):
+        """
+        :return: OptimizedProgram
+        """
+        program = list(self.program)
+        folded = self.fold_constants(program)
+        removed = self.remove_dead_writes(program)
+        threads = self.thread_jumps(program)
+        return OptimizedProgram(program, folded, removed, threads)
+
+    @staticmethod
+    def fold_constants(program):
+        """
+        Replace the CFG_II operations by the move of their result, in place.
+        :param program: list of instructions
+        :return: folded pcs
+        """
+        folded = []
+        for pc, instruction in enumerate(program):
+            if instruction.op_code in FOLD_FUNCTIONS and instruction.cfg_mask == CFG_II:
+                if instruction.op_code in (OP_DIV, OP_MOD) and instruction.immb == 0:
+                    continue
+                value = FOLD_FUNCTIONS[instruction.op_code](instruction.imma, instruction.immb)
+                program[pc] = Instruction(OP_LOAD, LOAD_IMM, rd=instruction.rd, imma=value)
+                folded.append(pc)
+        return folded
+
+    @staticmethod
+    def successors(program, pc):
+        instruction = program[pc]
+        if instruction.op_code == OP_NOP:
+            return []
+        if instruction.op_code == OP_JMP:
+            return [instruction.address, pc + 1]
+        return [pc + 1]
+
+    def live_out(self, program):
+        """
+        Backward liveness of the registers, every register being live after a nop
+        (registers persist across configurations) or out of the program.
+        :param program: list of instructions
+        :return: mask of the registers live after each pc
+        """
+        uses = [register_uses(instruction) for instruction in program]
+        live_in = [0] * len(program)
+        live_out = [0] * len(program)
+        changed = True
+        while changed:
+            changed = False
+            for pc in reversed(range(len(program))):
+                if program[pc].op_code == OP_NOP:
+                    out = ALL_REGISTERS
+                else:
+                    out = 0
+                    for successor in self.successors(program, pc):
+                        out |= live_in[successor] if 0 <= successor < len(program) else ALL_REGISTERS
+                read, written = uses[pc]
+                new_in = read | (out & ~written)
+                if out != live_out[pc] or new_in != live_in[pc]:
+                    live_out[pc] = out
+                    live_in[pc] = new_in
+                    changed = True
+        return live_out
+
+    def remove_dead_writes(self, program):
+        """
+        Replace the pure instructions whose destination is dead by no-op moves, in place.
+        :param program: list of instructions
+        :return: removed pcs
+        """
+        removed = []
+        live_out = self.live_out(program)
+        for pc, instruction in enumerate(program):
+            if is_pure(instruction) and not is_nop_move(instruction) and not live_out[pc] >> instruction.rd & 1:
+                program[pc] = Instruction(OP_LOAD, LOAD_REG, rd=instruction.rd, ra=instruction.rd)
+                removed.append(pc)
+        return removed
+
+    @staticmethod
+    def thread_jumps(program):
+        """
+        Redirect the jumps to jumps testing the same register (taken as well) to
+        the end of the chain, in place.
+        :param program: list of instructions
+        :return: dictionary of the threaded pcs to the pcs of the skipped jumps
+        """
+        threads = {}
+        # Chains are followed in the program before threading
+        original = list(program)
+        for pc, instruction in enumerate(original):
+            if instruction.op_code != OP_JMP:
+                continue
+            skipped = []
+            target = instruction.address
+            while (0 <= target < len(original) and original[target].op_code == OP_JMP
+                   and original[target].rd == instruction.rd and target not in skipped and target != pc):
+                skipped.append(target)
+                target = original[target].address
+            if skipped:
+                program[pc] = instruction._replace(address=target)
+                threads[pc] = skipped
+        return threads
+
+
+def optimize_decoder(decoder):
+    """
+    Optimise the program of a decoder, reusing the result stored in its analyses.
+    :param decoder: decoder of the program
+    :return: OptimizedProgram
+    """
+    optimized = decoder.analyses.get(ANALYSIS_NAME)
+    if optimized is None:
+        optimized = Optimizer(decoder.program).optimize()
+        decoder.analyses[ANALYSIS_NAME] = optimized
+    return optimized
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Parallel: Exploration with the expansions spread over worker processes
+
+import multiprocessing
+import os
+from collections import deque
+from multiprocessing.connection import wait
+
+from sdvs.binary_reader import BinaryReader
+from sdvs.checker import Checker
+from sdvs.coordinator import Coordinator
+from sdvs.decoder import Decoder
+from sdvs.hashing import ZobristHasher
+from sdvs.transport import BatchBuffer
+
+# Configurations sent to a worker at once
+BATCH_SIZE = 64
+# Input slots per worker (one being expanded while the next one is filled) and output slots
+INPUT_SLOTS = 2
+OUTPUT_SLOTS = 4
+# Successors per output slot
+OUTPUT_CAPACITY = 1024
+
+# Messages, the first item of the tuples sent through the pipes
+MSG_BATCH = "batch"
+MSG_SUCCESSORS = "successors"
+MSG_DONE = "done"
+MSG_FREE = "free"
+MSG_STOP = "stop"
+
+
+class Worker:
+    """
+    Expansion loop of a worker process. Batches of configurations are read
+    from the input buffer, and their successors written to the output buffer
+    one slot at a time, waiting for the owner to free a slot when all of them
+    are in use. Only slot numbers and counts go through the pipe.
+    """
+
+    def __init__(self, connection, bin_paths, cfg_size, engine, inputs, outputs):
+        self.connection = connection
+        decoders = [Decoder(BinaryReader.read_instructions(path)) for path in bin_paths]
+        self.coordinator = Coordinator(decoders, cfg_size, ZobristHasher(), engine)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.free_outputs = list(range(outputs.slots))
+        self.pending = deque()
+
+    def receive(self):
+        if self.pending:
+            return self.pending.popleft()
+        return self.connection.recv()
+
+    def output_slot(self):
+        # Batches received meanwhile are processed afterwards
+        while not self.free_outputs:
+            message = self.connection.recv()
+            if message[0] == MSG_FREE:
+                self.free_outputs.append(message[1])
+            else:
+                self.pending.append(message)
+        return self.free_outputs.pop()
+
+    def flush(self, successors):
+        slot = self.output_slot()
+        count, extra = self.outputs.write(slot, successors)
+        self.connection.send((MSG_SUCCESSORS, slot, count, extra))
+
+    def run(self):
+        while True:
+            message = self.receive()
+            if message[0] == MSG_STOP:
+                break
+            if message[0] == MSG_FREE:
+                self.free_outputs.append(message[1])
+                continue
+            _, slot, count, extra = message
+            configs = self.inputs.read(slot, count) + extra
+            cycles = 0
+            successors = []
+            for config, config_hash in configs:
+                exec_time, new_configs, new_hashes = self.coordinator.process_config(config, config_hash)
+                cycles += exec_time
+                successors += zip(new_configs, new_hashes)
+                while len(successors) >= self.outputs.capacity:
+                    self.flush(successors[:self.outputs.capacity])
+                    del successors[:self.outputs.capacity]
+            if successors:
+                self.flush(successors)
+            # Successors are sent before the batch is acknowledged
+            self.connection.send((MSG_DONE, slot, len(configs), cycles))
+        self.inputs.close()
+        self.outputs.close()
+
+
+def run_worker(connection, bin_paths, cfg_size, engine, inputs, outputs):
+    Worker(connection, bin_paths, cfg_size, engine, inputs, outputs).run()
+
+
+class ParallelSimulator:
+    """
+    Exploration where the expansions run in worker processes while this
+    process owns the checker. Configurations travel as fixed-width records in
+    shared memory buffers (sdvs.transport), in batches: each worker has input
+    slots filled with configurations of the frontier and output slots filled
+    with their successors. The exploration order differs from Simulator but
+    the encountered configurations, successors and cycles are the same.
+    """
+
+    def __init__(self, bin_paths, cfg_size, workers=None, engine=None, metrics=None, batch_size=BATCH_SIZE):
+        self.bin_paths = bin_paths
+        self.cfg_size = cfg_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.engine = engine
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.hasher = ZobristHasher()
+        self.checker = Checker(self.hasher)
+        self.exec_time = 0
+        self.successors = 0
+        self.processed = 0
+        self.stop_reason = None
+
+    def launch_checking(self, init_cfg):
+        """
+        Explore the configurations reachable from the initial one.
+        :param init_cfg: initial configuration
+        :return: execution time in cycles and encountered configurations
+        """
+        init_hash = self.hasher.hash_config(init_cfg)
+        self.checker.known.add(init_cfg, init_hash)
+        self.checker.frontier.append((init_cfg, init_hash))
+        if self.metrics is not None:
+            self.metrics.start()
+        connections = []
+        processes = []
+        buffers = []
+        try:
+            for _ in range(self.workers):
+                inputs = BatchBuffer(self.cfg_size, INPUT_SLOTS, self.batch_size)
+                buffers.append(inputs)
+                outputs = BatchBuffer(self.cfg_size, OUTPUT_SLOTS, OUTPUT_CAPACITY)
+                buffers.append(outputs)
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=run_worker, daemon=True,
+                                                  args=(worker_connection, self.bin_paths, self.cfg_size,
+                                                        self.engine, inputs, outputs))
+                process.start()
+                worker_connection.close()
+                connections.append(connection)
+                processes.append(process)
+            self.explore(connections, buffers)
+            for connection in connections:
+                connection.send((MSG_STOP,))
+            for process in processes:
+                process.join()
+        finally:
+            # Workers still running after an error may be waiting for an output slot
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            for buffer in buffers:
+                buffer.unlink()
+        if self.metrics is not None:
+            self.metrics.report(self.processed, len(self.checker.frontier), len(self.checker.known),
+                                self.successors, self.exec_time, final=True)
+            self.metrics.close()
+        return self.exec_time, self.checker.known
+
+    def explore(self, connections, buffers):
+        frontier = self.checker.frontier
+        free_inputs = [list(range(INPUT_SLOTS)) for _ in connections]
+        in_flight = 0
+        while frontier or in_flight:
+            # Hand the frontier to the workers with a free input slot
+            for index, connection in enumerate(connections):
+                while frontier and free_inputs[index]:
+                    slot = free_inputs[index].pop()
+                    batch = frontier[-self.batch_size:]
+                    del frontier[-self.batch_size:]
+                    count, extra = buffers[2 * index].write(slot, batch)
+                    connection.send((MSG_BATCH, slot, count, extra))
+                    in_flight += 1
+            for connection in wait(connections):
+                index = connections.index(connection)
+                message = connection.recv()
+                if message[0] == MSG_SUCCESSORS:
+                    _, slot, count, extra = message
+                    successors = buffers[2 * index + 1].read(slot, count) + extra
+                    connection.send((MSG_FREE, slot))
+                    self.successors += len(successors)
+                    check_config = self.checker.check_config
+                    for new_config, new_hash in successors:
+                        check_config(new_config, new_hash)
+                else:
+                    _, slot, processed, cycles = message
+                    free_inputs[index].append(slot)
+                    in_flight -= 1
+                    self.processed += processed
+                    self.exec_time += cycles
+                    if self.metrics is not None:
+                        self.metrics.poll(self.processed, len(frontier), len(self.checker.known),
+                                          self.successors, self.exec_time)
+
+    def statistics(self):
+        """
+        :return: statistics of the exploration, see Simulator.statistics
+        """
+        return {
+            "stop_reason": self.stop_reason,
+            "states": len(self.checker.known),
+            "processed": self.processed,
+            "frontier": len(self.checker.frontier),
+            "successors": self.successors,
+            "exec_time": self.exec_time,
+            "violation": self.checker.violation
+        }
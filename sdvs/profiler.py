@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Profiler: Execution counts, simulated cycles and host time per opcode, configuration and PC
+
+import csv
+import json
+
+from sdvs.instruction import Instruction
+
+# Indices in the statistics lists
+STAT_COUNT = 0
+STAT_CYCLES = 1
+STAT_TIME = 2
+
+
+class Profiler:
+    """
+    Aggregate the executed instructions of all the cores over all the configurations.
+    Statistics are kept per opcode, per (opcode, configuration mask) and per (core, PC).
+    """
+
+    def __init__(self, output_file=None):
+        self.output_file = output_file
+        self.opcodes = {}
+        self.cfg_masks = {}
+        self.pcs = {}
+
+    def record(self, core_nb, pc, instruction, cycles, elapsed):
+        """
+        Account for one executed instruction.
+        :param core_nb: number of the core that executed the instruction
+        :param pc: address of the instruction
+        :param instruction: executed instruction
+        :param cycles: simulated cycles spent on the instruction (fetch and decode included)
+        :param elapsed: host time spent on the instruction in seconds
+        """
+        for stats, key in ((self.opcodes, instruction.op_code),
+                           (self.cfg_masks, (instruction.op_code, instruction.cfg_mask)),
+                           (self.pcs, (core_nb, pc, instruction.op_code))):
+            entry = stats.get(key)
+            if entry is None:
+                entry = stats[key] = [0, 0, 0.0]
+            entry[STAT_COUNT] += 1
+            entry[STAT_CYCLES] += cycles
+            entry[STAT_TIME] += elapsed
+
+    def rows(self):
+        """
+        Flatten the statistics, most expensive in simulated cycles first within each scope.
+        :return: list of dictionaries with scope, core, pc, op, cfg, count, cycles and time fields
+        """
+        rows = []
+        for op_code, entry in self.opcodes.items():
+            rows.append(self.make_row("opcode", None, None, op_code, None, entry))
+        for (op_code, cfg_mask), entry in self.cfg_masks.items():
+            rows.append(self.make_row("cfg_mask", None, None, op_code, cfg_mask, entry))
+        for (core_nb, pc, op_code), entry in self.pcs.items():
+            rows.append(self.make_row("pc", core_nb, pc, op_code, None, entry))
+        scopes = {"opcode": 0, "cfg_mask": 1, "pc": 2}
+        rows.sort(key=lambda row: (scopes[row["scope"]], -row["cycles"]))
+        return rows
+
+    @staticmethod
+    def make_row(scope, core_nb, pc, op_code, cfg_mask, entry):
+        return {
+            "scope": scope,
+            "core": core_nb,
+            "pc": pc,
+            "op": Instruction.OP_CODES_STR[op_code],
+            "cfg": None if cfg_mask is None else Instruction(op_code, cfg_mask).cfg_str(),
+            "count": entry[STAT_COUNT],
+            "cycles": entry[STAT_CYCLES],
+            "time": entry[STAT_TIME]
+        }
+
+    def dump(self, file_name=None):
+        """
+        Write the statistics as CSV if the file name ends with .csv, as JSON otherwise.
+        :param file_name: output file, defaults to the one given at creation
+        """
+        file_name = self.output_file if file_name is None else file_name
+        if file_name is None:
+            return
+        rows = self.rows()
+        with open(file_name, "w") as file:
+            if file_name.endswith(".csv"):
+                writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()) if rows else [])
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, file, indent=2)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Program cache: Pre-decoded programs stored on disk and keyed by the content of the binaries
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from sdvs.binary_reader import BinaryReader
+from sdvs.decoder import Decoder
+
+# Bumped whenever the pickled decoder content changes
+CACHE_FORMAT_VERSION = 2
+CACHE_DIR_NAME = ".sdvs_cache"
+ENTRY_KEYS = {"version", "digest", "bit_instructions", "program", "analyses"}
+
+
+class ProgramCache:
+    """
+    Store the pre-decoded program of each binary, with its static analyses, in a
+    cache directory next to the binary (or in a given directory). Entries are
+    named after the SHA-256 of the binary and checked against it and against the
+    format version when loaded.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def cache_path(self, bin_path, digest):
+        """
+        :param bin_path: path of the binary
+        :param digest: hexadecimal SHA-256 of the binary
+        :return: path of the cache entry
+        """
+        directory = self.directory
+        if directory is None:
+            directory = os.path.join(os.path.dirname(os.path.abspath(bin_path)), CACHE_DIR_NAME)
+        return os.path.join(directory, digest + ".pickle")
+
+    def load_decoder(self, bin_path):
+        """
+        Build the decoder of a binary, from the cache when possible.
+        :param bin_path: path of the binary
+        :return: decoder with its pre-decoded program
+        """
+        with open(bin_path, "rb") as file:
+            content = file.read()
+        digest = hashlib.sha256(content).hexdigest()
+        cache_path = self.cache_path(bin_path, digest)
+        entry = self.read_entry(cache_path)
+        if entry is not None and entry["version"] == CACHE_FORMAT_VERSION and entry["digest"] == digest:
+            self.hits += 1
+            decoder = Decoder(entry["bit_instructions"], entry["program"])
+            decoder.analyses = entry["analyses"]
+            return decoder
+        self.misses += 1
+        decoder = Decoder(BinaryReader.instructions_from_bytes(content))
+        self.store(cache_path, digest, decoder)
+        return decoder
+
+    @staticmethod
+    def read_entry(cache_path):
+        try:
+            with open(cache_path, "rb") as file:
+                entry = pickle.load(file)
+        except Exception:
+            # Missing, truncated or corrupt: the cache is only an optimisation, the binary is decoded again
+            return None
+        return entry if isinstance(entry, dict) and ENTRY_KEYS <= entry.keys() else None
+
+    def store(self, cache_path, digest, decoder):
+        """
+        Write a cache entry atomically, a read-only location only disables the cache.
+        :param cache_path: path of the entry
+        :param digest: hexadecimal SHA-256 of the binary
+        :param decoder: decoder to store
+        """
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "digest": digest,
+            "bit_instructions": decoder.bit_instructions,
+            "program": decoder.program,
+            "analyses": decoder.analyses
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def update(self, bin_path, decoder):
+        """
+        Store again the entry of a binary, after new analyses were attached to its decoder.
+        :param bin_path: path of the binary
+        :param decoder: decoder of the binary
+        """
+        with open(bin_path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        self.store(self.cache_path(bin_path, digest), digest, decoder)
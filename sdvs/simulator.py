@@ -6,58 +6,227 @@
 # ===========================================
 # Simulator: Links all elements apart from CLI and GUI.
 
+import pickle
+
 from sdvs.binary_reader import BinaryReader
-from sdvs.checker import Checker
+from sdvs.budget import STOP_STATES
+from sdvs.checker import STOP_VIOLATION, Checker
+from sdvs.compact import CompactChecker, CompactLayout
 from sdvs.coordinator import Coordinator
 from sdvs.core import Core
 from sdvs.decoder import Decoder
+from sdvs.hashing import ZobristHasher
 from sdvs.memory import Memory
+from sdvs.metrics import POLL_PERIOD
+from sdvs.write_behind import default_writer
+
+# Bumped whenever the content of the checkpoints changes
+CHECKPOINT_VERSION = 1
 
 
 class Simulator:
 
-    def __init__(self, bin_paths, cfg_size):
+    def __init__(self, bin_paths, cfg_size, profiler=None, metrics=None, program_cache=None, state_writer=None,
+                 edge_writer=None, engine=None, prop=None, compact=False):
         self.cfg_size = cfg_size
+        self.compact = compact
         decoders = []
         for binary in bin_paths:
-            bin_instr = BinaryReader.read_instructions(binary)
-            decoder = Decoder(bin_instr)
+            if program_cache is not None:
+                decoder = program_cache.load_decoder(binary)
+            else:
+                bin_instr = BinaryReader.read_instructions(binary)
+                decoder = Decoder(bin_instr)
             decoders.append(decoder)
-        self.coordinator = Coordinator(decoders, cfg_size)
-        self.checker = Checker()
+        # Hashes are maintained incrementally by the cores and reused by the checker
+        self.hasher = ZobristHasher()
+        analyses = [len(decoder.analyses) for decoder in decoders]
+        self.coordinator = Coordinator(decoders, cfg_size, self.hasher, engine)
+        if program_cache is not None:
+            # Analyses computed by the engines are stored with the program
+            for binary, decoder, count in zip(bin_paths, decoders, analyses):
+                if len(decoder.analyses) > count:
+                    program_cache.update(binary, decoder)
+        self.decoders = decoders
+        self.checker = Checker(self.hasher, prop)
         self.exec_time = 0
+        self.successors = 0
+        self.processed = 0
+        self.stop_reason = None
+        self.profiler = profiler
+        self.metrics = metrics
+        self.state_writer = state_writer
+        self.edge_writer = edge_writer
+        if edge_writer is not None:
+            self.coordinator.record_labels()
+        for core in self.coordinator.cores:
+            core.profiler = profiler
 
-    def process_config(self, config):
+    def process_config(self, config, config_hash=None):
+        """
+        Check the successors of a configuration as the cores produce them, the
+        expansion stopping at the first one violating the property.
+        """
         # Process actual config
-        max_time, new_configs = self.coordinator.process_config(config)
-        self.exec_time += max_time
+        successors = self.coordinator.successors(config, config_hash)
         # Check returned configs
-        # print("Obtained configs: [")
-        for new_config in new_configs:
-            # print(hex(config))
-            self.checker.check_config(new_config)
-        # print("]")
+        for new_config, new_hash, label in successors:
+            self.successors += 1
+            if self.edge_writer is not None:
+                self.edge_writer.write_edges(config, [new_config], [label])
+            new = self.checker.check_config(new_config, new_hash)
+            if self.state_writer is not None:
+                if self.state_writer.transitions:
+                    self.state_writer.write_transition(config, new_config, new)
+                elif new:
+                    self.state_writer.write_state(new_config)
+            if self.checker.violation is not None:
+                successors.close()
+                break
+        self.exec_time += self.coordinator.executed_cycles
 
-    def launch_checking(self, init_cfg):
+    def launch_checking(self, init_cfg, budget=None):
+        """
+        Explore the configurations reachable from the initial one.
+        :param init_cfg: initial configuration
+        :param budget: optional Budget stopping the exploration early
+        :return: execution time in cycles and encountered configurations
+        """
         # print("Checking config " + str(hex(init_cfg.raw_memory)))
         # Memory
         init_memory = init_cfg # Memory(self.cfg_size, init_cfg)
-        self.checker.known.add(init_memory)
-        self.process_config(init_memory)
-        alive = 0
+        self.setup_checker(init_memory)
+        init_hash = self.hasher.hash_config(init_memory)
+        self.checker.known.add(init_memory, init_hash)
+        self.checker.check_property(init_memory)
+        self.checker.frontier.append((init_memory, init_hash))
+        if self.state_writer is not None:
+            self.state_writer.start(self.cfg_size)
+            if self.state_writer.transitions:
+                self.state_writer.write_transition(init_memory, init_memory, True)
+            else:
+                self.state_writer.write_state(init_memory)
+        return self.explore(budget)
+
+    def resume_checking(self, checkpoint_file, budget=None):
+        """
+        Resume an exploration stopped by a budget from its checkpoint. The state
+        writer, if any, only receives what is discovered after the checkpoint.
+        :param checkpoint_file: checkpoint written when the budget was exceeded
+        :param budget: optional Budget of the resumed exploration
+        :return: execution time in cycles and encountered configurations
+        """
+        with open(checkpoint_file, "rb") as file:
+            checkpoint = pickle.load(file)
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint["cfg_size"] != self.cfg_size:
+            raise ValueError("Checkpoint {} does not match the simulated model".format(checkpoint_file))
+        if checkpoint["known"]:
+            self.setup_checker(checkpoint["known"][0])
+        for config in checkpoint["known"]:
+            self.checker.known.add(config, self.hasher.hash_config(config))
+        for config in checkpoint["frontier"]:
+            self.checker.frontier.append((config, self.hasher.hash_config(config)))
+        self.exec_time = checkpoint["exec_time"]
+        self.successors = checkpoint["successors"]
+        self.processed = checkpoint["processed"]
+        return self.explore(budget)
+
+    def setup_checker(self, base):
+        """
+        Switch to a CompactChecker if compact is set and the bits used by the
+        programs fit in a 64-bit word.
+        :param base: configuration giving the value of the bits no program uses
+        """
+        if self.compact:
+            layout = CompactLayout.from_decoders(self.decoders, self.cfg_size, base)
+            if layout is not None:
+                self.checker = CompactChecker(layout, self.hasher, self.checker.prop)
+
+    def explore(self, budget=None):
+        """
+        Process the frontier until it is empty or the budget is exceeded, in which
+        case stop_reason is set and the checkpoint of the budget, if any, is written.
+        :param budget: optional Budget stopping the exploration early
+        :return: execution time in cycles and encountered configurations
+        """
+        self.stop_reason = None if self.checker.violation is None else STOP_VIOLATION
+        if self.metrics is not None:
+            self.metrics.start()
+        if self.state_writer is not None:
+            self.state_writer.start(self.cfg_size)
+        if self.edge_writer is not None:
+            self.edge_writer.start(self.cfg_size)
+        max_states = None
+        if budget is not None:
+            budget.start()
+            max_states = budget.max_states
+        alive = self.processed
         # while not self.checker.last:
-        while len(self.checker.frontier) != 0:
-            new_config = self.checker.next_config()
+        while self.stop_reason is None and len(self.checker.frontier) != 0:
+            new_config, new_hash = self.checker.next_config()
             # print("Checking config " + str(hex(new_config)))
-            self.process_config(new_config)
-            if alive % 1000 == 999:
-                print("{} configs checked.".format(alive+1))
-                print("Frontier filled with {} configurations".format(len(self.checker.frontier)))
-                print("Encountered {} configurations".format(len(self.checker.known)))
-                print("____________________________________________")
+            self.process_config(new_config, new_hash)
             alive += 1
+            # State budget checked on every expansion, time and memory when polling
+            if self.checker.violation is not None:
+                self.stop_reason = STOP_VIOLATION
+            elif max_states is not None and len(self.checker.known) >= max_states:
+                self.stop_reason = STOP_STATES
+            elif alive % POLL_PERIOD == 0:
+                if self.metrics is not None:
+                    self.metrics.poll(alive, len(self.checker.frontier), len(self.checker.known),
+                                      self.successors, self.exec_time)
+                if budget is not None:
+                    self.stop_reason = budget.exceeded(len(self.checker.known))
+            if self.stop_reason is not None:
+                break
+        self.processed = alive
+        if self.stop_reason not in (None, STOP_VIOLATION) and budget.checkpoint_file is not None:
+            self.write_checkpoint(budget.checkpoint_file)
+        if self.metrics is not None:
+            self.metrics.report(alive, len(self.checker.frontier), len(self.checker.known),
+                                self.successors, self.exec_time, final=True)
+            self.metrics.close()
+        if self.state_writer is not None:
+            self.state_writer.close()
+        if self.edge_writer is not None:
+            self.edge_writer.close()
+        if self.profiler is not None:
+            self.profiler.dump()
         return self.exec_time, self.checker.known
 
+    def statistics(self):
+        """
+        :return: statistics of the exploration, partial if stop_reason is set
+        """
+        return {
+            "stop_reason": self.stop_reason,
+            "states": len(self.checker.known),
+            "processed": self.processed,
+            "frontier": len(self.checker.frontier),
+            "successors": self.successors,
+            "exec_time": self.exec_time,
+            "violation": self.checker.violation
+        }
+
+    def write_checkpoint(self, checkpoint_file):
+        """
+        Store the encountered configurations, the frontier and the counters atomically.
+        :param checkpoint_file: path of the checkpoint
+        """
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "cfg_size": self.cfg_size,
+            "known": list(self.checker.known),
+            "frontier": [config for config, _ in self.checker.frontier],
+            "exec_time": self.exec_time,
+            "successors": self.successors,
+            "processed": self.processed
+        }
+        channel = default_writer().open(checkpoint_file, atomic=True)
+        pickle.dump(checkpoint, channel, protocol=pickle.HIGHEST_PROTOCOL)
+        channel.close()
+
 if __name__ == "__main__":
     binaries = [
         "../../sdvu/cfg/adding.6.out.0",
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# State file: Reachable configurations streamed to a binary file of flagged records
+
+import struct
+
+from sdvs.write_behind import default_writer
+
+# Header: magic, format version, flags, configuration size in bits
+HEADER = struct.Struct("<4sBBxxI")
+MAGIC = b"SDVS"
+STATE_FILE_VERSION = 2
+# Records are transitions (flag, source, target) instead of configurations
+FLAG_TRANSITIONS = 0x1
+# Record flags: new transition, source (or configuration) and target not fitting in the width
+RECORD_NEW = 0x1
+RECORD_WIDE_SOURCE = 0x2
+RECORD_WIDE_TARGET = 0x4
+# Signed byte length (negative for negative configurations) preceding a configuration not fitting in the width
+WIDE = struct.Struct("<i")
+
+
+def record_width(cfg_size):
+    """
+    :param cfg_size: configuration size in bits
+    :return: number of bytes of a configuration in a record
+    """
+    return max(1, (cfg_size + 7) // 8)
+
+
+def pack_config(config, width):
+    """
+    :param config: configuration
+    :param width: configuration width in bytes
+    :return: little-endian bytes of the configuration and whether it did not fit in the width
+    (a store overflowing its field, a negative value), its bytes being then preceded by their length
+    """
+    if 0 <= config < 1 << (8 * width):
+        return config.to_bytes(width, "little"), False
+    size = (abs(config).bit_length() + 7) // 8
+    return WIDE.pack(-size if config < 0 else size) + abs(config).to_bytes(size, "little"), True
+
+
+def read_config(file, width, wide):
+    """
+    :param file: binary file positioned on a configuration written by pack_config
+    :param width: configuration width in bytes
+    :param wide: whether the configuration did not fit in the width
+    :return: configuration
+    """
+    if not wide:
+        return int.from_bytes(file.read(width), "little")
+    (size,) = WIDE.unpack(file.read(WIDE.size))
+    config = int.from_bytes(file.read(abs(size)), "little")
+    return -config if size < 0 else config
+
+
+class StateWriter:
+    """
+    Write every newly discovered configuration as a record made of a flag byte
+    and the little-endian configuration of the configuration width. With
+    transitions, every generated successor is written instead as a (flags,
+    source, target) record, RECORD_NEW being set when the target was discovered
+    by this transition. The initial configuration is then recorded as a new
+    transition from itself. Configurations that do not fit in the width are
+    flagged and written with their length (see pack_config). Records are
+    written by the write-behind thread.
+    """
+
+    def __init__(self, file_name, transitions=False):
+        self.file_name = file_name
+        self.transitions = transitions
+        self.cfg_size = None
+        self.width = None
+        self.limit = None
+        self.file = None
+        self.records = 0
+
+    def start(self, cfg_size):
+        """
+        Open the file and write its header.
+        :param cfg_size: configuration size in bits
+        """
+        if self.file is None:
+            self.cfg_size = cfg_size
+            self.width = record_width(cfg_size)
+            self.limit = 1 << (8 * self.width)
+            self.file = default_writer().open(self.file_name)
+            flags = FLAG_TRANSITIONS if self.transitions else 0
+            self.file.write(HEADER.pack(MAGIC, STATE_FILE_VERSION, flags, self.cfg_size))
+
+    def write_state(self, config):
+        if 0 <= config < self.limit:
+            self.file.write(b"\x00" + config.to_bytes(self.width, "little"))
+        else:
+            data, _ = pack_config(config, self.width)
+            self.file.write(bytes([RECORD_WIDE_SOURCE]) + data)
+        self.records += 1
+
+    def write_transition(self, source, target, new):
+        source_data, wide_source = pack_config(source, self.width)
+        target_data, wide_target = pack_config(target, self.width)
+        flags = (RECORD_NEW if new else 0) | (RECORD_WIDE_SOURCE if wide_source else 0) \
+            | (RECORD_WIDE_TARGET if wide_target else 0)
+        self.file.write(bytes([flags]) + source_data + target_data)
+        self.records += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class StateReader:
+    """
+    Read a file written by StateWriter.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        with open(file_name, "rb") as file:
+            magic, version, flags, self.cfg_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != STATE_FILE_VERSION:
+            raise ValueError("{} is not a version {} state file".format(file_name, STATE_FILE_VERSION))
+        self.transitions = bool(flags & FLAG_TRANSITIONS)
+        self.width = record_width(self.cfg_size)
+
+    def records(self):
+        """
+        :return: iterator over the (flags, configuration) records, or (flags, source, target)
+        with transitions
+        """
+        width = self.width
+        with open(self.file_name, "rb") as file:
+            file.seek(HEADER.size)
+            for flags in iter(lambda: file.read(1), b""):
+                flags = flags[0]
+                config = read_config(file, width, flags & RECORD_WIDE_SOURCE)
+                if self.transitions:
+                    yield flags, config, read_config(file, width, flags & RECORD_WIDE_TARGET)
+                else:
+                    yield flags, config
+
+    def states(self):
+        """
+        :return: iterator over the configurations in discovery order
+        """
+        if not self.transitions:
+            for _, config in self.records():
+                yield config
+        else:
+            for new, _, target in self.edges():
+                if new:
+                    yield target
+
+    def edges(self):
+        """
+        :return: iterator over the (new, source, target) transitions
+        """
+        if not self.transitions:
+            raise ValueError("{} does not contain transitions".format(self.file_name))
+        for flags, source, target in self.records():
+            yield bool(flags & RECORD_NEW), source, target
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Stealing: Depth-first exploration over worker processes balanced by work stealing
+
+import multiprocessing
+import os
+import random
+from collections import deque
+from multiprocessing.connection import wait
+
+from sdvs.binary_reader import BinaryReader
+from sdvs.checker import HashedConfigSet
+from sdvs.coordinator import Coordinator
+from sdvs.decoder import Decoder
+from sdvs.hashing import ZobristHasher
+from sdvs.state_file import record_width
+from sdvs.transport import decode_batch, encode_batch
+
+# Successors a worker gathers before sending them, and configurations per message sent to a worker
+BATCH_SIZE = 256
+# Messages of configurations a worker may have received and not yet pushed on its stack
+CREDITS = 4
+
+# Messages, the first item of the tuples sent through the pipes
+MSG_CONFIGS = "configs"
+MSG_STEAL = "steal"
+MSG_STOP = "stop"
+MSG_EXPANDED = "expanded"
+MSG_STOLEN = "stolen"
+MSG_ERROR = "error"
+
+
+class WorkStack:
+    """
+    Frontier of one worker: (configuration, hash) pairs popped by their owner
+    from the newest end (depth-first, as Checker.frontier) and stolen from the
+    oldest end, closest to the root and thus with the most work below.
+    """
+
+    def __init__(self):
+        self.items = deque()
+
+    def push(self, items):
+        self.items.extend(items)
+
+    def pop(self):
+        """
+        :return: newest pair, None if the stack is empty
+        """
+        return self.items.pop() if self.items else None
+
+    def steal(self):
+        """
+        :return: oldest half of the pairs (rounded up), in their order
+        """
+        count = (len(self.items) + 1) // 2
+        return [self.items.popleft() for _ in range(count)]
+
+    def __len__(self):
+        return len(self.items)
+
+
+class StealingWorker:
+    """
+    Expansion loop of a worker process. The newest configuration of the stack
+    is expanded and the successors are sent to the owner process in batches,
+    the owner sending the new ones back to be pushed on the stack. Messages of
+    the owner are handled between two expansions, and waited for only when
+    the stack is empty. Every message to the owner holds the number of
+    configuration messages pushed so far, which returns their credits.
+    """
+
+    def __init__(self, connection, bin_paths, cfg_size, engine=None, batch_size=BATCH_SIZE):
+        self.connection = connection
+        decoders = [Decoder(BinaryReader.read_instructions(path)) for path in bin_paths]
+        self.coordinator = Coordinator(decoders, cfg_size, ZobristHasher(), engine)
+        self.width = record_width(cfg_size)
+        self.batch_size = batch_size
+        self.stack = WorkStack()
+        self.received = 0
+        # Expansions not reported yet
+        self.processed = 0
+        self.cycles = 0
+        self.successors = []
+
+    def report(self):
+        self.connection.send((MSG_EXPANDED, self.received, self.processed, self.cycles,
+                              encode_batch(self.successors, self.width)))
+        self.processed = 0
+        self.cycles = 0
+        self.successors = []
+
+    def handle(self, message):
+        """
+        :return: False once the owner stops the exploration
+        """
+        if message[0] == MSG_CONFIGS:
+            self.stack.push(decode_batch(message[1], self.width))
+            self.received += 1
+        elif message[0] == MSG_STEAL:
+            # Possibly nothing, when the stack emptied since the owner chose this victim
+            self.connection.send((MSG_STOLEN, self.received, message[1], encode_batch(self.stack.steal(), self.width)))
+        else:
+            return False
+        return True
+
+    def run(self):
+        connection = self.connection
+        stack = self.stack
+        process_config = self.coordinator.process_config
+        while True:
+            while not stack or connection.poll():
+                # Successors are reported before waiting for the new ones
+                if not stack and self.processed:
+                    self.report()
+                if not self.handle(connection.recv()):
+                    return
+            config, config_hash = stack.pop()
+            exec_time, new_configs, new_hashes = process_config(config, config_hash)
+            self.processed += 1
+            self.cycles += exec_time
+            self.successors += zip(new_configs, new_hashes)
+            if len(self.successors) >= self.batch_size:
+                self.report()
+
+
+def run_worker(connection, bin_paths, cfg_size, engine, batch_size):
+    try:
+        StealingWorker(connection, bin_paths, cfg_size, engine, batch_size).run()
+    except Exception as error:
+        # Raised by the owner, which stops the other workers
+        connection.send((MSG_ERROR, error))
+
+
+class WorkerLink:
+    """
+    Owner side of the pipe to a worker: configuration messages waiting for a
+    credit and the configurations the worker holds.
+    """
+
+    def __init__(self, index, connection):
+        self.index = index
+        self.connection = connection
+        self.queue = deque()
+        self.sent = 0
+        self.received = 0
+        # Configurations given to the worker and not yet reported expanded or stolen
+        self.load = 0
+        # Worker asked to give this one work, None when not stealing
+        self.victim = None
+        # Nothing to steal from this worker until its next report
+        self.exhausted = False
+        self.processed = 0
+        self.steals = 0
+
+
+class WorkStealingSimulator:
+    """
+    Depth-first exploration over worker processes, each with its own stack.
+    This process owns the visited set: the successors found by a worker come
+    back to it and their new configurations return to the same worker, which
+    keeps exploring its part of the graph. A worker without configurations
+    steals the oldest half of the stack of a random victim holding some, the
+    owner forwarding the request and the stolen configurations. pending counts
+    the configurations in a stack, being expanded or on their way, so that the
+    exploration ends when it reaches zero. The exploration order differs from
+    Simulator but the encountered configurations, successors and cycles are
+    the same.
+    """
+
+    def __init__(self, bin_paths, cfg_size, workers=None, engine=None, metrics=None, seed=0, batch_size=BATCH_SIZE):
+        self.bin_paths = bin_paths
+        self.cfg_size = cfg_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.engine = engine
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.width = record_width(cfg_size)
+        self.hasher = ZobristHasher()
+        self.known = HashedConfigSet(self.hasher)
+        self.random = random.Random(seed)
+        self.links = []
+        self.pending = 0
+        self.exec_time = 0
+        self.successors = 0
+        self.processed = 0
+        self.stop_reason = None
+
+    def launch_checking(self, init_cfg):
+        """
+        Explore the configurations reachable from the initial one.
+        :param init_cfg: initial configuration
+        :return: execution time in cycles and encountered configurations
+        """
+        init_hash = self.hasher.hash_config(init_cfg)
+        self.known.add(init_cfg, init_hash)
+        self.pending = 1
+        if self.metrics is not None:
+            self.metrics.start()
+        processes = []
+        try:
+            for index in range(self.workers):
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=run_worker, daemon=True,
+                                                  args=(worker_connection, self.bin_paths, self.cfg_size,
+                                                        self.engine, self.batch_size))
+                process.start()
+                worker_connection.close()
+                self.links.append(WorkerLink(index, connection))
+                processes.append(process)
+            self.give(self.links[0], [(init_cfg, init_hash)])
+            self.explore()
+            for link in self.links:
+                link.connection.send((MSG_STOP,))
+            for process in processes:
+                process.join()
+        finally:
+            # Workers are stopped after an error in one of them
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            for link in self.links:
+                link.connection.close()
+        if self.metrics is not None:
+            self.metrics.report(self.processed, self.pending, len(self.known), self.successors, self.exec_time,
+                                final=True)
+            self.metrics.close()
+        return self.exec_time, self.known
+
+    def give(self, link, records):
+        """
+        Queue configurations for a worker, sent as its credits allow.
+        """
+        for start in range(0, len(records), self.batch_size):
+            link.queue.append(encode_batch(records[start:start + self.batch_size], self.width))
+        link.load += len(records)
+        link.exhausted = False
+        self.dispatch(link)
+
+    def dispatch(self, link):
+        while link.queue and link.sent - link.received < CREDITS:
+            link.connection.send((MSG_CONFIGS, link.queue.popleft()))
+            link.sent += 1
+
+    def steal(self):
+        """
+        Send a steal request to a random victim for every worker without configurations.
+        """
+        for thief in self.links:
+            if thief.load == 0 and thief.victim is None:
+                # One configuration may be the one being expanded
+                victims = [link for link in self.links if link.load > 1 and not link.exhausted]
+                if not victims:
+                    return
+                thief.victim = self.random.choice(victims)
+                thief.victim.connection.send((MSG_STEAL, thief.index))
+
+    def explore(self):
+        links = self.links
+        connections = [link.connection for link in links]
+        add = self.known.add
+        while self.pending:
+            self.steal()
+            for connection in wait(connections):
+                link = links[connections.index(connection)]
+                try:
+                    message = connection.recv()
+                except EOFError:
+                    raise ConnectionError("Worker {} exited during the exploration".format(link.index))
+                if message[0] == MSG_ERROR:
+                    raise message[1]
+                link.received = message[1]
+                if message[0] == MSG_EXPANDED:
+                    _, _, processed, cycles, payload = message
+                    successors = decode_batch(payload, self.width)
+                    new = [(config, config_hash) for config, config_hash in successors if add(config, config_hash)]
+                    link.processed += processed
+                    link.load -= processed
+                    link.exhausted = False
+                    self.processed += processed
+                    self.exec_time += cycles
+                    self.successors += len(successors)
+                    # Expanded configurations leave once their successors are counted
+                    self.pending += len(new) - processed
+                    if new:
+                        self.give(link, new)
+                    if self.metrics is not None:
+                        self.metrics.poll(self.processed, self.pending, len(self.known), self.successors,
+                                          self.exec_time)
+                else:
+                    _, _, thief_index, payload = message
+                    stolen = decode_batch(payload, self.width)
+                    thief = links[thief_index]
+                    thief.victim = None
+                    link.load -= len(stolen)
+                    if stolen:
+                        thief.steals += 1
+                        self.give(thief, stolen)
+                    else:
+                        link.exhausted = True
+                self.dispatch(link)
+
+    def worker_statistics(self):
+        """
+        :return: configurations processed by each worker and the steals that gave it configurations
+        """
+        return [{"worker": link.index, "processed": link.processed, "steals": link.steals} for link in self.links]
+
+    def statistics(self):
+        """
+        :return: statistics of the exploration, see Simulator.statistics, and the counters of
+        each worker (see worker_statistics)
+        """
+        return {
+            "stop_reason": self.stop_reason,
+            "states": len(self.known),
+            "processed": self.processed,
+            "frontier": self.pending,
+            "successors": self.successors,
+            "exec_time": self.exec_time,
+            "violation": None,
+            "steals": sum(link.steals for link in self.links),
+            "workers": self.worker_statistics()
+        }
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Swarm: Independent randomized bitstate searches run on a process pool, their coverage merged
+
+import concurrent.futures
+import math
+import os
+import random
+import time
+
+from sdvs.checker import Checker
+from sdvs.simulator import Simulator
+
+WORD_SIZE = 64
+WORD_MASK = (1 << WORD_SIZE) - 1
+# Odd multipliers mixing the salted hashes, one per hash function (cycled beyond)
+MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+# Default log2 of the bits of the bitstate table of a search (32 MiB) and of the registers of the coverage
+# sketch (16 KiB, relative standard error 1.04 / 2^7 < 1%)
+BITSTATE_BITS = 28
+HASH_COUNT = 3
+COVERAGE_BITS = 14
+# Smallest and largest log2 of the registers of a coverage sketch
+MIN_COVERAGE_BITS = 4
+MAX_COVERAGE_BITS = 24
+
+
+class CoverageMap:
+    """
+    HyperLogLog sketch of the configurations encountered by a search: the top
+    bits of their hash select a one-byte register, which keeps the largest
+    rank (position of the first set bit) of the other bits. Every search uses
+    the same index, so that the sketches of independent searches merge by
+    taking the largest registers, and the number of distinct configurations
+    they encountered together is estimated from the registers, without ever
+    saturating.
+    """
+
+    def __init__(self, bits=COVERAGE_BITS, data=None):
+        """
+        :param bits: log2 of the number of registers
+        :param data: bytes of the registers of a sketch of the same size, None for an empty one
+        """
+        if not MIN_COVERAGE_BITS <= bits <= MAX_COVERAGE_BITS:
+            raise ValueError("Coverage sketches have {} to {} bits, not {}".format(MIN_COVERAGE_BITS,
+                                                                                   MAX_COVERAGE_BITS, bits))
+        self.bits = bits
+        self.shift = WORD_SIZE - bits
+        self.mask = (1 << self.shift) - 1
+        self.data = bytearray(1 << bits) if data is None else bytearray(data)
+
+    def mark(self, config_hash):
+        index = config_hash >> self.shift
+        rank = self.shift - (config_hash & self.mask).bit_length() + 1
+        if rank > self.data[index]:
+            self.data[index] = rank
+
+    def merge(self, other):
+        """
+        :param other: CoverageMap of the same size, whose registers are merged into this one
+        """
+        if other.bits != self.bits:
+            raise ValueError("Coverage maps of {} and {} bits cannot be merged".format(self.bits, other.bits))
+        self.data = bytearray(map(max, self.data, other.data))
+
+    def count(self):
+        """
+        :return: number of registers set
+        """
+        return len(self.data) - self.data.count(0)
+
+    def estimate(self):
+        """
+        :return: estimated number of distinct configurations marked (HyperLogLog, linear
+        counting over the empty registers for the small counts)
+        """
+        size = len(self.data)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(size, 0.7213 / (1 + 1.079 / size))
+        raw = alpha * size * size / sum(2.0 ** -register for register in self.data)
+        empty = self.data.count(0)
+        if raw <= 2.5 * size and empty:
+            return round(size * math.log(size / empty))
+        return round(raw)
+
+
+class BitstateSet:
+    """
+    Visited set storing hash_count bits per configuration in a table of
+    2^bits bits, each bit given by the hash of the configuration salted and
+    mixed differently. A configuration is new if one of its bits was clear:
+    a configuration whose bits were all set by others is wrongly considered
+    visited (the search misses it and its successors), never the reverse.
+    """
+
+    def __init__(self, bits=BITSTATE_BITS, hash_count=HASH_COUNT, seed=0, coverage=None):
+        self.bits = bits
+        self.table = bytearray(1 << max(bits - 3, 0))
+        generator = random.Random(seed)
+        self.salts = [generator.getrandbits(WORD_SIZE) for _ in range(hash_count)]
+        self.coverage = coverage
+        self.count = 0
+
+    def indexes(self, config_hash):
+        shift = WORD_SIZE - self.bits
+        return [(((config_hash ^ salt) * MULTIPLIERS[i % len(MULTIPLIERS)]) & WORD_MASK) >> shift
+                for i, salt in enumerate(self.salts)]
+
+    def add(self, config, config_hash):
+        """
+        Add a configuration to the set.
+        :param config: configuration to add, only its hash is stored
+        :param config_hash: hash of the configuration
+        :return: True if one of the bits of the configuration was clear
+        """
+        table = self.table
+        new = False
+        for index in self.indexes(config_hash):
+            byte, bit = index >> 3, 1 << (index & 7)
+            if not table[byte] & bit:
+                table[byte] |= bit
+                new = True
+        if new:
+            self.count += 1
+            if self.coverage is not None:
+                self.coverage.mark(config_hash)
+        return new
+
+    def __len__(self):
+        return self.count
+
+
+class SwarmSearch(Simulator):
+    """
+    One search of a swarm: a depth-first exploration whose cores run in an
+    order drawn from the seed, so that successors are pushed and explored in
+    a different order by each search, with a bitstate visited set of fixed
+    size whose hash functions are drawn from the seed as well.
+    """
+
+    def __init__(self, bin_paths, cfg_size, seed=0, bitstate_bits=BITSTATE_BITS, hash_count=HASH_COUNT,
+                 coverage_bits=COVERAGE_BITS, engine=None):
+        super(SwarmSearch, self).__init__(bin_paths, cfg_size, engine=engine)
+        self.seed = seed
+        generator = random.Random(seed)
+        generator.shuffle(self.coordinator.cores)
+        self.coverage = CoverageMap(coverage_bits)
+        self.checker = Checker(self.hasher)
+        self.checker.known = BitstateSet(bitstate_bits, hash_count, generator.getrandbits(WORD_SIZE), self.coverage)
+
+    def core_order(self):
+        return [core.nb for core in self.coordinator.cores]
+
+
+def run_search(bin_paths, cfg_size, init_cfg, seed, bitstate_bits=BITSTATE_BITS, hash_count=HASH_COUNT,
+               coverage_bits=COVERAGE_BITS, budget=None, engine=None):
+    """
+    Job of the swarm runner.
+    :return: result dictionary, coverage holding the bytes of the coverage sketch
+    """
+    start = time.perf_counter()
+    search = SwarmSearch(bin_paths, cfg_size, seed, bitstate_bits, hash_count, coverage_bits, engine)
+    search.launch_checking(init_cfg, budget)
+    statistics = search.statistics()
+    return {"seed": seed, "core_order": search.core_order(), "states": statistics["states"],
+            "processed": statistics["processed"], "successors": statistics["successors"],
+            "exec_time": statistics["exec_time"], "stop_reason": statistics["stop_reason"],
+            "host_time": time.perf_counter() - start, "coverage": bytes(search.coverage.data)}
+
+
+class SwarmRunner:
+    """
+    Run independent SwarmSearch explorations on a process pool, each
+    with its own seed and limited by the same budget, if any. The searches
+    share nothing while running: their coverage sketches are merged as they end.
+    """
+
+    def __init__(self, bin_paths, cfg_size, searches=None, jobs=None, seed=0, bitstate_bits=BITSTATE_BITS,
+                 hash_count=HASH_COUNT, coverage_bits=COVERAGE_BITS, budget=None, engine=None):
+        self.bin_paths = bin_paths
+        self.cfg_size = cfg_size
+        self.jobs = jobs if jobs else os.cpu_count()
+        self.searches = searches if searches else self.jobs
+        self.seed = seed
+        self.bitstate_bits = bitstate_bits
+        self.hash_count = hash_count
+        self.budget = budget
+        self.engine = engine
+        self.coverage = CoverageMap(coverage_bits)
+        self.results = []
+        self.stop_reason = None
+
+    def launch_checking(self, init_cfg, on_result=None):
+        """
+        Run the searches from the initial configuration.
+        :param on_result: optional function called with the result of each search as it ends
+        :return: results of the searches in completion order
+        """
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(run_search, self.bin_paths, self.cfg_size, init_cfg, self.seed + index,
+                                       self.bitstate_bits, self.hash_count, self.coverage.bits, self.budget,
+                                       self.engine)
+                       for index in range(self.searches)]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                self.coverage.merge(CoverageMap(self.coverage.bits, result["coverage"]))
+                self.results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        return self.results
+
+    def statistics(self):
+        """
+        :return: statistics of the swarm: states is the estimated number of distinct
+        configurations encountered by the searches together, exec_time the largest
+        of the searches and the other counters are summed over the searches
+        """
+        return {
+            "stop_reason": self.stop_reason,
+            "states": self.coverage.estimate(),
+            "processed": sum(result["processed"] for result in self.results),
+            "frontier": 0,
+            "successors": sum(result["successors"] for result in self.results),
+            "exec_time": max((result["exec_time"] for result in self.results), default=0),
+            "violation": None,
+            "searches": len(self.results),
+            "max_search_states": max((result["states"] for result in self.results), default=0),
+            "coverage_registers": self.coverage.count()
+        }
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Transport: Batches of configurations exchanged between processes, as bytes or through shared memory
+
+import struct
+
+from sdvs.state_file import record_width
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.8 and above only
+    shared_memory = None
+
+# Hash stored after each configuration
+HASH = struct.Struct("<Q")
+# Batch header: number of packed records and of extra records, extra record header: signed length and hash
+BATCH = struct.Struct("<II")
+EXTRA = struct.Struct("<iQ")
+
+
+def pack_records(records, width):
+    """
+    :param records: (config, hash) pairs
+    :param width: configuration width in bytes
+    :return: bytes of the records that fit in the width and list of the others
+    """
+    limit = 1 << (8 * width)
+    packed = []
+    extra = []
+    for config, config_hash in records:
+        if 0 <= config < limit:
+            packed.append(config.to_bytes(width, "little") + HASH.pack(config_hash))
+        else:
+            extra.append((config, config_hash))
+    return b"".join(packed), extra
+
+
+def unpack_records(data, width):
+    """
+    :param data: bytes written by pack_records
+    :param width: configuration width in bytes
+    :return: list of (config, hash) pairs
+    """
+    record_size = width + HASH.size
+    unpack_hash = HASH.unpack_from
+    return [(int.from_bytes(data[offset:offset + width], "little"), unpack_hash(data, offset + width)[0])
+            for offset in range(0, len(data), record_size)]
+
+
+def encode_batch(records, width):
+    """
+    :param records: (config, hash) pairs
+    :param width: configuration width in bytes
+    :return: records packed at the width, followed by the configurations that do not fit
+    """
+    packed, extra = pack_records(records, width)
+    parts = [BATCH.pack(len(records) - len(extra), len(extra)), packed]
+    for config, config_hash in extra:
+        size = (abs(config).bit_length() + 7) // 8
+        parts.append(EXTRA.pack(-size if config < 0 else size, config_hash))
+        parts.append(abs(config).to_bytes(size, "little"))
+    return b"".join(parts)
+
+
+def decode_batch(payload, width):
+    """
+    :param payload: bytes returned by encode_batch
+    :param width: configuration width in bytes
+    :return: list of (config, hash) pairs
+    """
+    count, extra = BATCH.unpack_from(payload)
+    offset = BATCH.size + count * (width + 8)
+    records = unpack_records(payload[BATCH.size:offset], width)
+    for _ in range(extra):
+        size, config_hash = EXTRA.unpack_from(payload, offset)
+        offset += EXTRA.size
+        config = int.from_bytes(payload[offset:offset + abs(size)], "little")
+        offset += abs(size)
+        records.append((-config if size < 0 else config, config_hash))
+    return records
+
+
+class BatchBuffer:
+    """
+    Shared memory block split into slots of capacity fixed-width records, each
+    record being a little-endian configuration of the configuration width
+    followed by its 64-bit hash. A slot belongs to one process at a time: the
+    writer hands it over with the number of records it holds (through a pipe)
+    and the reader gives it back once read. Configurations that do not fit in
+    the width (a store overflowing its field, a negative value) are returned
+    by write as extra records, to be sent along with the hand-over.
+    """
+
+    def __init__(self, cfg_size, slots, capacity, name=None):
+        """
+        :param cfg_size: configuration size in bits
+        :param slots: number of slots
+        :param capacity: records per slot
+        :param name: name of an existing block to attach to, None to create one
+        """
+        if shared_memory is None:
+            raise RuntimeError("Shared memory buffers require Python 3.8 or above")
+        self.cfg_size = cfg_size
+        self.width = record_width(cfg_size)
+        self.record_size = self.width + HASH.size
+        self.slots = slots
+        self.capacity = capacity
+        size = slots * capacity * self.record_size
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+        self.name = self.memory.name
+
+    def __reduce__(self):
+        # Processes attach to the block instead of copying it
+        return BatchBuffer, (self.cfg_size, self.slots, self.capacity, self.name)
+
+    def write(self, slot, records):
+        """
+        :param slot: slot to fill
+        :param records: at most capacity (config, hash) pairs
+        :return: number of records written in the slot and the extra records
+        """
+        data, extra = pack_records(records, self.width)
+        start = slot * self.capacity * self.record_size
+        self.memory.buf[start:start + len(data)] = data
+        return len(data) // self.record_size, extra
+
+    def read(self, slot, count):
+        """
+        :param slot: slot to read
+        :param count: number of records in the slot
+        :return: list of (config, hash) pairs
+        """
+        start = slot * self.capacity * self.record_size
+        return unpack_records(bytes(self.memory.buf[start:start + count * self.record_size]), self.width)
+
+    def close(self):
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Release the block, to be called by the process that created it once every process closed it.
+        """
+        self.memory.close()
+        self.memory.unlink()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Write-behind: Background thread writing the exploration outputs
+
+import atexit
+import os
+import queue
+import tempfile
+import threading
+
+# Channels hand their buffer to the thread once it reaches CHUNK_SIZE bytes
+CHUNK_SIZE = 1 << 20
+# Chunks waiting to be written before writers block
+MAX_PENDING = 16
+
+# Operations of the queue
+OP_WRITE = 0
+OP_CLOSE = 1
+OP_STOP = 2
+
+
+class Channel:
+    """
+    Output file of a WriteBehind thread. Writes are accumulated in a buffer
+    handed to the thread as one chunk, the file being opened, written and closed
+    by the thread. An atomic channel writes to a temporary file that replaces
+    the target on close.
+    """
+
+    def __init__(self, io_thread, file_name, append=False, atomic=False, chunk_size=CHUNK_SIZE):
+        self.io_thread = io_thread
+        self.file_name = file_name
+        self.append = append
+        self.atomic = atomic
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        # Handled by the thread only
+        self.file = None
+        self.temp_path = None
+        self.error = None
+        self.closed = False
+
+    def check(self):
+        if self.error is not None:
+            raise self.error
+
+    def write(self, data):
+        """
+        :param data: bytes or text (encoded in UTF-8) to write
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Hand the buffer to the thread without waiting for it to be written.
+        """
+        self.check()
+        if self.buffer:
+            chunk, self.buffer = self.buffer, bytearray()
+            self.io_thread.submit(OP_WRITE, self, chunk)
+
+    def close(self):
+        """
+        Flush the buffer and wait until the file is written and closed.
+        """
+        if not self.closed:
+            self.closed = True
+            self.flush()
+            done = threading.Event()
+            self.io_thread.submit(OP_CLOSE, self, done)
+            done.wait()
+            self.check()
+
+    def open_file(self):
+        if self.atomic:
+            directory = os.path.dirname(os.path.abspath(self.file_name))
+            descriptor, self.temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            self.file = os.fdopen(descriptor, "wb")
+        else:
+            self.file = open(self.file_name, "ab" if self.append else "wb")
+
+    def close_file(self):
+        if self.file is None:
+            self.open_file()
+        self.file.close()
+        if self.atomic:
+            os.replace(self.temp_path, self.file_name)
+            self.temp_path = None
+
+    def abort(self):
+        """
+        Close the file after an error, removing the temporary file of an atomic channel.
+        """
+        try:
+            if self.file is not None:
+                self.file.close()
+        except OSError:
+            pass
+        if self.temp_path is not None:
+            try:
+                os.unlink(self.temp_path)
+            except OSError:
+                pass
+            self.temp_path = None
+
+
+class WriteBehind:
+    """
+    Single thread writing the chunks of every channel in submission order. The
+    queue is bounded: when the disk cannot keep up, writers block on submit
+    until the thread catches up. The error of a channel is raised on its next
+    flush or on close.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING):
+        self.queue = queue.Queue(max_pending)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def open(self, file_name, append=False, atomic=False, chunk_size=CHUNK_SIZE):
+        """
+        :param file_name: path of the output
+        :param append: append to the file instead of truncating it
+        :param atomic: replace the file only once the channel is closed
+        :param chunk_size: size of the chunks handed to the thread
+        :return: channel writing to the file
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="sdvs-write-behind", daemon=True)
+                self.thread.start()
+        return Channel(self, file_name, append, atomic, chunk_size)
+
+    def submit(self, operation, channel, payload=None):
+        self.queue.put((operation, channel, payload))
+
+    def run(self):
+        while True:
+            operation, channel, payload = self.queue.get()
+            if operation == OP_STOP:
+                return
+            try:
+                if channel.error is None and operation == OP_WRITE:
+                    if channel.file is None:
+                        channel.open_file()
+                    channel.file.write(payload)
+                elif channel.error is None and operation == OP_CLOSE:
+                    channel.close_file()
+            except Exception as error:
+                # Any error ends the channel, not the thread other channels and waiting writers rely on
+                channel.error = error
+                channel.abort()
+            finally:
+                if operation == OP_CLOSE:
+                    payload.set()
+
+    def stop(self):
+        """
+        Write what is pending and stop the thread, channels left open are not closed.
+        """
+        with self.lock:
+            if self.thread is not None:
+                self.queue.put((OP_STOP, None, None))
+                self.thread.join()
+                self.thread = None
+
+
+_default_writer = None
+
+
+def _reset_default_writer():
+    # The thread of the parent does not exist in a forked child
+    global _default_writer
+    _default_writer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_default_writer)
+
+
+def default_writer():
+    """
+    :return: write-behind thread shared by the outputs of the process, stopped at exit
+    """
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = WriteBehind()
+        atexit.register(_default_writer.stop)
+    return _default_writer
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Batch: Compile and simulate many models and core counts on a process pool
+# Test file!
+
+import csv
+import json
+import os
+import stat
+import tempfile
+import unittest
+
+from sdvs.batch import BatchRunner, ResultWriter, expand_models, parse_ncores
+
+# Fake sdvc producing cores incrementing the same byte up to 3:
+# loadbyte r1 0 / lt r2 r1 3 / jmp r2 6 / add r1 r1 1 / storebyte r1 0 / endga / nop
+fake_compiler = """#!/bin/sh
+i=0
+while [ "$i" -lt "$6" ]; do
+    printf '\\000\\000\\020\\351\\003\\010\\200\\204\\006\\000\\000\\302\\001\\010\\100\\024\\000\\000\\020\\321\\000\\000\\000\\360\\000\\000\\000\\000' > "$4.$i"
+    i=$((i + 1))
+done
+"""
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.compiler = os.path.join(self.directory.name, "sdvc")
+        with open(self.compiler, "w") as file:
+            file.write(fake_compiler)
+        os.chmod(self.compiler, os.stat(self.compiler).st_mode | stat.S_IEXEC)
+        for name in ["first", "second"]:
+            with open(os.path.join(self.directory.name, name + ".sdve"), "w") as file:
+                file.write("byte a = 0;\n")
+            with open(os.path.join(self.directory.name, name + ".cfg"), "w") as file:
+                file.write("00\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_ncores(self):
+        self.assertEqual([3], parse_ncores("3"))
+        self.assertEqual([1, 2, 3, 4], parse_ncores("1-4"))
+        self.assertEqual([1, 2, 8], parse_ncores("8,1,2"))
+        self.assertEqual([1, 2, 3, 6], parse_ncores("1-3,6"))
+        self.assertRaises(ValueError, parse_ncores, "0")
+
+    def test_expand_models(self):
+        sources = expand_models([os.path.join(self.directory.name, "*.sdve")])
+        self.assertEqual(["first.sdve", "second.sdve"], [os.path.basename(source) for source in sources])
+
+    def test_run(self):
+        csv_file = os.path.join(self.directory.name, "execstats.csv")
+        json_file = os.path.join(self.directory.name, "execstats.json")
+        sources = expand_models([os.path.join(self.directory.name, "*.sdve"),
+                                 os.path.join(self.directory.name, "missing.sdve")])
+        runner = BatchRunner(sources, [1, 2], self.compiler, os.path.join(self.directory.name, "bin"), 2,
+                             ResultWriter(csv_file, json_file))
+        results = runner.run()
+        self.assertEqual(6, len(results))
+        with open(csv_file) as file:
+            rows = sorted(csv.reader(file))
+        self.assertEqual(["first", "1", rows[0][2], "4"], rows[0])
+        self.assertEqual(4, len(rows))
+        with open(json_file) as file:
+            json_results = json.load(file)
+        errors = [result for result in json_results if result["error"] is not None]
+        self.assertEqual(["missing", "missing"], [result["model"] for result in errors])
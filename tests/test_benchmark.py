@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Benchmark: Host time of the decoder, the cores, the coordinator and the checking loop
+# Test file!
+
+import json
+import os
+import tempfile
+import unittest
+
+from sdvs.benchmark import Benchmark, CORPUS
+from sdvs.binary_reader import BinaryReader
+from sdvs.generator import ModelGenerator
+
+BENCHMARKS = ["decode", "core", "coordinator", "launch_checking"]
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_model_binaries(self):
+        model = ModelGenerator(2, 2, 3).generate()
+        bin_paths = model.write_binaries(self.directory.name)
+        self.assertEqual(2, len(bin_paths))
+        # Trailing NOP added by the reader
+        self.assertEqual(model.assemble()[1] + [0], list(BinaryReader.read_instructions(bin_paths[1])))
+
+    def test_run(self):
+        benchmark = Benchmark(repeat=1, iterations=5, sizes=[(2, 2, 3, 0.5)])
+        results = benchmark.run()
+        self.assertEqual((len(CORPUS) + 1) * len(BENCHMARKS), len(results))
+        states = {result["model"]: result["items"] for result in results
+                  if result["benchmark"] == "launch_checking"}
+        self.assertEqual(201, states["counter.1"])
+        self.assertEqual(12, states["turn.2"])
+        self.assertEqual(5, states["array.1"])
+        self.assertEqual(3 ** 2, states["gen.2c2v3r50d"])
+        for result in results:
+            self.assertIn(result["benchmark"], BENCHMARKS)
+            self.assertGreater(result["host_time"], 0)
+
+    def test_write(self):
+        benchmark = Benchmark(repeat=1, iterations=1, sizes=[], models=[ModelGenerator(1, 1, 3).generate()])
+        benchmark.run()
+        output_file = os.path.join(self.directory.name, "bench.json")
+        benchmark.write(output_file)
+        with open(output_file) as file:
+            results = json.load(file)
+        self.assertEqual(len(BENCHMARKS), len(results))
+        checking = results[-1]
+        self.assertEqual(3, checking["items"])
+        self.assertIsNotNone(checking["states_per_sec"])
+        self.assertIsNotNone(checking["peak_rss"])
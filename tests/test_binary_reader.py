@@ -7,6 +7,8 @@
 # Binary reader: Handles the binary file and produces a list of 32-bits instructions.
 # Test file!
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 
@@ -29,3 +31,21 @@ class TestBinaryReader(unittest.TestCase):
     def testReadFile(self):
         memory = BinaryReader.read_memory("path/to/mock/file")
         self.assertEqual(0x123456789abcdef0, memory)
+
+    def testReadInstructionsFile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "a.out.0")
+            BinaryReader.write_instructions(file_name, [0x8080901c, 0xdea31214])
+            self.assertEqual([0x8080901c, 0xdea31214, 0x00000000],
+                             list(BinaryReader.read_instructions(file_name)))
+
+    def testReadIncompleteInstruction(self):
+        instructions = BinaryReader.instructions_from_bytes(b'\x1c\x90\x80\x80\x14\x12')
+        self.assertEqual([0x8080901c, 0x1214, 0x00000000], list(instructions))
+
+    def testMapInstructions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "a.out.0")
+            BinaryReader.write_instructions(file_name, [0x8080901c, 0xdea31214])
+            with BinaryReader.map_instructions(file_name) as instructions:
+                self.assertEqual([0x8080901c, 0xdea31214], list(instructions))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Budget: Wall-clock, state-count and memory limits of an exploration
+# Test file!
+
+import os
+import tempfile
+import unittest
+
+from sdvs.budget import Budget, STOP_MEMORY, STOP_STATES, STOP_TIME
+from sdvs.generator import ModelGenerator
+from sdvs.simulator import Simulator
+
+
+class TestBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model = ModelGenerator(2, 3, 4).generate()
+        self.bin_paths = self.model.write_binaries(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def simulator(self):
+        return Simulator(self.bin_paths, self.model.cfg_size)
+
+    def test_exceeded(self):
+        self.assertIsNone(Budget().exceeded(10 ** 6))
+        self.assertEqual(STOP_STATES, Budget(max_states=10).exceeded(10))
+        self.assertIsNone(Budget(max_states=10).exceeded(9))
+        budget = Budget(max_time=0)
+        budget.start()
+        self.assertEqual(STOP_TIME, budget.exceeded(0))
+        self.assertEqual(STOP_MEMORY, Budget(max_rss=1).exceeded(0))
+
+    def test_unlimited(self):
+        simulator = self.simulator()
+        _, cfgs = simulator.launch_checking(self.model.init_cfg, Budget())
+        statistics = simulator.statistics()
+        self.assertIsNone(statistics["stop_reason"])
+        self.assertEqual(self.model.expected_states, len(cfgs))
+        self.assertEqual(0, statistics["frontier"])
+
+    def test_max_states(self):
+        simulator = self.simulator()
+        _, cfgs = simulator.launch_checking(self.model.init_cfg, Budget(max_states=20))
+        statistics = simulator.statistics()
+        self.assertEqual(STOP_STATES, statistics["stop_reason"])
+        self.assertGreaterEqual(statistics["states"], 20)
+        self.assertLess(statistics["states"], self.model.expected_states)
+        self.assertGreater(statistics["frontier"], 0)
+        self.assertGreater(statistics["exec_time"], 0)
+
+    def test_checkpoint(self):
+        checkpoint_file = os.path.join(self.directory.name, "checkpoint.pickle")
+        simulator = self.simulator()
+        simulator.launch_checking(self.model.init_cfg, Budget(max_states=20, checkpoint_file=checkpoint_file))
+        stopped = simulator.statistics()
+        self.assertTrue(os.path.isfile(checkpoint_file))
+        resumed = self.simulator()
+        _, cfgs = resumed.resume_checking(checkpoint_file)
+        statistics = resumed.statistics()
+        self.assertIsNone(statistics["stop_reason"])
+        self.assertEqual(self.model.expected_states, len(cfgs))
+        self.assertEqual(self.model.expected_states, statistics["processed"])
+        self.assertGreater(statistics["successors"], stopped["successors"])
+
+    def test_checkpoint_mismatch(self):
+        checkpoint_file = os.path.join(self.directory.name, "checkpoint.pickle")
+        self.simulator().launch_checking(self.model.init_cfg, Budget(max_states=20, checkpoint_file=checkpoint_file))
+        simulator = Simulator(self.bin_paths, self.model.cfg_size + 8)
+        self.assertRaises(ValueError, simulator.resume_checking, checkpoint_file)
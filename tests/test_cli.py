@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Command Line Interface: Command-line arguments parser and routine.
+# Test file!
+
+import csv
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sdvs.cli import CLI
+
+# Fake sdvc producing cores incrementing the same byte up to 3:
+# loadbyte r1 0 / lt r2 r1 3 / jmp r2 6 / add r1 r1 1 / storebyte r1 0 / endga / nop
+fake_compiler = """#!/bin/sh
+echo "$2" >> "{log}"
+i=0
+while [ "$i" -lt "$6" ]; do
+    printf '\\000\\000\\020\\351\\003\\010\\200\\204\\006\\000\\000\\302\\001\\010\\100\\024\\000\\000\\020\\321\\000\\000\\000\\360\\000\\000\\000\\000' > "$4.$i"
+    i=$((i + 1))
+done
+"""
+
+
+class TestCLI(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.directory.name, "calls.log")
+        self.compiler = os.path.join(self.directory.name, "sdvc")
+        with open(self.compiler, "w") as file:
+            file.write(fake_compiler.format(log=self.log))
+        os.chmod(self.compiler, os.stat(self.compiler).st_mode | stat.S_IEXEC)
+        self.source = os.path.join(self.directory.name, "counter.sdve")
+        with open(self.source, "w") as file:
+            file.write("byte a = 0;\n")
+        with open(os.path.join(self.directory.name, "counter.cfg"), "w") as file:
+            file.write("00\n")
+        self.outputfile = os.path.join(self.directory.name, "execstats.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *args):
+        cli = CLI(["-s", self.source, "-c", self.compiler, "-o", self.outputfile,
+                   "--cachedir", os.path.join(self.directory.name, "bin")] + list(args))
+        with patch("sys.stdout"), patch("sys.stderr"):
+            cli.main()
+
+    def test_main(self):
+        self.run_cli("-n", "2")
+        self.run_cli("-n", "2")
+        with open(self.outputfile) as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(2, len(rows))
+        # Both cores share the counter
+        self.assertEqual(["counter", "2", rows[0][2], "4"], rows[0])
+        # Compiled only once
+        with open(self.log) as file:
+            self.assertEqual(1, len(file.readlines()))
+
+    def test_budget(self):
+        checkpoint = os.path.join(self.directory.name, "checkpoint.pickle")
+        self.run_cli("-n", "2", "--max-states", "2", "--checkpoint", checkpoint)
+        self.assertTrue(os.path.isfile(checkpoint))
+        self.run_cli("-n", "2", "--resume", checkpoint)
+        with open(self.outputfile) as file:
+            rows = list(csv.reader(file))
+        self.assertEqual("2", rows[0][3])
+        self.assertEqual("4", rows[1][3])
+
+    def test_swarm(self):
+        cli = CLI(["-s", self.source, "-c", self.compiler, "-o", self.outputfile, "-n", "2",
+                   "--cachedir", os.path.join(self.directory.name, "bin"), "--swarm", "3", "-j", "2",
+                   "--bitstate-bits", "16", "--coverage-bits", "10"])
+        with patch("sys.stdout") as stdout:
+            cli.main()
+        output = "".join(call.args[0] for call in stdout.write.call_args_list)
+        self.assertEqual(3, output.count("Search "))
+        self.assertIn("3 searches, 4 distinct configs", output)
+
+    def test_checkpoint_without_budget(self):
+        with patch("sys.stderr"), self.assertRaises(SystemExit):
+            self.run_cli("-n", "2", "--checkpoint", os.path.join(self.directory.name, "checkpoint.pickle"))
+
+    def test_workers_python_37(self):
+        with patch("sys.version_info", (3, 7, 9)), self.assertRaisesRegex(ValueError, "Python 3.8"):
+            self.run_cli("-n", "2", "--workers", "2")
+
+    def test_engine(self):
+        self.run_cli("-n", "2", "--engine", "fast", "--fusion-report")
+        self.run_cli("-n", "2", "--engine", "interpreter")
+        self.run_cli("-n", "2", "--engine", "fast", "--optimize", "--guards", "--guard-report", "--compact")
+        with open(self.outputfile) as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], rows[1])
+        self.assertEqual(rows[0], rows[2])
+
+    @unittest.skipIf(sys.version_info < (3, 8), "Shared memory buffers require Python 3.8")
+    def test_workers(self):
+        self.run_cli("-n", "2")
+        self.run_cli("-n", "2", "--workers", "2", "--engine", "fast")
+        self.run_cli("-n", "2", "--stealing", "3")
+        self.run_cli("-n", "2", "--nodes", "2")
+        with open(self.outputfile) as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], rows[1])
+        self.assertEqual(rows[0], rows[2])
+        self.assertEqual(rows[0], rows[3])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Compact: Visited set and frontier of 64-bit words for configurations that fit in one
+# Test file!
+
+import os
+import tempfile
+import unittest
+
+from sdvs.asm import ASM
+from sdvs.benchmark import CORPUS
+from sdvs.budget import Budget
+from sdvs.compact import CompactChecker, CompactConfigSet, CompactFrontier, CompactLayout, used_bits
+from sdvs.decoder import Decoder
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.simulator import Simulator
+
+
+def decode(lines):
+    asm = ASM()
+    return Decoder([asm.process_line(line) for line in lines])
+
+
+class TestCompact(unittest.TestCase):
+
+    def test_used_bits(self):
+        decoder = decode(["loadbyte r1 8", "storebyte r1 40", "nop"])
+        self.assertEqual((0xFF << 8) | (0xFF << 40), used_bits([decoder.program], 128))
+        # Addresses from registers can reach any bit
+        decoder = decode(["loadbyte r1 r2", "nop"])
+        self.assertEqual((1 << 128) - 1, used_bits([decoder.program], 128))
+        self.assertIsNone(CompactLayout.from_decoders([decoder], 128, 0))
+
+    def test_layout(self):
+        layout = CompactLayout((0xFF << 8) | (1 << 40), 0xABCD << 64)
+        self.assertEqual([(8, 8), (40, 1)], layout.segments)
+        self.assertEqual(9, layout.width)
+        config = (0xABCD << 64) | (1 << 40) | (0x12 << 8)
+        self.assertEqual(0x112, layout.pack(config))
+        self.assertEqual(config, layout.unpack(0x112))
+        # Unused bits differing from the base
+        self.assertIsNone(layout.pack(config | 1))
+        self.assertIsNone(layout.pack(-1))
+
+    def test_identity_layout(self):
+        layout = CompactLayout(0xFFFF, 0)
+        self.assertTrue(layout.identity)
+        self.assertEqual(0x1234, layout.pack(0x1234))
+        self.assertEqual(0x1234, layout.unpack(0x1234))
+
+    def test_config_set(self):
+        layout = CompactLayout(0xFFFF, 1 << 20)
+        known = CompactConfigSet(layout, slots=4)
+        configs = [(1 << 20) | value for value in range(100)] + [1 << 24]
+        for config in configs:
+            self.assertTrue(known.add(config))
+        for config in configs:
+            self.assertFalse(known.add(config))
+            self.assertIn(config, known)
+        self.assertNotIn((1 << 20) | 100, known)
+        self.assertEqual(len(configs), len(known))
+        self.assertEqual(sorted(configs), sorted(known))
+        # Grown from 4 slots, at most half full
+        self.assertGreaterEqual(len(known.slots), 2 * known.used)
+
+    def test_frontier(self):
+        layout = CompactLayout(0xFF, 0)
+        frontier = CompactFrontier(layout)
+        items = [(0x12, 7), (1 << 70, 8), (0, 0), (0x34, None)]
+        for item in items:
+            frontier.append(item)
+        self.assertEqual(4, len(frontier))
+        self.assertEqual([(0x12, 7), (1 << 70, 8), (0, 0), (0x34, 0)], list(frontier))
+        self.assertEqual(list(reversed(items)), [frontier.pop() for _ in items])
+
+    def test_models(self):
+        models = list(CORPUS) + [ModelGenerator(3, 3, 4, guard_density=0.5).generate()]
+        with tempfile.TemporaryDirectory() as directory:
+            for model in models:
+                bin_paths = model.write_binaries(directory)
+                results = []
+                for compact, engine in [(False, None), (True, None), (True, FastEngine)]:
+                    simulator = Simulator(bin_paths, model.cfg_size, engine=engine, compact=compact)
+                    exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+                    results.append((exec_time, sorted(cfgs), simulator.successors))
+                self.assertIsInstance(simulator.checker, CompactChecker, model.name)
+                self.assertEqual(results[0], results[1], model.name)
+                self.assertEqual(results[0], results[2], model.name)
+
+    def test_resume(self):
+        model = ModelGenerator(2, 3, 4).generate()
+        with tempfile.TemporaryDirectory() as directory:
+            bin_paths = model.write_binaries(directory)
+            checkpoint = os.path.join(directory, "checkpoint.pickle")
+            simulator = Simulator(bin_paths, model.cfg_size, compact=True)
+            simulator.launch_checking(model.init_cfg, Budget(max_states=10, checkpoint_file=checkpoint))
+            resumed = Simulator(bin_paths, model.cfg_size, compact=True)
+            _, cfgs = resumed.resume_checking(checkpoint)
+            self.assertIsInstance(resumed.checker, CompactChecker)
+            self.assertEqual(model.expected_states, len(cfgs))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Compile cache: Reuse the sdvc outputs of a model, keyed by source, compiler and number of cores
+# Test file!
+
+import os
+import stat
+import tempfile
+import unittest
+
+from sdvs.compile_cache import CompileCache, CompilationException
+
+# Fake sdvc: compiler -c source -o output -n ncores, logs each call
+fake_compiler = """#!/bin/sh
+echo "$2" >> "{log}"
+i=0
+while [ "$i" -lt "$6" ]; do
+    printf '\\000\\000\\000\\000' > "$4.$i"
+    i=$((i + 1))
+done
+"""
+
+failing_compiler = """#!/bin/sh
+exit 3
+"""
+
+
+class TestCompileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.directory.name, "calls.log")
+        self.compiler = self.write_script("sdvc", fake_compiler.format(log=self.log))
+        self.source = os.path.join(self.directory.name, "model.sdve")
+        with open(self.source, "w") as file:
+            file.write("byte a = 0;\n")
+        self.cache = CompileCache(os.path.join(self.directory.name, "bin"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_script(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def calls(self):
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as file:
+            return len(file.readlines())
+
+    def test_compile_once(self):
+        bin_paths = self.cache.compile(self.source, self.compiler, "3")
+        self.assertEqual(3, len(bin_paths))
+        for bin_path in bin_paths:
+            self.assertTrue(os.path.isfile(bin_path))
+        self.assertEqual(os.path.join(self.directory.name, "bin", "model"),
+                         os.path.dirname(os.path.dirname(bin_paths[0])))
+        self.assertEqual(bin_paths, self.cache.compile(self.source, self.compiler, 3))
+        self.assertEqual(1, self.calls())
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_key_changes(self):
+        bin_paths = self.cache.compile(self.source, self.compiler, 2)
+        self.assertNotEqual(bin_paths[0], self.cache.compile(self.source, self.compiler, 1)[0])
+        with open(self.source, "a") as file:
+            file.write("byte b = 0;\n")
+        self.assertNotEqual(bin_paths, self.cache.compile(self.source, self.compiler, 2))
+        self.assertEqual(3, self.calls())
+
+    def test_compiler_failure(self):
+        compiler = self.write_script("broken", failing_compiler)
+        self.assertRaises(CompilationException, self.cache.compile, self.source, compiler, 2)
+        # Nothing left behind, next attempt compiles again
+        self.assertEqual([], os.listdir(os.path.join(self.directory.name, "bin", "model")))
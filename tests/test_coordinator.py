@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Coordinator: Coordination between the different cores of the system.
+# Test file!
+
+import tempfile
+import unittest
+
+from sdvs.benchmark import CORPUS
+from sdvs.binary_reader import BinaryReader
+from sdvs.checker import STOP_VIOLATION
+from sdvs.coordinator import Coordinator
+from sdvs.decoder import Decoder
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.hashing import ZobristHasher
+from sdvs.simulator import Simulator
+
+
+def assert_explores_as_simulator(test, run, model, directory, engine=None):
+    """
+    Check that a scheduler spreading the expansions finds what the sequential Simulator finds.
+    :param test: test case making the assertions
+    :param run: function(bin_paths, model, engine) exploring the model with the scheduler and
+    returning its execution time, encountered configurations and statistics
+    :return: statistics of the scheduler
+    """
+    bin_paths = model.write_binaries(directory)
+    simulator = Simulator(bin_paths, model.cfg_size, engine=engine)
+    exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+    expected = (exec_time, sorted(cfgs), simulator.successors)
+    exec_time, cfgs, statistics = run(bin_paths, model, engine)
+    test.assertEqual(expected, (exec_time, sorted(cfgs), statistics["successors"]), model.name)
+    test.assertEqual(len(cfgs), statistics["states"])
+    test.assertEqual(len(cfgs), statistics["processed"])
+    test.assertEqual(0, statistics["frontier"])
+    return statistics
+
+
+def assert_models_explored_as_simulator(test, run):
+    """
+    assert_explores_as_simulator on the corpus and a generated model, the latter with the fast engine as well.
+    """
+    models = list(CORPUS) + [ModelGenerator(3, 3, 4, guard_density=0.5).generate()]
+    with tempfile.TemporaryDirectory() as directory:
+        for model in models:
+            assert_explores_as_simulator(test, run, model, directory)
+        assert_explores_as_simulator(test, run, models[-1], directory, FastEngine)
+
+
+class TestCoordinator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model = ModelGenerator(3, 3, 4, guard_density=0.5).generate()
+        self.bin_paths = self.model.write_binaries(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def coordinator(self, engine=None):
+        decoders = [Decoder(BinaryReader.read_instructions(path)) for path in self.bin_paths]
+        return Coordinator(decoders, self.model.cfg_size, ZobristHasher(), engine)
+
+    def test_successors(self):
+        for engine in [None, FastEngine]:
+            expected = self.coordinator(engine)
+            lazy = self.coordinator(engine)
+            expected.record_labels()
+            lazy.record_labels()
+            max_time, configs, hashes = expected.process_config(self.model.init_cfg)
+            successors = list(lazy.successors(self.model.init_cfg))
+            self.assertEqual(list(zip(configs, hashes, expected.labels)), successors)
+            self.assertEqual(max_time, lazy.executed_cycles)
+
+    def test_successors_without_labels(self):
+        for engine in [None, FastEngine]:
+            expected = self.coordinator(engine)
+            lazy = self.coordinator(engine)
+            max_time, configs, hashes = expected.process_config(self.model.init_cfg)
+            self.assertEqual(list(zip(configs, hashes, [None] * len(configs))),
+                             list(lazy.successors(self.model.init_cfg)))
+            self.assertEqual(max_time, lazy.executed_cycles)
+
+    def test_close(self):
+        for engine in [None, FastEngine]:
+            coordinator = self.coordinator(engine)
+            successors = coordinator.successors(self.model.init_cfg)
+            next(successors)
+            successors.close()
+            # Only the first core ran, until its first endga
+            self.assertFalse(coordinator.cores[0].idle)
+            self.assertEqual(0, coordinator.cores[1].executed_cycles)
+            self.assertEqual(coordinator.cores[0].executed_cycles, coordinator.executed_cycles)
+
+    def test_property(self):
+        for model in list(CORPUS) + [self.model]:
+            bin_paths = model.write_binaries(self.directory.name)
+            simulator = Simulator(bin_paths, model.cfg_size, prop=lambda config: True)
+            simulator.launch_checking(model.init_cfg)
+            self.assertIsNone(simulator.stop_reason)
+            self.assertIsNone(simulator.statistics()["violation"])
+        self.assertEqual(self.model.expected_states, len(simulator.checker.known))
+
+    def test_violation(self):
+        for engine in [None, FastEngine]:
+            simulator = Simulator(self.bin_paths, self.model.cfg_size, engine=engine,
+                                  prop=lambda config: config != self.model.init_cfg + 1)
+            simulator.launch_checking(self.model.init_cfg)
+            statistics = simulator.statistics()
+            self.assertEqual(STOP_VIOLATION, statistics["stop_reason"])
+            self.assertEqual(self.model.init_cfg + 1, statistics["violation"])
+            # The expansion stopped at the violating successor
+            self.assertEqual(1, statistics["processed"])
+            self.assertEqual(1, statistics["successors"])
+
+    def test_initial_violation(self):
+        simulator = Simulator(self.bin_paths, self.model.cfg_size, prop=lambda config: False)
+        simulator.launch_checking(self.model.init_cfg)
+        self.assertEqual(STOP_VIOLATION, simulator.stop_reason)
+        self.assertEqual(0, simulator.processed)
+
+    def test_exec_time(self):
+        # Sum over the configurations of the cycles of their slowest core
+        expected = {"counter.1": 8826, "turn.2": 1112, "array.1": 338}
+        for model in CORPUS:
+            bin_paths = model.write_binaries(self.directory.name)
+            for engine in [None, FastEngine]:
+                simulator = Simulator(bin_paths, model.cfg_size, engine=engine)
+                exec_time, _ = simulator.launch_checking(model.init_cfg)
+                self.assertEqual(expected[model.name], exec_time, model.name)
+        # The cycles of a configuration do not depend on the ones processed before
+        coordinator = self.coordinator()
+        first, _, _ = coordinator.process_config(self.model.init_cfg)
+        second, _, _ = coordinator.process_config(self.model.init_cfg)
+        self.assertEqual(first, second)
+
+    def test_successors_do_not_accumulate(self):
+        for engine in [None, FastEngine]:
+            coordinator = self.coordinator(engine)
+            memories = [(core.memory, core.init_memory) for core in coordinator.cores]
+            simulator = Simulator(self.bin_paths, self.model.cfg_size, engine=engine)
+            simulator.launch_checking(self.model.init_cfg)
+            for config in list(simulator.checker.known)[:20]:
+                _, configs, _ = coordinator.process_config(config)
+                # Each core only holds the successors of the last configuration
+                self.assertEqual(len(configs), sum(len(core.new_configs) for core in coordinator.cores))
+                self.assertEqual(configs, [new_config for core in coordinator.cores for new_config in core.new_configs])
+            # Memories are reloaded in place
+            self.assertEqual(memories, [(core.memory, core.init_memory) for core in coordinator.cores])
@@ -81,16 +81,7 @@ mock_file = append_bin_mock_file(mock_file)
 
 # Dummy instruction setup
 def setUpInstruction(op_code, cfg, data_type=VAL_BOOL):
-    instruction = Instruction(op_code)
-    instruction.cfg_mask = cfg
-    instruction.rd = 1
-    instruction.ra = 2
-    instruction.rb = 3
-    instruction.imma = 122
-    instruction.immb = 123
-    instruction.address = 124
-    instruction.type = data_type
-    return instruction
+    return Instruction(op_code, cfg, data_type, rd=1, ra=2, rb=3, imma=122, immb=123, address=124)
 
 
 class TestSimulator(unittest.TestCase):
@@ -111,26 +102,33 @@ class TestSimulator(unittest.TestCase):
         self.simulator = Core(decoder, memory)
 
     def testAssignRegisterValue(self):
-        for reg in self.simulator.registers:
-            self.assertEqual(0, reg.value)
+        for value in self.simulator.registers:
+            self.assertEqual(0, value)
         self.simulator.assign_register_value(7, 32)
-        for reg in self.simulator.registers:
-            if reg.number == 7:
-                self.assertEqual(32, reg.value)
+        for i, value in enumerate(self.simulator.registers):
+            if i == 7:
+                self.assertEqual(32, value)
             else:
-                self.assertEqual(0, reg.value)
+                self.assertEqual(0, value)
 
     def testRetrieveRegisterValue(self):
-        self.simulator.registers[7].value = 32
-        for i, reg in enumerate(self.simulator.registers):
-            if reg.number == 7:
+        self.simulator.registers[7] = 32
+        for i, value in enumerate(self.simulator.registers):
+            if i == 7:
                 self.assertEqual(32, self.simulator.retrieve_register_value(i))
             else:
                 self.assertEqual(0, self.simulator.retrieve_register_value(i))
 
+    def testRegisterObjects(self):
+        self.simulator.registers[3] = 12
+        register_objects = self.simulator.register_objects()
+        self.assertEqual(REG_NUMBER, len(register_objects))
+        self.assertEqual([3, 12], [register_objects[3].number, register_objects[3].value])
+        self.assertEqual(0, register_objects[4].value)
+
     def testProcessBinaryOperandsRR(self):
-        self.simulator.registers[2].value = 2
-        self.simulator.registers[3].value = 4
+        self.simulator.registers[2] = 2
+        self.simulator.registers[3] = 4
         for op in range(OP_EQ + 1):
             self.simulator.current_instruction = setUpInstruction(op, CFG_RR)
             left_operand, right_operand = self.simulator.process_binary_operands()
@@ -138,7 +136,7 @@ class TestSimulator(unittest.TestCase):
             self.assertEqual(4, right_operand)
 
     def testProcessBinaryOperandsRI(self):
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         for op in range(OP_EQ + 1):
             self.simulator.current_instruction = setUpInstruction(op, CFG_RI)
             left_operand, right_operand = self.simulator.process_binary_operands()
@@ -146,7 +144,7 @@ class TestSimulator(unittest.TestCase):
             self.assertEqual(123, right_operand)
 
     def testProcessBinaryOperandsIR(self):
-        self.simulator.registers[3].value = 4
+        self.simulator.registers[3] = 4
         for op in range(OP_EQ + 1):
             self.simulator.current_instruction = setUpInstruction(op, CFG_IR)
             left_operand, right_operand = self.simulator.process_binary_operands()
@@ -167,54 +165,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessAddRR(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_add()
-        self.assertEqual(1 + 2, self.simulator.registers[3].value)
+        self.assertEqual(1 + 2, self.simulator.registers[3])
 
     def testProcessAddRI(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_add()
-        self.assertEqual(1 + 122, self.simulator.registers[3].value)
+        self.assertEqual(1 + 122, self.simulator.registers[3])
 
     def testProcessAddIR(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_add()
-        self.assertEqual(122 + 2, self.simulator.registers[3].value)
+        self.assertEqual(122 + 2, self.simulator.registers[3])
 
     def testProcessAddII(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_add()
-        self.assertEqual(123 + 124, self.simulator.registers[3].value)
+        self.assertEqual(123 + 124, self.simulator.registers[3])
 
     def testProcessOneInstructionAddRR(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 + 2, self.simulator.registers[3].value)
+        self.assertEqual(1 + 2, self.simulator.registers[3])
 
     def testProcessOneInstructionAddRI(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 + 122, self.simulator.registers[3].value)
+        self.assertEqual(1 + 122, self.simulator.registers[3])
 
     def testProcessOneInstructionAddIR(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 + 2, self.simulator.registers[3].value)
+        self.assertEqual(122 + 2, self.simulator.registers[3])
 
     def testProcessOneInstructionAddII(self):
         self.simulator.decoder.next_instruction_index = ADD_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 + 124, self.simulator.registers[3].value)
+        self.assertEqual(123 + 124, self.simulator.registers[3])
 
     # --------------
     # SUB OPERATIONS
@@ -223,54 +221,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessSubRR(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_sub()
-        self.assertEqual(1 - 2, self.simulator.registers[3].value)
+        self.assertEqual(1 - 2, self.simulator.registers[3])
 
     def testProcessSubRI(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_sub()
-        self.assertEqual(1 - 122, self.simulator.registers[3].value)
+        self.assertEqual(1 - 122, self.simulator.registers[3])
 
     def testProcessSubIR(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_sub()
-        self.assertEqual(122 - 2, self.simulator.registers[3].value)
+        self.assertEqual(122 - 2, self.simulator.registers[3])
 
     def testProcessSubII(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_sub()
-        self.assertEqual(123 - 124, self.simulator.registers[3].value)
+        self.assertEqual(123 - 124, self.simulator.registers[3])
 
     def testProcessOneInstructionSubRR(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 - 2, self.simulator.registers[3].value)
+        self.assertEqual(1 - 2, self.simulator.registers[3])
 
     def testProcessOneInstructionSubRI(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 - 122, self.simulator.registers[3].value)
+        self.assertEqual(1 - 122, self.simulator.registers[3])
 
     def testProcessOneInstructionSubIR(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 - 2, self.simulator.registers[3].value)
+        self.assertEqual(122 - 2, self.simulator.registers[3])
 
     def testProcessOneInstructionSubII(self):
         self.simulator.decoder.next_instruction_index = SUB_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 - 124, self.simulator.registers[3].value)
+        self.assertEqual(123 - 124, self.simulator.registers[3])
 
     # --------------
     # MUL OPERATIONS
@@ -279,54 +277,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessMulRR(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_mul()
-        self.assertEqual(1 * 2, self.simulator.registers[3].value)
+        self.assertEqual(1 * 2, self.simulator.registers[3])
 
     def testProcessMulRI(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_mul()
-        self.assertEqual(1 * 122, self.simulator.registers[3].value)
+        self.assertEqual(1 * 122, self.simulator.registers[3])
 
     def testProcessMulIR(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_mul()
-        self.assertEqual(122 * 2, self.simulator.registers[3].value)
+        self.assertEqual(122 * 2, self.simulator.registers[3])
 
     def testProcessMulII(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_mul()
-        self.assertEqual(123 * 124, self.simulator.registers[3].value)
+        self.assertEqual(123 * 124, self.simulator.registers[3])
 
     def testProcessOneInstructionMulRR(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 * 2, self.simulator.registers[3].value)
+        self.assertEqual(1 * 2, self.simulator.registers[3])
 
     def testProcessOneInstructionMulRI(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 * 122, self.simulator.registers[3].value)
+        self.assertEqual(1 * 122, self.simulator.registers[3])
 
     def testProcessOneInstructionMulIR(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 * 2, self.simulator.registers[3].value)
+        self.assertEqual(122 * 2, self.simulator.registers[3])
 
     def testProcessOneInstructionMulII(self):
         self.simulator.decoder.next_instruction_index = MUL_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 * 124, self.simulator.registers[3].value)
+        self.assertEqual(123 * 124, self.simulator.registers[3])
 
     # --------------
     # DIV OPERATIONS
@@ -335,54 +333,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessDivRR(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_div()
-        self.assertEqual(1 // 2, self.simulator.registers[3].value)
+        self.assertEqual(1 // 2, self.simulator.registers[3])
 
     def testProcessDivRI(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_div()
-        self.assertEqual(1 // 122, self.simulator.registers[3].value)
+        self.assertEqual(1 // 122, self.simulator.registers[3])
 
     def testProcessDivIR(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_div()
-        self.assertEqual(122 // 2, self.simulator.registers[3].value)
+        self.assertEqual(122 // 2, self.simulator.registers[3])
 
     def testProcessDivII(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_div()
-        self.assertEqual(123 // 124, self.simulator.registers[3].value)
+        self.assertEqual(123 // 124, self.simulator.registers[3])
 
     def testProcessOneInstructionDivRR(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 // 2, self.simulator.registers[3].value)
+        self.assertEqual(1 // 2, self.simulator.registers[3])
 
     def testProcessOneInstructionDivRI(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 // 122, self.simulator.registers[3].value)
+        self.assertEqual(1 // 122, self.simulator.registers[3])
 
     def testProcessOneInstructionDivIR(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 // 2, self.simulator.registers[3].value)
+        self.assertEqual(122 // 2, self.simulator.registers[3])
 
     def testProcessOneInstructionDivII(self):
         self.simulator.decoder.next_instruction_index = DIV_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 // 124, self.simulator.registers[3].value)
+        self.assertEqual(123 // 124, self.simulator.registers[3])
 
     # --------------
     # MOD OPERATIONS
@@ -391,54 +389,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessModRR(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_mod()
-        self.assertEqual(1 % 2, self.simulator.registers[3].value)
+        self.assertEqual(1 % 2, self.simulator.registers[3])
 
     def testProcessModRI(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_mod()
-        self.assertEqual(1 % 122, self.simulator.registers[3].value)
+        self.assertEqual(1 % 122, self.simulator.registers[3])
 
     def testProcessModIR(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_mod()
-        self.assertEqual(122 % 2, self.simulator.registers[3].value)
+        self.assertEqual(122 % 2, self.simulator.registers[3])
 
     def testProcessModII(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_mod()
-        self.assertEqual(123 % 124, self.simulator.registers[3].value)
+        self.assertEqual(123 % 124, self.simulator.registers[3])
 
     def testProcessOneInstructionModRR(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 % 2, self.simulator.registers[3].value)
+        self.assertEqual(1 % 2, self.simulator.registers[3])
 
     def testProcessOneInstructionModRI(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 % 122, self.simulator.registers[3].value)
+        self.assertEqual(1 % 122, self.simulator.registers[3])
 
     def testProcessOneInstructionModIR(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 % 2, self.simulator.registers[3].value)
+        self.assertEqual(122 % 2, self.simulator.registers[3])
 
     def testProcessOneInstructionModII(self):
         self.simulator.decoder.next_instruction_index = MOD_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 % 124, self.simulator.registers[3].value)
+        self.assertEqual(123 % 124, self.simulator.registers[3])
 
     # --------------
     # AND OPERATIONS
@@ -447,106 +445,106 @@ class TestSimulator(unittest.TestCase):
     def testProcessAndRR(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_and()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessAndRI(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_and()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessAndIR(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_and()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessAndII(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_and()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessFalseAndRR(self):
         self.setUpSimOnInstruction("and r3 r2 r1")
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 0
-        self.simulator.registers[2].value = 123
+        self.simulator.registers[1] = 0
+        self.simulator.registers[2] = 123
         self.simulator.process_and()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessFalseAndRI(self):
         self.setUpSimOnInstruction("and r3 r2 0")
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 123
+        self.simulator.registers[2] = 123
         self.simulator.process_and()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessFalseAndIR(self):
         self.setUpSimOnInstruction("and r3 123 r1")
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 0
+        self.simulator.registers[1] = 0
         self.simulator.process_and()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessFalseAndII(self):
         self.setUpSimOnInstruction("and r3 0 123")
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_and()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessOneInstructionAndRR(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionAndRI(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionAndIR(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionAndII(self):
         self.simulator.decoder.next_instruction_index = AND_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionFalseAndRR(self):
         self.setUpSimOnInstruction("and r3 r2 r1")
-        self.simulator.registers[1].value = 0
-        self.simulator.registers[2].value = 123
+        self.simulator.registers[1] = 0
+        self.simulator.registers[2] = 123
         self.simulator.process_one_instruction()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessOneInstructionFalseAndRI(self):
         self.setUpSimOnInstruction("and r3 r2 0")
-        self.simulator.registers[2].value = 123
+        self.simulator.registers[2] = 123
         self.simulator.process_one_instruction()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessOneInstructionFalseAndIR(self):
         self.setUpSimOnInstruction("and r3 123 r1")
-        self.simulator.registers[1].value = 0
+        self.simulator.registers[1] = 0
         self.simulator.process_one_instruction()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
     def testProcessOneInstructionFalseAndII(self):
         self.setUpSimOnInstruction("and r3 0 123")
         self.simulator.process_one_instruction()
-        self.assertEqual(0, self.simulator.registers[3].value)
+        self.assertEqual(0, self.simulator.registers[3])
 
 
     # --------------
@@ -556,54 +554,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessOrRR(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_or()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOrRI(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_or()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOrIR(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_or()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOrII(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_or()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionOrRR(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionOrRI(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionOrIR(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionOrII(self):
         self.simulator.decoder.next_instruction_index = OR_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     # --------------
     # LT OPERATIONS
@@ -612,54 +610,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessLtRR(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_less_than()
-        self.assertEqual(1 < 2, self.simulator.registers[3].value)
+        self.assertEqual(1 < 2, self.simulator.registers[3])
 
     def testProcessLtRI(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_less_than()
-        self.assertEqual(1 < 122, self.simulator.registers[3].value)
+        self.assertEqual(1 < 122, self.simulator.registers[3])
 
     def testProcessLtIR(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_less_than()
-        self.assertEqual(122 < 2, self.simulator.registers[3].value)
+        self.assertEqual(122 < 2, self.simulator.registers[3])
 
     def testProcessLtII(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_less_than()
-        self.assertEqual(123 < 124, self.simulator.registers[3].value)
+        self.assertEqual(123 < 124, self.simulator.registers[3])
 
     def testProcessOneInstructionLtRR(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 < 2, self.simulator.registers[3].value)
+        self.assertEqual(1 < 2, self.simulator.registers[3])
 
     def testProcessOneInstructionLtRI(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 < 122, self.simulator.registers[3].value)
+        self.assertEqual(1 < 122, self.simulator.registers[3])
 
     def testProcessOneInstructionLtIR(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 < 2, self.simulator.registers[3].value)
+        self.assertEqual(122 < 2, self.simulator.registers[3])
 
     def testProcessOneInstructionLtII(self):
         self.simulator.decoder.next_instruction_index = LT_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 < 124, self.simulator.registers[3].value)
+        self.assertEqual(123 < 124, self.simulator.registers[3])
 
     # --------------
     # GT OPERATIONS
@@ -668,54 +666,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessGtRR(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_greater_than()
-        self.assertEqual(1 > 2, self.simulator.registers[3].value)
+        self.assertEqual(1 > 2, self.simulator.registers[3])
 
     def testProcessGtRI(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_greater_than()
-        self.assertEqual(1 > 122, self.simulator.registers[3].value)
+        self.assertEqual(1 > 122, self.simulator.registers[3])
 
     def testProcessGtIR(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_greater_than()
-        self.assertEqual(122 > 2, self.simulator.registers[3].value)
+        self.assertEqual(122 > 2, self.simulator.registers[3])
 
     def testProcessGtII(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_greater_than()
-        self.assertEqual(123 > 124, self.simulator.registers[3].value)
+        self.assertEqual(123 > 124, self.simulator.registers[3])
 
     def testProcessOneInstructionGtRR(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 > 2, self.simulator.registers[3].value)
+        self.assertEqual(1 > 2, self.simulator.registers[3])
 
     def testProcessOneInstructionGtRI(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 > 122, self.simulator.registers[3].value)
+        self.assertEqual(1 > 122, self.simulator.registers[3])
 
     def testProcessOneInstructionGtIR(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 > 2, self.simulator.registers[3].value)
+        self.assertEqual(122 > 2, self.simulator.registers[3])
 
     def testProcessOneInstructionGtII(self):
         self.simulator.decoder.next_instruction_index = GT_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 > 124, self.simulator.registers[3].value)
+        self.assertEqual(123 > 124, self.simulator.registers[3])
 
     # --------------
     # EQ OPERATIONS
@@ -724,54 +722,54 @@ class TestSimulator(unittest.TestCase):
     def testProcessEqRR(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_equal()
-        self.assertEqual(1 == 2, self.simulator.registers[3].value)
+        self.assertEqual(1 == 2, self.simulator.registers[3])
 
     def testProcessEqRI(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_equal()
-        self.assertEqual(1 == 122, self.simulator.registers[3].value)
+        self.assertEqual(1 == 122, self.simulator.registers[3])
 
     def testProcessEqIR(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 2
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_equal()
-        self.assertEqual(122 == 2, self.simulator.registers[3].value)
+        self.assertEqual(122 == 2, self.simulator.registers[3])
 
     def testProcessEqII(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 3
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_equal()
-        self.assertEqual(123 == 124, self.simulator.registers[3].value)
+        self.assertEqual(123 == 124, self.simulator.registers[3])
 
     def testProcessOneInstructionEqRR(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX
-        self.simulator.registers[1].value = 1
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[1] = 1
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(1 == 2, self.simulator.registers[3].value)
+        self.assertEqual(1 == 2, self.simulator.registers[3])
 
     def testProcessOneInstructionEqRI(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 1
-        self.simulator.registers[1].value = 1
+        self.simulator.registers[1] = 1
         self.simulator.process_one_instruction()
-        self.assertEqual(1 == 122, self.simulator.registers[3].value)
+        self.assertEqual(1 == 122, self.simulator.registers[3])
 
     def testProcessOneInstructionEqIR(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 2
-        self.simulator.registers[2].value = 2
+        self.simulator.registers[2] = 2
         self.simulator.process_one_instruction()
-        self.assertEqual(122 == 2, self.simulator.registers[3].value)
+        self.assertEqual(122 == 2, self.simulator.registers[3])
 
     def testProcessOneInstructionEqII(self):
         self.simulator.decoder.next_instruction_index = EQ_INDEX + 3
         self.simulator.process_one_instruction()
-        self.assertEqual(123 == 124, self.simulator.registers[3].value)
+        self.assertEqual(123 == 124, self.simulator.registers[3])
 
     # --------------
     # NOT OPERATIONS
@@ -779,16 +777,16 @@ class TestSimulator(unittest.TestCase):
 
     def testProcessNot(self):
         self.simulator.decoder.next_instruction_index = NOT_INDEX
-        self.simulator.registers[1].value = 23
+        self.simulator.registers[1] = 23
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_not()
-        self.assertEqual(not 23, self.simulator.registers[3].value)
+        self.assertEqual(not 23, self.simulator.registers[3])
 
     def testProcessOneInstructionNot(self):
         self.simulator.decoder.next_instruction_index = NOT_INDEX
-        self.simulator.registers[1].value = 23
+        self.simulator.registers[1] = 23
         self.simulator.process_one_instruction()
-        self.assertEqual(not 23, self.simulator.registers[3].value)
+        self.assertEqual(not 23, self.simulator.registers[3])
 
     # --------------
     # JMP OPERATIONS
@@ -797,26 +795,26 @@ class TestSimulator(unittest.TestCase):
     def testProcessJmpTrue(self):
         self.simulator.decoder.next_instruction_index = JMP_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[3].value = 1  # True
+        self.simulator.registers[3] = 1  # True
         self.simulator.process_jmp()
         self.assertEqual(JMP_INDEX + 1, self.simulator.decoder.next_instruction_index)
 
     def testProcessOneInstructionJmpTrue(self):
         self.simulator.decoder.next_instruction_index = JMP_INDEX
-        self.simulator.registers[3].value = 1  # True
+        self.simulator.registers[3] = 1  # True
         self.simulator.process_one_instruction()
         self.assertEqual(JMP_INDEX + 1, self.simulator.decoder.next_instruction_index)
 
     def testProcessJmpFalse(self):
         self.simulator.decoder.next_instruction_index = JMP_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[3].value = 0  # False
+        self.simulator.registers[3] = 0  # False
         self.simulator.process_jmp()
         self.assertEqual(32, self.simulator.decoder.next_instruction_index)
 
     def testProcessOneInstructionJmpFalse(self):
         self.simulator.decoder.next_instruction_index = JMP_INDEX
-        self.simulator.registers[3].value = 0  # False
+        self.simulator.registers[3] = 0  # False
         self.simulator.process_one_instruction()
         self.assertEqual(32, self.simulator.decoder.next_instruction_index)
 
@@ -827,26 +825,26 @@ class TestSimulator(unittest.TestCase):
     def testProcessMovReg(self):
         self.simulator.decoder.next_instruction_index = MOV_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
-        self.simulator.registers[1].value = 32
+        self.simulator.registers[1] = 32
         self.simulator.process_load()
-        self.assertEqual(32, self.simulator.registers[3].value)
+        self.assertEqual(32, self.simulator.registers[3])
 
     def testProcessMovImm(self):
         self.simulator.decoder.next_instruction_index = MOV_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.process_load()
-        self.assertEqual(234, self.simulator.registers[3].value)
+        self.assertEqual(234, self.simulator.registers[3])
 
     def testProcessOneInstructionMovReg(self):
         self.simulator.decoder.next_instruction_index = MOV_INDEX
-        self.simulator.registers[1].value = 32
+        self.simulator.registers[1] = 32
         self.simulator.process_one_instruction()
-        self.assertEqual(32, self.simulator.registers[3].value)
+        self.assertEqual(32, self.simulator.registers[3])
 
     def testProcessOneInstructionMovImm(self):
         self.simulator.decoder.next_instruction_index = MOV_INDEX + 1
         self.simulator.process_one_instruction()
-        self.assertEqual(234, self.simulator.registers[3].value)
+        self.assertEqual(234, self.simulator.registers[3])
 
     # ---------------
     # LOAD OPERATIONS
@@ -856,113 +854,113 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = LOADBOOL_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeee01ee)
-        self.simulator.registers[1].value = 8     # address
+        self.simulator.registers[1] = 8     # address
         self.simulator.process_load()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessLoadBoolADR(self):
         self.simulator.decoder.next_instruction_index = LOADBOOL_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeee01ee)
         self.simulator.process_load()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadBoolRAA(self):
         self.simulator.decoder.next_instruction_index = LOADBOOL_INDEX
         self.simulator.memory = Memory(40, 0xeeeeee01ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadBoolADR(self):
         self.simulator.decoder.next_instruction_index = LOADBOOL_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeeeee01ee)
         self.simulator.process_one_instruction()
-        self.assertEqual(1, self.simulator.registers[3].value)
+        self.assertEqual(1, self.simulator.registers[3])
 
     def testProcessLoadByteRAA(self):
         self.simulator.decoder.next_instruction_index = LOADBYTE_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeee24ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_load()
-        self.assertEqual(0x24, self.simulator.registers[3].value)
+        self.assertEqual(0x24, self.simulator.registers[3])
 
     def testProcessLoadByteADR(self):
         self.simulator.decoder.next_instruction_index = LOADBYTE_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeee24ee)
         self.simulator.process_load()
-        self.assertEqual(0x24, self.simulator.registers[3].value)
+        self.assertEqual(0x24, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadByteRAA(self):
         self.simulator.decoder.next_instruction_index = LOADBYTE_INDEX
         self.simulator.memory = Memory(40, 0xeeeeee24ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_one_instruction()
-        self.assertEqual(0x24, self.simulator.registers[3].value)
+        self.assertEqual(0x24, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadByteADR(self):
         self.simulator.decoder.next_instruction_index = LOADBYTE_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeeeee24ee)
         self.simulator.process_one_instruction()
-        self.assertEqual(0x24, self.simulator.registers[3].value)
+        self.assertEqual(0x24, self.simulator.registers[3])
 
     def testProcessLoadIntRAA(self):
         self.simulator.decoder.next_instruction_index = LOADINT_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(48, 0xee12341234ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_load()
-        self.assertEqual(0x12341234, self.simulator.registers[3].value)
+        self.assertEqual(0x12341234, self.simulator.registers[3])
 
     def testProcessLoadIntADR(self):
         self.simulator.decoder.next_instruction_index = LOADINT_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(48, 0xee12341234ee)
         self.simulator.process_load()
-        self.assertEqual(0x12341234, self.simulator.registers[3].value)
+        self.assertEqual(0x12341234, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadIntRAA(self):
         self.simulator.decoder.next_instruction_index = LOADINT_INDEX
         self.simulator.memory = Memory(48, 0xee12341234ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_one_instruction()
-        self.assertEqual(0x12341234, self.simulator.registers[3].value)
+        self.assertEqual(0x12341234, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadIntADR(self):
         self.simulator.decoder.next_instruction_index = LOADINT_INDEX + 1
         self.simulator.memory = Memory(48, 0xee12341234ee)
         self.simulator.process_one_instruction()
-        self.assertEqual(0x12341234, self.simulator.registers[3].value)
+        self.assertEqual(0x12341234, self.simulator.registers[3])
 
     def testProcessLoadStateRAA(self):
         self.simulator.decoder.next_instruction_index = LOADSTATE_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeee1234ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_load()
-        self.assertEqual(0x1234, self.simulator.registers[3].value)
+        self.assertEqual(0x1234, self.simulator.registers[3])
 
     def testProcessLoadStateADR(self):
         self.simulator.decoder.next_instruction_index = LOADSTATE_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeee1234ee)
         self.simulator.process_load()
-        self.assertEqual(0x1234, self.simulator.registers[3].value)
+        self.assertEqual(0x1234, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadStateRAA(self):
         self.simulator.decoder.next_instruction_index = LOADSTATE_INDEX
         self.simulator.memory = Memory(40, 0xeeee1234ee)
-        self.simulator.registers[1].value = 8  # address
+        self.simulator.registers[1] = 8  # address
         self.simulator.process_one_instruction()
-        self.assertEqual(0x1234, self.simulator.registers[3].value)
+        self.assertEqual(0x1234, self.simulator.registers[3])
 
     def testProcessOneInstructionLoadStateADR(self):
         self.simulator.decoder.next_instruction_index = LOADSTATE_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeee1234ee)
         self.simulator.process_one_instruction()
-        self.assertEqual(0x1234, self.simulator.registers[3].value)
+        self.assertEqual(0x1234, self.simulator.registers[3])
 
     # ----------------
     # STORE OPERATIONS
@@ -972,8 +970,8 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREBOOL_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8     # address
-        self.simulator.registers[3].value = 0x01  # value
+        self.simulator.registers[1] = 8     # address
+        self.simulator.registers[3] = 0x01  # value
         self.simulator.process_store()
         self.assertEqual(0xeeeeee01ee, self.simulator.memory.raw_memory)
 
@@ -981,22 +979,22 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREBOOL_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[3].value = 0x01  # value
+        self.simulator.registers[3] = 0x01  # value
         self.simulator.process_store()
         self.assertEqual(0xeeeeee01ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreBoolRAA(self):
         self.simulator.decoder.next_instruction_index = STOREBOOL_INDEX
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x01  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x01  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeeeee01ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreBoolADR(self):
         self.simulator.decoder.next_instruction_index = STOREBOOL_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[3].value = 0x01  # value
+        self.simulator.registers[3] = 0x01  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeeeee01ee, self.simulator.memory.raw_memory)
 
@@ -1004,8 +1002,8 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREBYTE_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x24  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x24  # value
         self.simulator.process_store()
         self.assertEqual(0xeeeeee24ee, self.simulator.memory.raw_memory)
 
@@ -1013,22 +1011,22 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREBYTE_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[3].value = 0x24  # value
+        self.simulator.registers[3] = 0x24  # value
         self.simulator.process_store()
         self.assertEqual(0xeeeeee24ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreByteRAA(self):
         self.simulator.decoder.next_instruction_index = STOREBYTE_INDEX
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x24  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x24  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeeeee24ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreByteADR(self):
         self.simulator.decoder.next_instruction_index = STOREBYTE_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[3].value = 0x24  # value
+        self.simulator.registers[3] = 0x24  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeeeee24ee, self.simulator.memory.raw_memory)
 
@@ -1036,8 +1034,8 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREINT_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(48, 0xeeeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x12341234  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x12341234  # value
         self.simulator.process_store()
         self.assertEqual(0xee12341234ee, self.simulator.memory.raw_memory)
 
@@ -1045,22 +1043,22 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STOREINT_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(48, 0xeeeeeeeeeeee)
-        self.simulator.registers[3].value = 0x12341234  # value
+        self.simulator.registers[3] = 0x12341234  # value
         self.simulator.process_store()
         self.assertEqual(0xee12341234ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreIntRAA(self):
         self.simulator.decoder.next_instruction_index = STOREINT_INDEX
         self.simulator.memory = Memory(48, 0xeeeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x12341234  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x12341234  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xee12341234ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreIntADR(self):
         self.simulator.decoder.next_instruction_index = STOREINT_INDEX + 1
         self.simulator.memory = Memory(48, 0xeeeeeeeeeeee)
-        self.simulator.registers[3].value = 0x12341234  # value
+        self.simulator.registers[3] = 0x12341234  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xee12341234ee, self.simulator.memory.raw_memory)
 
@@ -1068,8 +1066,8 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STORESTATE_INDEX
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x1234  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x1234  # value
         self.simulator.process_store()
         self.assertEqual(0xeeee1234ee, self.simulator.memory.raw_memory)
 
@@ -1077,22 +1075,22 @@ class TestSimulator(unittest.TestCase):
         self.simulator.decoder.next_instruction_index = STORESTATE_INDEX + 1
         self.simulator.current_instruction = self.simulator.decoder.decode_next()
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x1234  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x1234  # value
         self.simulator.process_store()
         self.assertEqual(0xeeee1234ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreStateRAA(self):
         self.simulator.decoder.next_instruction_index = STORESTATE_INDEX
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[1].value = 8  # address
-        self.simulator.registers[3].value = 0x1234  # value
+        self.simulator.registers[1] = 8  # address
+        self.simulator.registers[3] = 0x1234  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeee1234ee, self.simulator.memory.raw_memory)
 
     def testProcessOneInstructionStoreStateADR(self):
         self.simulator.decoder.next_instruction_index = STORESTATE_INDEX + 1
         self.simulator.memory = Memory(40, 0xeeeeeeeeee)
-        self.simulator.registers[3].value = 0x1234  # value
+        self.simulator.registers[3] = 0x1234  # value
         self.simulator.process_one_instruction()
         self.assertEqual(0xeeee1234ee, self.simulator.memory.raw_memory)
@@ -7,6 +7,8 @@
 # Decoder: Process 32-bits instruction into their corresponding instruction object.
 # Test file!
 
+import copy
+import pickle
 import unittest
 from unittest.mock import patch, mock_open
 
@@ -179,3 +181,26 @@ class TestDecoder(unittest.TestCase):
         # storestate r3 234
         expected_instruction = Instruction(OP_STORE, cfg_mask=STORE_ADR, rd=3, address=234, inst_type=VAL_STATE)
         self.assertEqual(expected_instruction, self.decoder.decode(self.bit_instructions[23]))
+
+    def test_program_pre_decoded(self):
+        self.assertEqual(len(self.bit_instructions), len(self.decoder.program))
+        for bit_instruction, instruction in zip(self.bit_instructions, self.decoder.program):
+            self.assertEqual(self.decoder.decode(bit_instruction), instruction)
+        self.decoder.next_instruction_index = 5
+        self.assertIs(self.decoder.program[5], self.decoder.decode_next())
+
+    def test_instruction_immutable(self):
+        instruction = self.decoder.program[0]
+        with self.assertRaises(AttributeError):
+            instruction.rd = 0
+        self.assertFalse(hasattr(instruction, "__dict__"))
+        self.assertEqual("OP_ADD", instruction.op_str())
+        self.assertEqual("CFG_RR", instruction.cfg_str())
+
+    def test_instruction_copy(self):
+        # storestate r3 234
+        instruction = self.decoder.program[23]
+        self.assertEqual(VAL_STATE, instruction.type)
+        self.assertEqual(instruction, pickle.loads(pickle.dumps(instruction)))
+        self.assertEqual(instruction, copy.copy(instruction))
+        self.assertEqual(VAL_INT, instruction._replace(type=VAL_INT).type)
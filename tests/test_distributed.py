@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Distributed: Exploration over nodes each owning a partition of the visited set, linked over TCP
+# Test file!
+
+import functools
+import multiprocessing
+import pickle
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from sdvs.benchmark import COUNTER_PROGRAM
+from sdvs.coordinator import Coordinator
+from sdvs.distributed import (SEND_CREDITS, DistributedSimulator, FrameReader, decode_batch, decode_setup,
+                              encode_batch, encode_setup, frame, listen, parse_nodes, serve)
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.model import Model
+from tests.test_coordinator import assert_explores_as_simulator, assert_models_explored_as_simulator
+
+
+def serve_slowly(listener):
+    # Node expanding its configurations slower than the others produce them
+    process_config = Coordinator.process_config
+
+    def slow_process_config(self, *args):
+        time.sleep(0.002)
+        return process_config(self, *args)
+    Coordinator.process_config = slow_process_config
+    serve(sessions=1, listener=listener)
+
+
+class TestWire(unittest.TestCase):
+
+    def test_frames(self):
+        data = frame(2, b"abc") + frame(3) + frame(4, b"de")
+        reader = FrameReader()
+        # Split in the middle of the header and of a payload
+        self.assertEqual([], reader.feed(data[:3]))
+        self.assertEqual([(2, b"abc"), (3, b"")], reader.feed(data[3:15]))
+        self.assertEqual([(4, b"de")], reader.feed(data[15:]))
+
+    def test_batch(self):
+        records = [(0x0ABCDE, 1), (1 << 40, 2), (0, 0), (-5, 3), (0xFFFFFF, (1 << 64) - 1)]
+        # Configurations that do not fit in the width come last
+        self.assertEqual([(0x0ABCDE, 1), (0, 0), (0xFFFFFF, (1 << 64) - 1), (1 << 40, 2), (-5, 3)],
+                         decode_batch(encode_batch(records, 3), 3))
+
+    def test_setup(self):
+        programs = [b"\x01\x02\x03\x04", b"", b"\xff" * 8]
+        for engine in [None, FastEngine, functools.partial(FastEngine, optimize=True, guards=False)]:
+            setup = decode_setup(encode_setup(programs, 24, 1, 3, 256, engine))
+            self.assertEqual(programs, setup["programs"])
+            self.assertEqual((24, 1, 3, 256), (setup["cfg_size"], setup["index"], setup["nodes"], setup["batch_size"]))
+            if isinstance(engine, functools.partial):
+                self.assertIs(FastEngine, setup["engine"].func)
+                self.assertEqual({"optimize": True, "guards": False}, setup["engine"].keywords)
+            else:
+                self.assertIs(engine, setup["engine"])
+        # Only the engines of ENGINES are sent, by name
+        with self.assertRaises(ValueError):
+            encode_setup(programs, 24, 1, 3, 256, lambda decoder: None)
+        setup = encode_setup(programs, 24, 1, 3, 256, None)
+        for payload in [setup[:-1], setup.replace(b"interpreter", b"interpreted"),
+                        setup.replace(b'"index": 1', b'"index": 3'), pickle.dumps({"programs": programs}), b""]:
+            with self.assertRaises(ConnectionError):
+                decode_setup(payload)
+
+    def test_parse_nodes(self):
+        self.assertEqual(3, parse_nodes("3"))
+        self.assertEqual([("host1", 7000), ("10.0.0.2", 7571)], parse_nodes("host1:7000,10.0.0.2"))
+
+
+class TestDistributed(unittest.TestCase):
+
+    @staticmethod
+    def run_distributed(nodes, batch_size=256):
+        def run(bin_paths, model, engine):
+            distributed = DistributedSimulator(bin_paths, model.cfg_size, nodes, engine, batch_size=batch_size)
+            exec_time, cfgs = distributed.launch_checking(model.init_cfg, collect=True)
+            return exec_time, cfgs, distributed.statistics()
+        return run
+
+    def test_models(self):
+        assert_models_explored_as_simulator(self, self.run_distributed(2))
+
+    @patch("sdvs.distributed.CREDITS", 1)
+    def test_flow_control(self):
+        # Small batches and a single credit: batches wait in the hub
+        with tempfile.TemporaryDirectory() as directory:
+            statistics = assert_explores_as_simulator(self, self.run_distributed(3, batch_size=4),
+                                                      ModelGenerator(3, 3, 4).generate(), directory)
+        self.assertEqual(3, len(statistics["nodes"]))
+        for node in statistics["nodes"]:
+            self.assertGreater(node["processed"], 0)
+            self.assertGreater(node["batches_in"], 1)
+
+    def test_running_nodes(self):
+        # Nodes already serving, reused by two explorations
+        listeners = [listen("127.0.0.1", 0) for _ in range(2)]
+        addresses = [listener.getsockname() for listener in listeners]
+        processes = [multiprocessing.Process(target=serve, kwargs={"sessions": 2, "listener": listener})
+                     for listener in listeners]
+        for process in processes:
+            process.start()
+        for listener in listeners:
+            listener.close()
+        model = ModelGenerator(2, 3, 3).generate()
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                assert_explores_as_simulator(self, self.run_distributed(addresses), model, directory)
+        for process in processes:
+            process.join(10)
+            self.assertEqual(0, process.exitcode)
+
+    def test_slow_node(self):
+        # The fast nodes wait for send credits instead of piling batches up in the hub
+        listeners = [listen("127.0.0.1", 0) for _ in range(3)]
+        addresses = [listener.getsockname() for listener in listeners]
+        processes = [multiprocessing.Process(target=serve_slowly, args=(listeners[0],))]
+        processes += [multiprocessing.Process(target=serve, kwargs={"sessions": 1, "listener": listener})
+                      for listener in listeners[1:]]
+        for process in processes:
+            process.start()
+        for listener in listeners:
+            listener.close()
+        batch_size = 4
+        model = Model("counters.2", [COUNTER_PROGRAM.format(address=0, limit=30),
+                                     COUNTER_PROGRAM.format(address=8, limit=30)], 16, 0, 31 * 31)
+        with tempfile.TemporaryDirectory() as directory:
+            statistics = assert_explores_as_simulator(self, self.run_distributed(addresses, batch_size), model,
+                                                      directory)
+        for process in processes:
+            process.join(10)
+            self.assertEqual(0, process.exitcode)
+        for node in statistics["nodes"]:
+            self.assertLessEqual(node["max_queued"], (len(addresses) - 1) * SEND_CREDITS * batch_size)
+        for node in statistics["nodes"][1:]:
+            self.assertGreater(node["send_waits"], 0)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Edge list: Labelled transition system of an exploration in a binary edge-list file
+# Test file!
+
+import io
+import os
+import tempfile
+import unittest
+
+from sdvs.benchmark import COUNTER_PROGRAM
+from sdvs.constants import OP_ENDGA
+from sdvs.edge_list import EdgeReader, EdgeWriter
+from sdvs.generator import ModelGenerator
+from sdvs.model import Model
+from sdvs.simulator import Simulator
+
+
+class TestEdgeList(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "edges.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_edges(self):
+        writer = EdgeWriter(self.file_name)
+        writer.start(16)
+        writer.write_edges(0x1, [0x2, 0x3], [(0, 5, 40), (1, 12, 60)])
+        writer.write_edges(0x2, [0x1], [(1, 12, 52)])
+        writer.close()
+
+    def test_edges(self):
+        self.write_edges()
+        reader = EdgeReader(self.file_name)
+        self.assertEqual(16, reader.cfg_size)
+        self.assertEqual([(0x1, 0x2, 0, 5, 40), (0x1, 0x3, 1, 12, 60), (0x2, 0x1, 1, 12, 52)], list(reader.edges()))
+
+    def test_dot(self):
+        self.write_edges()
+        output = io.StringIO()
+        EdgeReader(self.file_name).write_dot(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual("digraph sdvs {", lines[0])
+        self.assertEqual('    "0x1" -> "0x3" [label="c1 @12 60cy"];', lines[2])
+        self.assertEqual(5, len(lines))
+        self.assertRaises(ValueError, EdgeReader(self.file_name).write_dot, io.StringIO(), 2)
+
+    def test_text(self):
+        self.write_edges()
+        output = io.StringIO()
+        EdgeReader(self.file_name).write_text(output)
+        self.assertEqual("2 1 1 12 52", output.getvalue().splitlines()[-1])
+
+    def test_simulator(self):
+        model = ModelGenerator(2, 2, 3).generate()
+        bin_paths = model.write_binaries(self.directory.name)
+        simulator = Simulator(bin_paths, model.cfg_size, edge_writer=EdgeWriter(self.file_name))
+        _, cfgs = simulator.launch_checking(model.init_cfg)
+        edges = list(EdgeReader(self.file_name).edges())
+        self.assertEqual(simulator.successors, len(edges))
+        self.assertEqual(set(cfgs), {source for source, *_ in edges} | {target for _, target, *_ in edges})
+        for source, target, core, pc, cycles in edges:
+            self.assertIn(core, [0, 1])
+            # Guard blocks end with an endga
+            self.assertEqual(OP_ENDGA, simulator.coordinator.cores[core].decoder.program[pc].op_code)
+            self.assertGreater(cycles, 0)
+
+    def test_wide(self):
+        # Configurations overflowing the 16 bits or negative
+        writer = EdgeWriter(self.file_name)
+        writer.start(16)
+        writer.write_edges(0x1, [0x12c00, -1], [(0, 5, 40), (1, 12, 60)])
+        writer.write_edges(0x12c00, [0x2c01], [(1, 12, 52)])
+        writer.close()
+        reader = EdgeReader(self.file_name)
+        self.assertEqual([(0x1, 0x12c00, 0, 5, 40), (0x1, -1, 1, 12, 60), (0x12c00, 0x2c01, 1, 12, 52)],
+                         list(reader.edges()))
+        self.assertRaises(ValueError, reader.write_text, io.StringIO(), 2)
+
+    def test_simulator_overflow(self):
+        programs = ["mov r3 300\nstorebyte r3 8\nendga\nnop\n", COUNTER_PROGRAM.format(address=0, limit=2)]
+        bin_paths = Model("overflow.2", programs, 16, 0, 8).write_binaries(self.directory.name)
+        simulator = Simulator(bin_paths, 16, edge_writer=EdgeWriter(self.file_name))
+        _, cfgs = simulator.launch_checking(0)
+        edges = list(EdgeReader(self.file_name).edges())
+        self.assertEqual(simulator.successors, len(edges))
+        self.assertIn((0x12c00, 0x2c01), [(source, target) for source, target, *_ in edges])
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Engine: Fast execution of a decoded program with specialised handlers and superinstructions
+# Test file!
+
+import functools
+import tempfile
+import unittest
+
+from sdvs.asm import ASM
+from sdvs.benchmark import CORPUS
+from sdvs.core import Core
+from sdvs.decoder import Decoder
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.memory import Memory
+from sdvs.simulator import Simulator
+from tests.test_core import mock_file
+
+INIT_MEMORY = 0x0123456789ABCDEF
+
+
+def run_program(lines, engine):
+    """
+    Run a program on one core from fixed registers and memory.
+    :param engine: engine factory, None for the interpreter
+    :return: core after the execution
+    """
+    asm = ASM()
+    decoder = Decoder([asm.process_line(line) for line in lines])
+    core = Core(decoder, 0)
+    if engine is not None:
+        core.engine = engine(decoder)
+    core.registers[1] = 5
+    core.registers[2] = 3
+    core.reset_execution()
+    core.setup_cfg_memory(Memory(64, INIT_MEMORY))
+    core.process_instructions()
+    return core
+
+
+class TestEngine(unittest.TestCase):
+
+    def assertSameExecution(self, lines):
+        interpreted = run_program(lines, None)
+        compiled = run_program(lines, FastEngine)
+        self.assertEqual(interpreted.registers, compiled.registers, lines)
+        self.assertEqual(interpreted.memory.raw_memory, compiled.memory.raw_memory, lines)
+        self.assertEqual(interpreted.new_configs, compiled.new_configs, lines)
+        self.assertEqual(interpreted.executed_cycles, compiled.executed_cycles, lines)
+
+    def test_instructions(self):
+        for line in mock_file.splitlines():
+            if line and not line.startswith("jmp"):
+                self.assertSameExecution([line, "endga", "nop"])
+
+    def test_jmp(self):
+        # Taken when the register is null
+        self.assertSameExecution(["jmp r0 2", "mov r3 1", "endga", "nop"])
+        self.assertSameExecution(["jmp r1 2", "mov r3 1", "endga", "nop"])
+
+    def test_fusion(self):
+        program = ["loadbyte r1 0", "lt r2 r1 3", "jmp r2 5",
+                   "loadbyte r1 8", "lt r2 r1 3", "jmp r2 7",
+                   "add r1 r1 1", "storebyte r1 8", "endga", "nop"]
+        self.assertSameExecution(program)
+        asm = ASM()
+        engine = FastEngine(Decoder([asm.process_line(line) for line in program]))
+        self.assertEqual({0: ("load+cmp+jmp", 3), 3: ("load+cmp+jmp", 3)}, engine.fusions)
+        # Cost of the superinstruction: the three instructions it replaces
+        self.assertEqual(3 * 4 + 2 + 3 + 2, engine.costs[0])
+        # Middle instructions stay available as jump targets
+        self.assertEqual(2, engine.handlers[1](None, [0, 5, 0]))
+        self.assertEqual(5, engine.handlers[2](None, [0, 5, 0]))
+        unfused = FastEngine(engine.decoder, fusion=False)
+        self.assertEqual({}, unfused.fusions)
+
+    def test_fusion_report(self):
+        model = ModelGenerator(2, 3, 3).generate()
+        with tempfile.TemporaryDirectory() as directory:
+            bin_paths = model.write_binaries(directory)
+            simulator = Simulator(bin_paths, model.cfg_size, engine=functools.partial(FastEngine, report=True))
+            simulator.launch_checking(model.init_cfg)
+            silent = Simulator(bin_paths, model.cfg_size, engine=FastEngine)
+            silent.launch_checking(model.init_cfg)
+        report = simulator.coordinator.cores[0].engine.fusion_report()
+        self.assertIn("load+cmp+jmp", [row["pattern"] for row in report])
+        self.assertGreater(sum(row["executions"] for row in report), 0)
+        for row in report:
+            self.assertGreater(row["sites"], 0)
+            self.assertEqual(row["executions"] * (row["length"] - 1), row["dispatches_saved"])
+        # Superinstructions only count their executions when a report is asked for
+        silent_report = silent.coordinator.cores[0].engine.fusion_report()
+        self.assertEqual([0] * len(report), [row["executions"] for row in silent_report])
+
+    def test_models(self):
+        models = list(CORPUS) + [ModelGenerator(3, 3, 4, guard_density=0.5).generate()]
+        with tempfile.TemporaryDirectory() as directory:
+            for model in models:
+                bin_paths = model.write_binaries(directory)
+                results = []
+                for engine in [None, FastEngine]:
+                    simulator = Simulator(bin_paths, model.cfg_size, engine=engine)
+                    exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+                    results.append((exec_time, sorted(cfgs), simulator.successors))
+                self.assertEqual(results[0], results[1], model.name)
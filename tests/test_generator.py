@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Generator: Synthetic multi-core models with a known number of reachable configurations
+# Test file!
+
+import os
+import tempfile
+import unittest
+
+from sdvs.generator import ModelGenerator
+from sdvs.simulator import Simulator
+
+
+class TestModelGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_model(self, generator):
+        model = generator.generate()
+        bin_paths = model.write_binaries(self.directory.name)
+        simulator = Simulator(bin_paths, model.cfg_size)
+        exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+        self.assertEqual(model.expected_states, len(cfgs))
+        return model
+
+    def test_single_core(self):
+        model = self.check_model(ModelGenerator(1, 2, 5))
+        self.assertEqual(25, model.expected_states)
+        self.assertEqual(16, model.cfg_size)
+
+    def test_more_variables_than_cores(self):
+        self.check_model(ModelGenerator(2, 3, 4, 0.5, seed=3))
+
+    def test_more_cores_than_variables(self):
+        model = self.check_model(ModelGenerator(3, 2, 3, 1.0))
+        self.assertEqual("nop\n", model.programs[2])
+
+    def test_guard_density(self):
+        sparse = ModelGenerator(2, 4, 3, 0.0).generate()
+        dense = ModelGenerator(2, 4, 3, 1.0).generate()
+        self.assertNotIn("r3", sparse.programs[0])
+        # Each of the 4 guard blocks of a core reads the 3 other counters
+        self.assertEqual(4 * 3, dense.programs[0].count("lt r4 r3 3"))
+
+    def test_large_range(self):
+        model = self.check_model(ModelGenerator(1, 1, 300))
+        self.assertIn("loadstate", model.programs[0])
+        self.assertEqual(16, model.cfg_size)
+
+    def test_invalid_parameters(self):
+        self.assertRaises(ValueError, ModelGenerator, 0, 1)
+        self.assertRaises(ValueError, ModelGenerator, 1, 1, 1)
+        self.assertRaises(ValueError, ModelGenerator, 1, 1, 4, 1.5)
+
+    def test_write_files(self):
+        model = ModelGenerator(2, 2, 3).generate()
+        asm_paths = model.write_asm(self.directory.name)
+        model.write_cfg(os.path.join(self.directory.name, model.name + ".cfg"))
+        with open(asm_paths[1]) as file:
+            self.assertEqual(model.programs[1], file.read())
+        with open(os.path.join(self.directory.name, model.name + ".cfg")) as file:
+            self.assertEqual("0000\n", file.read())
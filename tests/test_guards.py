@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Guards: Guard blocks of a decoded program and the cache of their results
+# Test file!
+
+import functools
+import tempfile
+import unittest
+
+from sdvs.asm import ASM
+from sdvs.benchmark import CORPUS
+from sdvs.core import Core
+from sdvs.decoder import Decoder
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.guards import ANALYSIS_NAME, GuardAnalysis, analyse_guards
+from sdvs.memory import Memory
+from sdvs.simulator import Simulator
+from tests.test_engine import run_program
+
+# Two guarded counters on the bytes at 0 and 8
+COUNTERS = ["loadbyte r1 0", "lt r2 r1 3", "jmp r2 6", "add r1 r1 1", "storebyte r1 0", "endga",
+            "loadbyte r1 8", "lt r2 r1 3", "jmp r2 12", "add r1 r1 1", "storebyte r1 8", "endga",
+            "nop"]
+
+
+def decode(lines):
+    asm = ASM()
+    return Decoder([asm.process_line(line) for line in lines])
+
+
+class TestGuards(unittest.TestCase):
+
+    def test_blocks(self):
+        analysis = GuardAnalysis(decode(COUNTERS).program)
+        self.assertEqual([0, 6], sorted(analysis.blocks))
+        block = analysis.blocks[6]
+        self.assertEqual((7, 8, 12), (block.jump - 1, block.jump, block.target))
+        self.assertEqual(0xFF << 8, block.mask)
+        self.assertEqual([1, 2], block.registers)
+        # Enabled: next pc after the jmp, r1 and r2 as left by the guard
+        self.assertEqual((9, 2, 1), block.evaluate(0x0200))
+        self.assertEqual((12, 3, 0), block.evaluate(0x0300))
+        self.assertEqual([0, 6], [block.start for block in analysis.chain])
+        self.assertEqual(12, analysis.end)
+
+    def test_not_a_guard(self):
+        # Reads r3, set before the block
+        self.assertEqual({}, GuardAnalysis(decode(["lt r2 r3 3", "jmp r2 2", "endga", "nop"]).program).blocks)
+        # Stores before the jmp
+        analysis = GuardAnalysis(decode(["storebyte r1 0", "jmp r1 2", "endga", "nop"]).program)
+        self.assertEqual({}, analysis.blocks)
+        self.assertIsNone(analysis.chain)
+
+    def test_analysis_reused(self):
+        decoder = decode(COUNTERS)
+        analysis = analyse_guards(decoder)
+        self.assertIs(analysis, decoder.analyses[ANALYSIS_NAME])
+        self.assertIs(analysis, analyse_guards(decoder))
+
+    def test_engine(self):
+        engine = functools.partial(FastEngine, guards=True)
+        programs = [COUNTERS, ["mov r3 1", "loadbyte r1 0", "lt r2 r1 3", "jmp r2 6", "storebyte r3 0", "endga",
+                               "nop"]]
+        for lines in programs:
+            interpreted = run_program(lines, None)
+            cached = run_program(lines, engine)
+            self.assertEqual(interpreted.registers, cached.registers, lines)
+            self.assertEqual(interpreted.new_configs, cached.new_configs, lines)
+            self.assertEqual(interpreted.executed_cycles, cached.executed_cycles, lines)
+
+    def test_cache(self):
+        decoder = decode(COUNTERS)
+        engine = FastEngine(decoder, guards=True)
+        self.assertIsNotNone(engine.chain_cache)
+        core = Core(decoder, 0)
+        # Both counters at 3 then bits read by no guard changed
+        for memory in [0x0303, 0xFF0303, 0x0303]:
+            core.reset_execution()
+            core.setup_cfg_memory(Memory(64, memory))
+            engine.run(core)
+            self.assertEqual([], core.new_configs)
+        self.assertEqual(1, engine.chain_cache.evaluations)
+        self.assertEqual({"guard": "chain", "bits": 16, "entries": 1, "evaluations": 1}, engine.guard_report()[-1])
+
+    def test_models(self):
+        models = list(CORPUS) + [ModelGenerator(3, 3, 4, guard_density=0.5).generate()]
+        engines = [functools.partial(FastEngine, guards=True), functools.partial(FastEngine, optimize=True, guards=True)]
+        with tempfile.TemporaryDirectory() as directory:
+            for model in models:
+                bin_paths = model.write_binaries(directory)
+                results = []
+                for factory in [None] + engines:
+                    simulator = Simulator(bin_paths, model.cfg_size, engine=factory)
+                    exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+                    results.append((exec_time, sorted(cfgs), simulator.successors))
+                self.assertEqual(results[0], results[1], model.name)
+                self.assertEqual(results[0], results[2], model.name)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Hashing: Zobrist hashing of configurations, updated incrementally on stores
+# Test file!
+
+import tempfile
+import unittest
+
+from sdvs.benchmark import COUNTER_PROGRAM
+from sdvs.checker import Checker, HashedConfigSet
+from sdvs.constants import *
+from sdvs.engine import FastEngine
+from sdvs.hashing import ZobristHasher
+from sdvs.memory import Memory
+from sdvs.model import Model
+from sdvs.simulator import Simulator
+
+
+class TestZobristHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = ZobristHasher()
+
+    def test_hash_independent_of_leading_zeros(self):
+        self.assertEqual(0, self.hasher.hash_config(0))
+        self.assertEqual(self.hasher.hash_config(0x12),
+                         self.hasher.hash_chunks(0x12, 0, 16))
+
+    def test_hash_deterministic_per_seed(self):
+        self.assertEqual(ZobristHasher(3).hash_config(0xdeadbeef),
+                         ZobristHasher(3).hash_config(0xdeadbeef))
+        self.assertNotEqual(ZobristHasher(3).hash_config(0xdeadbeef),
+                            ZobristHasher(4).hash_config(0xdeadbeef))
+
+    def test_update_matches_full_hash(self):
+        old_memory = 0xeeee00000000eeeeeeee
+        new_memory = 0xeeee000004d2eeeeeeee
+        updated = self.hasher.update(self.hasher.hash_config(old_memory), old_memory, new_memory, 32, SIZE_INT)
+        self.assertEqual(self.hasher.hash_config(new_memory), updated)
+
+    def test_memory_maintains_hash(self):
+        memory = Memory(80, 0xeeee00000000eeeeeeee, self.hasher)
+        memory.set_int_at_address(1234, 32)
+        memory.set_bool_at_address(1, 0)
+        memory.set_state_at_address(5, 64)
+        self.assertEqual(self.hasher.hash_config(memory.raw_memory), memory.hash)
+
+    def test_memory_unaligned_store(self):
+        memory = Memory(24, 0xeeeeee, self.hasher)
+        memory.set_bool_at_address(1, 4)
+        self.assertEqual(self.hasher.hash_config(memory.raw_memory), memory.hash)
+
+    def test_memory_overflowing_store(self):
+        memory = Memory(24, 0xeeeeee, self.hasher)
+        memory.set_byte_at_address(0x1ff, 8)
+        self.assertEqual(self.hasher.hash_config(memory.raw_memory), memory.hash)
+
+    def test_memory_store_below_overflow(self):
+        # The overflowing store leaves bits above the configuration, cleared by the next store
+        memory = Memory(16, 0, self.hasher)
+        memory.set_byte_at_address(300, 8)
+        self.assertEqual(0x12c00, memory.raw_memory)
+        memory.set_byte_at_address(1, 0)
+        self.assertEqual(0x2c01, memory.raw_memory)
+        self.assertEqual(self.hasher.hash_config(memory.raw_memory), memory.hash)
+
+    def test_overflowing_model(self):
+        # 0x2c01 is reached from 0x2c00 and from 0x12c00 (the overflow cleared by the increment)
+        programs = ["mov r3 300\nstorebyte r3 8\nendga\nnop\n", "mov r3 44\nstorebyte r3 8\nendga\nnop\n",
+                    COUNTER_PROGRAM.format(address=0, limit=2)]
+        with tempfile.TemporaryDirectory() as directory:
+            bin_paths = Model("overflow.3", programs, 16, 0, 9).write_binaries(directory)
+            for engine in (None, FastEngine):
+                _, known = Simulator(bin_paths, 16, engine=engine).launch_checking(0)
+                self.assertEqual([0x0, 0x1, 0x2, 0x2c00, 0x2c01, 0x2c02, 0x12c00, 0x12c01, 0x12c02], sorted(known))
+
+    def test_memory_without_hasher(self):
+        memory = Memory(24, 0xeeeeee)
+        memory.set_bool_at_address(1, 8)
+        self.assertIsNone(memory.hash)
+
+
+class TestHashedConfigSet(unittest.TestCase):
+
+    def test_add_and_contains(self):
+        hasher = ZobristHasher()
+        known = HashedConfigSet(hasher)
+        self.assertTrue(known.add(0x1234, hasher.hash_config(0x1234)))
+        self.assertFalse(known.add(0x1234, hasher.hash_config(0x1234)))
+        self.assertIn(0x1234, known)
+        self.assertNotIn(0x1235, known)
+        self.assertEqual(1, len(known))
+
+    def test_collisions(self):
+        known = HashedConfigSet(ZobristHasher())
+        self.assertTrue(known.add(1, 42))
+        self.assertTrue(known.add(2, 42))
+        self.assertFalse(known.add(2, 42))
+        self.assertEqual(2, len(known))
+        self.assertEqual({1, 2}, set(known))
+
+    def test_checker_frontier(self):
+        checker = Checker()
+        checker.check_config(0x10)
+        checker.check_config(0x10)
+        checker.check_config(0x20)
+        self.assertEqual(2, len(checker.frontier))
+        config, config_hash = checker.next_config()
+        self.assertEqual(0x20, config)
+        self.assertEqual(checker.hasher.hash_config(0x20), config_hash)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Metrics: Periodic exploration statistics on stderr and in a JSON-lines file
+# Test file!
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from sdvs.metrics import MetricsReporter, current_rss, peak_rss
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.directory.name, "metrics.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_rss(self):
+        self.assertGreater(current_rss(), 0)
+        self.assertGreater(peak_rss(), 0)
+
+    def test_poll_respects_interval(self):
+        stream = io.StringIO()
+        reporter = MetricsReporter(3600, stream)
+        reporter.start()
+        reporter.poll(256, 10, 300, 512, 10000)
+        self.assertEqual("", stream.getvalue())
+
+    def test_report(self):
+        stream = io.StringIO()
+        reporter = MetricsReporter(0, stream, self.output_file)
+        reporter.start()
+        reporter.poll(256, 10, 300, 512, 10000)
+        reporter.report(512, 0, 600, 1024, 20000, final=True)
+        reporter.close()
+        self.assertEqual(2, len(stream.getvalue().splitlines()))
+        with open(self.output_file) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(2, len(records))
+        self.assertEqual(256, records[0]["states"])
+        self.assertEqual(2.0, records[0]["successors_per_state"])
+        self.assertEqual(39.1, records[1]["cycles_per_state"])
+        self.assertTrue(records[1]["final"])
+        self.assertFalse(records[0]["final"])
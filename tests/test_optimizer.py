@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Optimizer: Peephole optimisation of a decoded program for the execution engines
+# Test file!
+
+import functools
+import tempfile
+import unittest
+
+from sdvs.asm import ASM
+from sdvs.benchmark import CORPUS
+from sdvs.constants import *
+from sdvs.decoder import Decoder
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.optimizer import ANALYSIS_NAME, Optimizer, is_nop_move, optimize_decoder
+from sdvs.program_cache import ProgramCache
+from sdvs.simulator import Simulator
+from tests.test_engine import run_program
+
+
+def decode(lines):
+    asm = ASM()
+    return Decoder([asm.process_line(line) for line in lines])
+
+
+def optimize(lines):
+    return Optimizer(decode(lines).program).optimize()
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def test_fold_constants(self):
+        optimized = optimize(["add r1 2 3", "lt r2 4 1", "div r3 4 0", "endga", "nop"])
+        self.assertEqual([0, 1], optimized.folded)
+        self.assertEqual((OP_LOAD, LOAD_IMM, 1, 5), optimized.program[0][:3] + (optimized.program[0].imma,))
+        self.assertEqual(0, optimized.program[1].imma)
+        # A division by zero still raises at run time
+        self.assertEqual(OP_DIV, optimized.program[2].op_code)
+
+    def test_remove_dead_writes(self):
+        optimized = optimize(["mov r1 4", "mov r1 5", "storebyte r1 0", "endga", "nop"])
+        self.assertEqual([0], optimized.removed)
+        self.assertTrue(is_nop_move(optimized.program[0]))
+        # Registers persist across configurations: writes reaching the nop are kept
+        self.assertEqual([], optimize(["mov r1 4", "endga", "nop"]).removed)
+        # Writes read on one of the paths of a jmp are kept
+        self.assertEqual([], optimize(["mov r1 4", "jmp r2 3", "mov r1 5", "storebyte r1 0", "nop"]).removed)
+
+    def test_keep_raising_writes(self):
+        optimized = optimize(["div r1 r2 r3", "loadbyte r1 r2", "mov r1 5", "storebyte r1 0", "nop"])
+        self.assertEqual([], optimized.removed)
+
+    def test_thread_jumps(self):
+        optimized = optimize(["jmp r1 2", "endga", "jmp r1 4", "endga", "jmp r1 6", "endga", "nop"])
+        self.assertEqual({0: [2, 4], 2: [4]}, optimized.threads)
+        self.assertEqual(6, optimized.program[0].address)
+        # Jumps on another register are not threaded
+        self.assertEqual({}, optimize(["jmp r1 2", "endga", "jmp r2 4", "endga", "nop"]).threads)
+
+    def test_analysis_reused(self):
+        decoder = decode(["add r1 2 3", "endga", "nop"])
+        optimized = optimize_decoder(decoder)
+        self.assertIs(optimized, decoder.analyses[ANALYSIS_NAME])
+        self.assertIs(optimized, optimize_decoder(decoder))
+
+    def test_engine_cycles(self):
+        programs = [["add r1 2 3", "mov r2 4", "mov r2 r1", "storebyte r2 0", "endga", "nop"],
+                    ["jmp r0 2", "endga", "jmp r0 4", "endga", "jmp r0 6", "endga", "endga", "nop"],
+                    ["jmp r1 2", "endga", "jmp r1 4", "endga", "nop"]]
+        for lines in programs:
+            for fusion in [True, False]:
+                interpreted = run_program(lines, None)
+                optimized = run_program(lines, functools.partial(FastEngine, fusion=fusion, optimize=True))
+                self.assertEqual(interpreted.registers, optimized.registers, lines)
+                self.assertEqual(interpreted.new_configs, optimized.new_configs, lines)
+                self.assertEqual(interpreted.executed_cycles, optimized.executed_cycles, lines)
+
+    def test_models(self):
+        models = list(CORPUS) + [ModelGenerator(3, 3, 4, guard_density=0.5).generate()]
+        engine = functools.partial(FastEngine, optimize=True)
+        with tempfile.TemporaryDirectory() as directory:
+            for model in models:
+                bin_paths = model.write_binaries(directory)
+                results = []
+                for factory in [None, engine]:
+                    simulator = Simulator(bin_paths, model.cfg_size, engine=factory)
+                    exec_time, cfgs = simulator.launch_checking(model.init_cfg)
+                    results.append((exec_time, sorted(cfgs), simulator.successors))
+                self.assertEqual(results[0], results[1], model.name)
+
+    def test_program_cache(self):
+        model = ModelGenerator(2, 3, 3).generate()
+        engine = functools.partial(FastEngine, optimize=True)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ProgramCache(directory)
+            bin_paths = model.write_binaries(directory)
+            Simulator(bin_paths, model.cfg_size, program_cache=cache, engine=engine)
+            # The optimised program is stored with the decoded one
+            self.assertIn(ANALYSIS_NAME, cache.load_decoder(bin_paths[0]).analyses)
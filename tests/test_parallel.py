@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Parallel: Exploration with the expansions spread over worker processes
+# Test file!
+
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sdvs.generator import ModelGenerator
+from sdvs.parallel import ParallelSimulator
+from sdvs.transport import BatchBuffer
+from tests.test_coordinator import assert_explores_as_simulator, assert_models_explored_as_simulator
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "Shared memory buffers require Python 3.8")
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = BatchBuffer(20, 2, 4)
+
+    def tearDown(self):
+        self.buffer.unlink()
+
+    def test_write_read(self):
+        self.assertEqual(3, self.buffer.width)
+        records = [(0x0ABCDE, 1), (0, 0), (0xFFFFFF, (1 << 64) - 1)]
+        self.assertEqual((3, []), self.buffer.write(1, records))
+        self.assertEqual(records, self.buffer.read(1, 3))
+
+    def test_extra(self):
+        # Wider than the configuration or negative
+        records = [(1 << 24, 1), (5, 2), (-1, 3)]
+        self.assertEqual((1, [(1 << 24, 1), (-1, 3)]), self.buffer.write(0, records))
+        self.assertEqual([(5, 2)], self.buffer.read(0, 1))
+
+    def test_attach(self):
+        attached = pickle.loads(pickle.dumps(self.buffer))
+        self.buffer.write(0, [(42, 7)])
+        self.assertEqual([(42, 7)], attached.read(0, 1))
+        attached.close()
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "Shared memory buffers require Python 3.8")
+class TestParallel(unittest.TestCase):
+
+    @staticmethod
+    def run_parallel(workers):
+        def run(bin_paths, model, engine):
+            parallel = ParallelSimulator(bin_paths, model.cfg_size, workers, engine)
+            exec_time, cfgs = parallel.launch_checking(model.init_cfg)
+            return exec_time, cfgs, parallel.statistics()
+        return run
+
+    def test_models(self):
+        assert_models_explored_as_simulator(self, self.run_parallel(2))
+
+    @patch("sdvs.parallel.OUTPUT_CAPACITY", 2)
+    def test_full_outputs(self):
+        # Workers wait for the output slots to be freed
+        with tempfile.TemporaryDirectory() as directory:
+            assert_explores_as_simulator(self, self.run_parallel(3), ModelGenerator(3, 3, 4).generate(), directory)
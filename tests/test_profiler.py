@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Profiler: Execution counts, simulated cycles and host time per opcode, configuration and PC
+# Test file!
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from sdvs.asm import ASM
+from sdvs.constants import *
+from sdvs.profiler import Profiler
+from sdvs.simulator import Simulator
+
+# Two cores, each incrementing its own byte up to 3
+counter_program = """
+loadbyte r1 {address}
+lt r2 r1 3
+jmp r2 6
+add r1 r1 1
+storebyte r1 {address}
+endga
+nop
+"""
+
+
+def write_binaries(directory, programs):
+    asm = ASM()
+    bin_paths = []
+    for i, program in enumerate(programs):
+        lines = [line.strip() for line in program.splitlines() if line.strip()]
+        path = os.path.join(directory, "a.out.{}".format(i))
+        with open(path, "wb") as file:
+            for line in lines:
+                file.write(asm.process_line(line).to_bytes(4, "little"))
+        bin_paths.append(path)
+    return bin_paths
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        programs = [counter_program.format(address=0), counter_program.format(address=8)]
+        self.bin_paths = write_binaries(self.directory.name, programs)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_profiled(self, output_file=None):
+        profiler = Profiler(output_file)
+        simulator = Simulator(self.bin_paths, 16, profiler)
+        exec_time, cfgs = simulator.launch_checking(0)
+        return simulator, profiler, cfgs
+
+    def test_counts_and_cycles(self):
+        simulator, profiler, cfgs = self.run_profiled()
+        self.assertEqual(16, len(cfgs))
+        cores = simulator.coordinator.cores
+        # Every core ran once per configuration and stopped on the trailing NOP
+        self.assertEqual(16 * len(cores), profiler.opcodes[OP_NOP][0])
+        total_cycles = sum(entry[1] for entry in profiler.opcodes.values())
+        reset_cycles = 2 * 16 * len(cores)
+        self.assertEqual(sum(core.executed_cycles for core in cores), total_cycles + reset_cycles)
+        self.assertEqual(profiler.opcodes[OP_LOAD][0],
+                         sum(entry[0] for (op_code, cfg_mask), entry in profiler.cfg_masks.items()
+                             if op_code == OP_LOAD))
+        self.assertEqual(16, profiler.pcs[(1, 0, OP_LOAD)][0])
+
+    def test_disabled_by_default(self):
+        simulator = Simulator(self.bin_paths, 16)
+        for core in simulator.coordinator.cores:
+            self.assertIsNone(core.profiler)
+
+    def test_dump_json(self):
+        output_file = os.path.join(self.directory.name, "profile.json")
+        self.run_profiled(output_file)
+        with open(output_file) as file:
+            rows = json.load(file)
+        self.assertEqual({"opcode", "cfg_mask", "pc"}, set(row["scope"] for row in rows))
+        self.assertIn("OP_JMP", [row["op"] for row in rows])
+
+    def test_dump_csv(self):
+        output_file = os.path.join(self.directory.name, "profile.csv")
+        self.run_profiled(output_file)
+        with open(output_file) as file:
+            rows = list(csv.DictReader(file))
+        pc_rows = [row for row in rows if row["scope"] == "pc"]
+        self.assertEqual(2 * 7, len(pc_rows))
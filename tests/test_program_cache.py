@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Program cache: Pre-decoded programs stored on disk and keyed by the content of the binaries
+# Test file!
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from sdvs.binary_reader import BinaryReader
+from sdvs.decoder import Decoder
+from sdvs.generator import ModelGenerator
+from sdvs.program_cache import ProgramCache, CACHE_DIR_NAME
+from sdvs.simulator import Simulator
+
+
+class TestProgramCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model = ModelGenerator(2, 2, 3).generate()
+        self.bin_paths = self.model.write_binaries(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_miss_then_hit(self):
+        cache = ProgramCache()
+        decoder = cache.load_decoder(self.bin_paths[0])
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertTrue(os.path.isdir(os.path.join(self.directory.name, CACHE_DIR_NAME)))
+        cached_decoder = cache.load_decoder(self.bin_paths[0])
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(decoder.program, cached_decoder.program)
+        self.assertEqual(list(decoder.bit_instructions), list(cached_decoder.bit_instructions))
+
+    def test_binary_change_invalidates(self):
+        cache = ProgramCache()
+        cache.load_decoder(self.bin_paths[0])
+        BinaryReader.write_instructions(self.bin_paths[0], [0x00000000])
+        decoder = cache.load_decoder(self.bin_paths[0])
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+        self.assertEqual(2, len(decoder.program))
+
+    def test_format_version_invalidates(self):
+        cache = ProgramCache(os.path.join(self.directory.name, "cache"))
+        cache.load_decoder(self.bin_paths[0])
+        entry_path = os.path.join(self.directory.name, "cache", os.listdir(cache.directory)[0])
+        with open(entry_path, "rb") as file:
+            entry = pickle.load(file)
+        entry["version"] = -1
+        with open(entry_path, "wb") as file:
+            pickle.dump(entry, file)
+        cache.load_decoder(self.bin_paths[0])
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+
+    def test_corrupt_entry(self):
+        cache = ProgramCache(os.path.join(self.directory.name, "cache"))
+        cache.load_decoder(self.bin_paths[0])
+        entry_path = os.path.join(self.directory.name, "cache", os.listdir(cache.directory)[0])
+        with open(entry_path, "rb") as file:
+            data = file.read()
+        # Truncated, invalid literal (ValueError) and incomplete entry
+        for content in [data[:len(data) // 2], b"I1x\n.", pickle.dumps({"version": 2})]:
+            with open(entry_path, "wb") as file:
+                file.write(content)
+            decoder = cache.load_decoder(self.bin_paths[0])
+            self.assertEqual(len(Decoder(BinaryReader.read_instructions(self.bin_paths[0])).program),
+                             len(decoder.program))
+        self.assertEqual((0, 4), (cache.hits, cache.misses))
+
+    def test_analyses_persisted(self):
+        cache = ProgramCache()
+        decoder = cache.load_decoder(self.bin_paths[1])
+        decoder.analyses["answer"] = 42
+        cache.update(self.bin_paths[1], decoder)
+        self.assertEqual({"answer": 42}, cache.load_decoder(self.bin_paths[1]).analyses)
+
+    def test_simulator_with_cache(self):
+        cache = ProgramCache()
+        for _ in range(2):
+            simulator = Simulator(self.bin_paths, self.model.cfg_size, program_cache=cache)
+            exec_time, cfgs = simulator.launch_checking(self.model.init_cfg)
+            self.assertEqual(self.model.expected_states, len(cfgs))
+        self.assertEqual((2, 2), (cache.hits, cache.misses))
+
+    def test_decoder_from_program(self):
+        decoder = Decoder([0x00000000])
+        self.assertEqual(decoder.program, Decoder([0x00000000], decoder.program).program)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# State file: Reachable configurations streamed to a binary file of flagged records
+# Test file!
+
+import os
+import tempfile
+import unittest
+
+from sdvs.benchmark import COUNTER_PROGRAM
+from sdvs.generator import ModelGenerator
+from sdvs.model import Model
+from sdvs.simulator import Simulator
+from sdvs.state_file import HEADER, StateReader, StateWriter
+
+
+class TestStateFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "states.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_states(self):
+        writer = StateWriter(self.file_name)
+        writer.start(12)
+        for config in [0x0, 0xABC, 0x123]:
+            writer.write_state(config)
+        writer.close()
+        # Header then a flag byte and 2 bytes per configuration
+        self.assertEqual(HEADER.size + 3 * 3, os.path.getsize(self.file_name))
+        reader = StateReader(self.file_name)
+        self.assertEqual(12, reader.cfg_size)
+        self.assertFalse(reader.transitions)
+        self.assertEqual([0x0, 0xABC, 0x123], list(reader.states()))
+        self.assertRaises(ValueError, lambda: list(reader.edges()))
+
+    def test_transitions(self):
+        writer = StateWriter(self.file_name, transitions=True)
+        writer.start(16)
+        writer.write_transition(0x1, 0x1, True)
+        writer.write_transition(0x1, 0x2, True)
+        writer.write_transition(0x2, 0x1, False)
+        writer.close()
+        reader = StateReader(self.file_name)
+        self.assertEqual([(True, 0x1, 0x1), (True, 0x1, 0x2), (False, 0x2, 0x1)], list(reader.edges()))
+        self.assertEqual([0x1, 0x2], list(reader.states()))
+
+    def test_wide(self):
+        # Stores overflowing their field and negative values do not fit in the width
+        writer = StateWriter(self.file_name)
+        writer.start(12)
+        for config in [0xABC, 0x12ABC, -5, 0]:
+            writer.write_state(config)
+        writer.close()
+        self.assertEqual([0xABC, 0x12ABC, -5, 0], list(StateReader(self.file_name).states()))
+        writer = StateWriter(self.file_name, transitions=True)
+        writer.start(16)
+        writer.write_transition(0x1, 1 << 40, True)
+        writer.write_transition(1 << 40, -1, False)
+        writer.close()
+        self.assertEqual([(True, 0x1, 1 << 40), (False, 1 << 40, -1)], list(StateReader(self.file_name).edges()))
+
+    def test_simulator_overflow(self):
+        # 0x12c00 and its successors have a bit above the 16 bits of the configuration
+        programs = ["mov r3 300\nstorebyte r3 8\nendga\nnop\n", COUNTER_PROGRAM.format(address=0, limit=2)]
+        bin_paths = Model("overflow.2", programs, 16, 0, 8).write_binaries(self.directory.name)
+        for transitions in (False, True):
+            simulator = Simulator(bin_paths, 16, state_writer=StateWriter(self.file_name, transitions))
+            _, cfgs = simulator.launch_checking(0)
+            self.assertIn(0x12c00, cfgs)
+            self.assertEqual(sorted(cfgs), sorted(StateReader(self.file_name).states()))
+
+    def test_invalid(self):
+        with open(self.file_name, "wb") as file:
+            file.write(b"\x00" * HEADER.size)
+        self.assertRaises(ValueError, StateReader, self.file_name)
+
+    def test_simulator(self):
+        model = ModelGenerator(2, 2, 3).generate()
+        bin_paths = model.write_binaries(self.directory.name)
+        simulator = Simulator(bin_paths, model.cfg_size, state_writer=StateWriter(self.file_name))
+        _, cfgs = simulator.launch_checking(model.init_cfg)
+        states = list(StateReader(self.file_name).states())
+        self.assertEqual(model.init_cfg, states[0])
+        self.assertEqual(len(cfgs), len(states))
+        self.assertEqual(sorted(cfgs), sorted(states))
+
+    def test_simulator_transitions(self):
+        model = ModelGenerator(2, 2, 3).generate()
+        bin_paths = model.write_binaries(self.directory.name)
+        writer = StateWriter(self.file_name, transitions=True)
+        simulator = Simulator(bin_paths, model.cfg_size, state_writer=writer)
+        _, cfgs = simulator.launch_checking(model.init_cfg)
+        edges = list(StateReader(self.file_name).edges())
+        # Initial configuration and every generated successor
+        self.assertEqual(simulator.successors + 1, len(edges))
+        self.assertEqual(sorted(cfgs), sorted(target for new, _, target in edges if new))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Stealing: Depth-first exploration over worker processes balanced by work stealing
+# Test file!
+
+import multiprocessing
+import tempfile
+import unittest
+
+from sdvs.benchmark import COUNTER_PROGRAM
+from sdvs.engine import FastEngine
+from sdvs.generator import ModelGenerator
+from sdvs.model import Model
+from sdvs.stealing import WorkStack, WorkStealingSimulator
+from tests.test_coordinator import assert_explores_as_simulator, assert_models_explored_as_simulator
+
+
+class FailingEngine(FastEngine):
+
+    def run(self, core):
+        raise RuntimeError("expansion")
+
+
+class TestWorkStack(unittest.TestCase):
+
+    def test_pop_steal(self):
+        stack = WorkStack()
+        stack.push([1, 2, 3, 4, 5])
+        self.assertEqual(5, stack.pop())
+        # Oldest half, rounded up
+        self.assertEqual([1, 2], stack.steal())
+        self.assertEqual([3], stack.steal())
+        self.assertEqual(4, stack.pop())
+        self.assertIsNone(stack.pop())
+        self.assertEqual([], stack.steal())
+
+
+class TestWorkStealing(unittest.TestCase):
+
+    @staticmethod
+    def run_stealing(workers, batch_size=256):
+        def run(bin_paths, model, engine):
+            stealing = WorkStealingSimulator(bin_paths, model.cfg_size, workers, engine, batch_size=batch_size)
+            exec_time, cfgs = stealing.launch_checking(model.init_cfg)
+            return exec_time, cfgs, stealing.statistics()
+        return run
+
+    def test_models(self):
+        assert_models_explored_as_simulator(self, self.run_stealing(3))
+
+    def test_balance(self):
+        # Every configuration starts in the stack of the first worker and the new configurations go
+        # back to the worker that found them: the others only get configurations by stealing them
+        model = Model("counters.2", [COUNTER_PROGRAM.format(address=0, limit=60),
+                                     COUNTER_PROGRAM.format(address=8, limit=60)], 16, 0, 61 * 61)
+        with tempfile.TemporaryDirectory() as directory:
+            statistics = assert_explores_as_simulator(self, self.run_stealing(3, batch_size=8), model, directory)
+        self.assertEqual(model.expected_states, statistics["states"])
+        for worker in statistics["workers"]:
+            self.assertGreater(worker["processed"], statistics["processed"] // 20)
+        for worker in statistics["workers"][1:]:
+            self.assertGreater(worker["steals"], 0)
+
+    def test_failing_expansion(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = ModelGenerator(3, 3, 4, guard_density=0.5).generate()
+            stealing = WorkStealingSimulator(model.write_binaries(directory), model.cfg_size, 3, FailingEngine)
+            with self.assertRaisesRegex(RuntimeError, "expansion"):
+                stealing.launch_checking(model.init_cfg)
+        self.assertEqual([], multiprocessing.active_children())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Swarm: Independent randomized bitstate searches run on a process pool, their coverage merged
+# Test file!
+
+import random
+import tempfile
+import unittest
+
+from sdvs.budget import STOP_STATES, Budget
+from sdvs.generator import ModelGenerator
+from sdvs.simulator import Simulator
+from sdvs.swarm import BitstateSet, CoverageMap, SwarmRunner, SwarmSearch
+
+
+class TestBitstate(unittest.TestCase):
+
+    def test_add(self):
+        known = BitstateSet(16, 3, seed=1)
+        self.assertTrue(known.add(5, 0x1234567890ABCDEF))
+        self.assertFalse(known.add(5, 0x1234567890ABCDEF))
+        self.assertTrue(known.add(6, 0x0FEDCBA987654321))
+        self.assertEqual(2, len(known))
+        self.assertEqual(3, len(known.indexes(0)))
+
+    def test_salts(self):
+        # Hash functions differ with the seed
+        self.assertNotEqual(BitstateSet(16, 2, seed=1).indexes(42), BitstateSet(16, 2, seed=2).indexes(42))
+
+    def test_coverage(self):
+        first, second = CoverageMap(8), CoverageMap(8)
+        first.mark(0x01 << 56)
+        first.mark(0x80 << 56)
+        second.mark(0x80 << 56)
+        second.mark(0xFF << 56)
+        first.merge(second)
+        self.assertEqual(3, first.count())
+        self.assertEqual(3, first.estimate())
+        with self.assertRaises(ValueError):
+            first.merge(CoverageMap(16))
+        with self.assertRaises(ValueError):
+            CoverageMap(2)
+
+    def test_coverage_saturation(self):
+        # Many more configurations than registers: every register is set and the estimate stays finite
+        generator = random.Random(0)
+        coverage = CoverageMap(8)
+        for _ in range(100000):
+            coverage.mark(generator.getrandbits(64))
+        self.assertEqual(256, coverage.count())
+        self.assertAlmostEqual(100000, coverage.estimate(), delta=20000)
+        # Marking the same configurations again changes nothing
+        merged = CoverageMap(8, coverage.data)
+        merged.merge(coverage)
+        self.assertEqual(coverage.estimate(), merged.estimate())
+
+
+class TestSwarm(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model = ModelGenerator(3, 3, 4).generate()
+        self.bin_paths = self.model.write_binaries(self.directory.name)
+        simulator = Simulator(self.bin_paths, self.model.cfg_size)
+        self.exec_time, cfgs = simulator.launch_checking(self.model.init_cfg)
+        self.states = len(cfgs)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_search(self):
+        orders = set()
+        for seed in range(4):
+            search = SwarmSearch(self.bin_paths, self.model.cfg_size, seed, bitstate_bits=20)
+            exec_time, known = search.launch_checking(self.model.init_cfg)
+            # Large enough table: no configuration is missed
+            self.assertEqual((self.exec_time, self.states), (exec_time, len(known)))
+            self.assertEqual(self.states, search.coverage.estimate())
+            orders.add(tuple(search.core_order()))
+        self.assertGreater(len(orders), 1)
+
+    def test_small_table(self):
+        search = SwarmSearch(self.bin_paths, self.model.cfg_size, bitstate_bits=5, hash_count=1)
+        search.launch_checking(self.model.init_cfg)
+        self.assertLess(search.statistics()["states"], self.states)
+
+    def test_runner(self):
+        runner = SwarmRunner(self.bin_paths, self.model.cfg_size, searches=3, jobs=2, bitstate_bits=20)
+        results = runner.launch_checking(self.model.init_cfg)
+        self.assertEqual([0, 1, 2], sorted(result["seed"] for result in results))
+        statistics = runner.statistics()
+        self.assertEqual(self.states, statistics["states"])
+        self.assertEqual(3 * self.states, statistics["processed"])
+        self.assertEqual(3, statistics["searches"])
+
+    def test_budget(self):
+        runner = SwarmRunner(self.bin_paths, self.model.cfg_size, searches=2, jobs=2, bitstate_bits=20,
+                             budget=Budget(max_states=10))
+        for result in runner.launch_checking(self.model.init_cfg):
+            self.assertEqual(STOP_STATES, result["stop_reason"])
+            self.assertEqual(10, result["states"])
+        self.assertGreaterEqual(runner.statistics()["states"], 10)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# ===========================================
+# author:         Quentin Ducasse
+# email:  quentin.ducasse@ensta-bretagne.org
+# github:    https://github.com/QDucasse
+# ===========================================
+# Write-behind: Background thread writing the exploration outputs
+# Test file!
+
+import os
+import tempfile
+import unittest
+
+from sdvs.write_behind import OP_WRITE, WriteBehind, default_writer
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.io_thread = WriteBehind(max_pending=2)
+
+    def tearDown(self):
+        self.io_thread.stop()
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_write(self):
+        first = self.io_thread.open(self.path("first.bin"), chunk_size=4)
+        second = self.io_thread.open(self.path("second.txt"))
+        for i in range(100):
+            first.write(bytes([i]))
+            second.write("{}\n".format(i))
+        first.close()
+        second.close()
+        with open(self.path("first.bin"), "rb") as file:
+            self.assertEqual(bytes(range(100)), file.read())
+        with open(self.path("second.txt")) as file:
+            self.assertEqual([str(i) for i in range(100)], file.read().split())
+
+    def test_flush(self):
+        channel = self.io_thread.open(self.path("flushed.txt"))
+        channel.write("first\n")
+        channel.flush()
+        channel.write("second\n")
+        channel.close()
+        with open(self.path("flushed.txt")) as file:
+            self.assertEqual("first\nsecond\n", file.read())
+
+    def test_append(self):
+        for _ in range(2):
+            channel = self.io_thread.open(self.path("appended.txt"), append=True)
+            channel.write("line\n")
+            channel.close()
+        with open(self.path("appended.txt")) as file:
+            self.assertEqual(2, len(file.readlines()))
+
+    def test_atomic(self):
+        with open(self.path("checkpoint"), "wb") as file:
+            file.write(b"old")
+        channel = self.io_thread.open(self.path("checkpoint"), atomic=True, chunk_size=1)
+        channel.write(b"new")
+        with open(self.path("checkpoint"), "rb") as file:
+            self.assertEqual(b"old", file.read())
+        channel.close()
+        with open(self.path("checkpoint"), "rb") as file:
+            self.assertEqual(b"new", file.read())
+        self.assertEqual(["checkpoint"], os.listdir(self.directory.name))
+
+    def test_empty(self):
+        self.io_thread.open(self.path("empty")).close()
+        self.assertEqual(0, os.path.getsize(self.path("empty")))
+
+    def test_error(self):
+        channel = self.io_thread.open(self.path(os.path.join("missing", "file")))
+        channel.write(b"data")
+        self.assertRaises(OSError, channel.close)
+
+    def test_default_writer(self):
+        self.assertIs(default_writer(), default_writer())
+
+    def test_error_isolated(self):
+        failing = self.io_thread.open(self.path(os.path.join("missing", "file")))
+        failing.write(b"data")
+        self.assertRaises(OSError, failing.close)
+        channel = self.io_thread.open(self.path("file"))
+        channel.write(b"data")
+        channel.close()
+        self.assertEqual(4, os.path.getsize(self.path("file")))
+
+    def test_unexpected_error(self):
+        # Not an OSError: the channel fails, its temporary file is removed and the thread goes on
+        failing = self.io_thread.open(self.path("checkpoint"), atomic=True)
+        self.io_thread.submit(OP_WRITE, failing, 42)
+        self.assertRaises(TypeError, failing.close)
+        self.assertEqual([], os.listdir(self.directory.name))
+        channel = self.io_thread.open(self.path("file"), chunk_size=1)
+        for _ in range(8):
+            channel.write(b"data")
+        channel.close()
+        self.assertEqual(32, os.path.getsize(self.path("file")))